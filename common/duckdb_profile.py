@@ -0,0 +1,76 @@
+"""
+Pipelines de dados — Conexão DuckDB com perfil de recursos compartilhado
+=========================================================================
+Fábrica única de conexões DuckDB usada por todos os módulos `ingestion*/` e
+`transform*/`. Um `duckdb.connect()` "pelado" usa todos os núcleos e ~80% da
+RAM da máquina e, sem diretório de spill configurado, uma query grande (ex.:
+a co-ocorrência de skills do `gold_insights`) estoura memória no runner do
+CI em vez de degradar para disco.
+
+O perfil vem do ambiente (todas opcionais — sem elas, vale o default do
+DuckDB, exceto o spill, que sempre fica fora da árvore do repo):
+
+    PIPELINE_DUCKDB_THREADS        nº de threads (ex.: 2)
+    PIPELINE_DUCKDB_MEMORY_LIMIT   teto de memória (ex.: 4GB, 75%)
+    PIPELINE_DUCKDB_TEMP_DIR       diretório de spill p/ operadores out-of-core
+                                   (default: <tmp do sistema>/duckdb_spill)
+
+Nos workflows do CI (pix-data, radar-jobs, radar-signals) o `env:` do job
+fixa THREADS=4 e MEMORY_LIMIT=8GB: o runner padrão tem 4 vCPU / 16 GB, e
+o teto explícito faz query grande spillar em disco em vez de estourar
+memória.
+
+Uso (como módulo):
+    from common.duckdb_profile import connect
+    con = connect()                 # preserva a ordem de inserção
+    con = connect(ordered=False)    # só onde a ordem da saída é irrelevante
+                                    # (toda saída tem ORDER BY explícito)
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+import duckdb
+
+ENV_THREADS = "PIPELINE_DUCKDB_THREADS"
+ENV_MEMORY_LIMIT = "PIPELINE_DUCKDB_MEMORY_LIMIT"
+ENV_TEMP_DIR = "PIPELINE_DUCKDB_TEMP_DIR"
+
+DEFAULT_TEMP_DIR = Path(tempfile.gettempdir()) / "duckdb_spill"
+
+
+def resource_profile() -> dict[str, str]:
+    """Lê o perfil de recursos do ambiente → dict de settings do DuckDB."""
+    config: dict[str, str] = {}
+
+    threads = os.environ.get(ENV_THREADS, "").strip()
+    if threads:
+        if not threads.isdigit() or int(threads) < 1:
+            raise ValueError(f"{ENV_THREADS} inválido: {threads!r} (esperado inteiro >= 1)")
+        config["threads"] = threads
+
+    memory_limit = os.environ.get(ENV_MEMORY_LIMIT, "").strip()
+    if memory_limit:
+        config["memory_limit"] = memory_limit
+
+    temp_dir = Path(os.environ.get(ENV_TEMP_DIR, "").strip() or DEFAULT_TEMP_DIR)
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    config["temp_directory"] = str(temp_dir)
+
+    return config
+
+
+def connect(database: str = ":memory:", *, ordered: bool = True) -> duckdb.DuckDBPyConnection:
+    """Abre uma conexão DuckDB já configurada com o perfil de recursos.
+
+    `ordered=False` desliga `preserve_insertion_order` — libera o DuckDB para
+    paralelizar/spillar sem manter a ordem de leitura; só use em módulos em
+    que toda saída relevante tem ORDER BY explícito.
+    """
+    config = resource_profile()
+    if not ordered:
+        config["preserve_insertion_order"] = "false"
+    return duckdb.connect(database, config=config)
@@ -0,0 +1,176 @@
+"""
+Pipelines de dados — Expectativas de qualidade (silver/gold) em DuckDB
+=======================================================================
+Suítes declarativas de checagem de dados, rodadas inline logo depois de cada
+estágio gravar sua saída. Cada suíte vira UMA query DuckDB por tabela (uma
+coluna agregada por expectativa, tudo na mesma varredura) — nada de loop
+Python linha a linha, então o gate inteiro do pipeline custa milissegundos.
+
+Expectativas disponíveis (cada uma é um dict simples, como o resto dos
+catálogos do repo):
+
+    not_null(col)                     nenhuma linha com `col` nulo
+    unique(*cols)                     chave (composta) sem duplicata
+    in_range(col, lo, hi)             valores fora de [lo, hi] (nulos ignorados)
+    fresh(col, max_age_days)          MAX(col) no máximo N dias atrás
+    row_count_delta(max_pct)          variação do nº de linhas vs. a execução
+                                      anterior (estado em ROW_COUNTS_PATH)
+    references(col, ref_source, ref_col)
+                                      todo `col` existe em `ref_source.ref_col`
+                                      (ex.: gold ⊂ silver)
+
+`severity="warn"` só sinaliza no relatório; o default `"error"` faz
+`enforce()` levantar RuntimeError e derrubar o estágio (exit != 0 no CI).
+
+Uso (como módulo):
+    from common.quality import enforce, in_range, not_null, run_suite, unique
+    results = run_suite(con, "jobs_clean", "'data/silver/jobs_clean.parquet'", [
+        not_null("id"), unique("id"),
+    ])
+    enforce(results)
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import duckdb
+
+# Estado da última execução (nº de linhas por suíte) — fica em data/gold/
+# para ser commitado junto com os dados pelos workflows do CI.
+ROW_COUNTS_PATH = Path("data/gold/quality_row_counts.json")
+
+
+# ─── Construtores de expectativas ─────────────────────────────────────────────
+
+def _quote(col: str) -> str:
+    return '"' + col.replace('"', '""') + '"'
+
+
+def not_null(col: str, severity: str = "error") -> dict:
+    return {"name": f"not_null({col})", "severity": severity,
+            "sql": f"COUNT_IF({_quote(col)} IS NULL)", "max": 0}
+
+
+def unique(*cols: str, severity: str = "error") -> dict:
+    key = ", ".join(_quote(c) for c in cols)
+    distinct = f"COUNT(DISTINCT ({key}))" if len(cols) > 1 else f"COUNT(DISTINCT {key})"
+    return {"name": f"unique({', '.join(cols)})", "severity": severity,
+            "sql": f"COUNT(*) - {distinct}", "max": 0}
+
+
+def in_range(col: str, lo: float | None = None, hi: float | None = None,
+             severity: str = "error") -> dict:
+    conds = []
+    if lo is not None:
+        conds.append(f"{_quote(col)} < {lo}")
+    if hi is not None:
+        conds.append(f"{_quote(col)} > {hi}")
+    cond = " OR ".join(conds) or "false"
+    return {"name": f"in_range({col}, {lo}, {hi})", "severity": severity,
+            "sql": f"COUNT_IF({cond})", "max": 0}
+
+
+def fresh(col: str, max_age_days: int, severity: str = "warn") -> dict:
+    return {"name": f"fresh({col}, {max_age_days}d)", "severity": severity,
+            "sql": f"DATE_DIFF('day', CAST(MAX({_quote(col)}) AS DATE), current_date)",
+            "max": max_age_days}
+
+
+def row_count_delta(max_pct: float, severity: str = "warn") -> dict:
+    # Resolvido em Python contra o estado salvo — o nº de linhas em si já sai
+    # da mesma query da suíte (coluna n_rows).
+    return {"name": f"row_count_delta(±{max_pct:g}%)", "severity": severity,
+            "sql": None, "max": max_pct}
+
+
+def references(col: str, ref_source: str, ref_col: str | None = None,
+               severity: str = "error") -> dict:
+    ref_col = ref_col or col
+    sql = (
+        f"(SELECT COUNT(*) FROM _t WHERE {_quote(col)} IS NOT NULL AND NOT EXISTS ("
+        f"SELECT 1 FROM {ref_source} _r WHERE _r.{_quote(ref_col)} = _t.{_quote(col)}))"
+    )
+    return {"name": f"references({col} → {ref_col})", "severity": severity,
+            "sql": sql, "max": 0}
+
+
+# ─── Execução ─────────────────────────────────────────────────────────────────
+
+def _compile(source: str, expectations: list[dict]) -> str:
+    cols = ["COUNT(*) AS n_rows"]
+    cols += [f"{e['sql']} AS c{i}" for i, e in enumerate(expectations) if e["sql"]]
+    return f"WITH _t AS (SELECT * FROM {source}) SELECT {', '.join(cols)} FROM _t"
+
+
+def _load_row_counts() -> dict:
+    if not ROW_COUNTS_PATH.exists():
+        return {}
+    try:
+        return json.loads(ROW_COUNTS_PATH.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+
+
+def _save_row_count(suite: str, n_rows: int) -> None:
+    counts = _load_row_counts()
+    counts[suite] = n_rows
+    ROW_COUNTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    ROW_COUNTS_PATH.write_text(
+        json.dumps(dict(sorted(counts.items())), ensure_ascii=False, indent=2) + "\n",
+        encoding="utf-8",
+    )
+
+
+def run_suite(con: duckdb.DuckDBPyConnection, suite: str, source: str,
+              expectations: list[dict], *, quiet: bool = False) -> list[dict]:
+    """Roda a suíte `suite` sobre `source` (tabela, view ou `'arquivo.parquet'`)
+    numa única query e imprime o relatório compacto.
+
+    Retorna uma lista de resultados `{suite, name, severity, value, ok}`.
+    """
+    t0 = time.perf_counter()
+    row = con.execute(_compile(source, expectations)).fetchone()
+    n_rows = int(row[0])
+    values = iter(row[1:])
+
+    results = []
+    for e in expectations:
+        if e["sql"] is None:
+            prev = _load_row_counts().get(suite)
+            value = (round(100.0 * abs(n_rows - prev) / prev, 1) if prev else 0.0)
+        else:
+            value = next(values)
+        ok = value is not None and value <= e["max"]
+        results.append({"suite": suite, "name": e["name"], "severity": e["severity"],
+                        "value": value, "ok": ok})
+
+    if any(e["sql"] is None for e in expectations):
+        _save_row_count(suite, n_rows)
+
+    if not quiet:
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        n_ok = sum(r["ok"] for r in results)
+        if n_ok == len(results):
+            mark = "✓"
+        elif all(r["ok"] or r["severity"] == "warn" for r in results):
+            mark = "⚠"
+        else:
+            mark = "✗"
+        print(f"  {mark} qualidade {suite}: {n_ok}/{len(results)} ok "
+              f"({n_rows:,} linhas, {elapsed_ms:.0f} ms)")
+        for r in results:
+            if not r["ok"]:
+                icon = "⚠" if r["severity"] == "warn" else "✗"
+                print(f"     {icon} {r['name']}: {r['value']!r}")
+    return results
+
+
+def enforce(results: list[dict]) -> None:
+    """Levanta RuntimeError se alguma expectativa de severidade 'error' falhou."""
+    failed = [r for r in results if not r["ok"] and r["severity"] == "error"]
+    if failed:
+        names = ", ".join(f"{r['suite']}.{r['name']}" for r in failed)
+        raise RuntimeError(f"Gate de qualidade falhou: {names}")
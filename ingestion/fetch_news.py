@@ -9,6 +9,14 @@ pipeline de dados. Gera:
 
     assets/data/pix_news.json
 
+Coleta incremental: o ETag/Last-Modified da última resposta e os GUIDs já
+vistos ficam em data/bronze/pix_news/rss_state.json. A requisição vai com
+If-None-Match/If-Modified-Since (304 → nada a baixar nem parsear), e o
+feed é lido em streaming com `iterparse`, pulando itens já vistos (o
+Google News ordena por relevância, não por data — um item visto não marca
+o fim das novidades). As novas são mescladas às anteriores e ordenadas por
+`published`. Se não há notícia nova, o JSON do widget não é reescrito.
+
 Uso:
     python ingestion/fetch_news.py
 """
@@ -21,7 +29,7 @@ from pathlib import Path
 from datetime import datetime, timezone
 from xml.etree import ElementTree as ET
 from urllib.request import Request, urlopen
-from urllib.error import URLError
+from urllib.error import HTTPError, URLError
 
 # Google News RSS — query em português, região Brasil.
 RSS_URL = (
@@ -30,7 +38,9 @@ RSS_URL = (
 )
 
 OUTPUT = Path("assets/data/pix_news.json")
+STATE_PATH = Path("data/bronze/pix_news/rss_state.json")
 MAX_ITEMS = 6
+MAX_SEEN_GUIDS = 200   # janela de GUIDs lembrados (o feed tem ~100 itens)
 TIMEOUT = 30
 
 
@@ -70,40 +80,104 @@ def _parse_date(raw: str) -> str:
     return ""
 
 
-def fetch_news() -> list[dict]:
-    """Busca e parseia o RSS. Retorna lista de notícias normalizadas."""
-    req = Request(RSS_URL, headers={"User-Agent": "pix-observatory/1.0"})
-    with urlopen(req, timeout=TIMEOUT) as resp:
-        raw = resp.read()
+def _load_json(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+
+
+def _item_to_news(item: ET.Element) -> dict:
+    title_raw = _clean(item.findtext("title", ""))
+    headline, source = _source_from_title(title_raw)
+    return {
+        "title": headline,
+        "source": source,
+        "url": item.findtext("link", "").strip(),
+        "published": _parse_date(item.findtext("pubDate", "")),
+    }
+
 
-    root = ET.fromstring(raw)
-    items = root.findall(".//item")
+def fetch_news(state: dict) -> tuple[list[dict], list[str], dict] | None:
+    """
+    Busca o RSS com GET condicional e parseia em streaming.
+
+    Retorna None se o servidor respondeu 304 (feed inalterado); senão
+    (notícias novas, GUIDs novos, headers de cache da resposta). GUIDs já
+    vistos são pulados; o parse para ao juntar MAX_ITEMS notícias novas.
+    """
+    headers = {"User-Agent": "pix-observatory/1.0"}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
 
+    try:
+        resp = urlopen(Request(RSS_URL, headers=headers), timeout=TIMEOUT)
+    except HTTPError as e:
+        if e.code == 304:
+            return None
+        raise
+
+    seen = set(state.get("seen_guids", []))
     news: list[dict] = []
-    for item in items[:MAX_ITEMS]:
-        title_raw = _clean(item.findtext("title", ""))
-        headline, source = _source_from_title(title_raw)
-        news.append({
-            "title": headline,
-            "source": source,
-            "url": item.findtext("link", "").strip(),
-            "published": _parse_date(item.findtext("pubDate", "")),
-        })
-    return news
+    guids: list[str] = []
+    with resp:
+        cache = {
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+        }
+        for _, elem in ET.iterparse(resp, events=("end",)):
+            if elem.tag != "item":
+                continue
+            guid = (elem.findtext("guid") or elem.findtext("link") or "").strip()
+            if guid in seen:
+                elem.clear()
+                continue
+            news.append(_item_to_news(elem))
+            guids.append(guid)
+            elem.clear()
+            if len(news) >= MAX_ITEMS:
+                break
+    return news, guids, cache
 
 
 def main() -> int:
+    state = _load_json(STATE_PATH)
     try:
-        news = fetch_news()
+        result = fetch_news(state)
     except (URLError, ET.ParseError, TimeoutError) as e:
         print(f"  ✗ Falha ao buscar RSS: {e}")
         print("  → Mantendo pix_news.json existente (se houver).")
         return 0  # não quebra o pipeline — widget usa o JSON anterior
 
-    if not news:
-        print("  ⚠ RSS retornou vazio — mantendo JSON anterior.")
+    if result is None:
+        print("  ✓ Feed inalterado (304) — mantendo pix_news.json.")
+        return 0
+
+    new_news, new_guids, cache = result
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    STATE_PATH.write_text(json.dumps({
+        **cache,
+        "seen_guids": (new_guids + state.get("seen_guids", []))[:MAX_SEEN_GUIDS],
+    }, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if not new_news:
+        print("  ✓ Nenhuma notícia nova — mantendo pix_news.json.")
         return 0
 
+    # Novas + anteriores (sem repetir URL), mais recentes primeiro.
+    news = list(new_news)
+    urls = {n["url"] for n in news}
+    for old in _load_json(OUTPUT).get("items", []):
+        if old.get("url") not in urls:
+            news.append(old)
+            urls.add(old.get("url"))
+    news.sort(key=lambda n: n.get("published") or "", reverse=True)
+    news = news[:MAX_ITEMS]
+
     payload = {
         "updated_at": datetime.now(timezone.utc).isoformat(),
         "query": "PIX Banco Central pagamentos",
@@ -115,8 +189,8 @@ def main() -> int:
     OUTPUT.write_text(
         json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8"
     )
-    print(f"  ✓ {OUTPUT} ({len(news)} notícias)")
-    for n in news:
+    print(f"  ✓ {OUTPUT} ({len(new_news)} novas, {len(news)} no total)")
+    for n in new_news:
         print(f"    · {n['title'][:70]}  [{n['source']}]")
     return 0
 
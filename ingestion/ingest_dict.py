@@ -34,6 +34,7 @@ import calendar
 import json
 import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timezone
 from pathlib import Path
 from urllib.error import HTTPError, URLError
@@ -51,6 +52,7 @@ BASE_URL = (
     "ChavesPix"
 )
 TIMEOUT = 60
+PROBE_WORKERS = 4  # sondagens simultâneas de fins de mês na Olinda
 
 
 # ─── Helpers de data ──────────────────────────────────────────────────────────
@@ -95,22 +97,47 @@ def _fetch_month(date_str: str) -> list[dict]:
     return rows
 
 
+def _try_fetch(date_str: str) -> list[dict]:
+    """`_fetch_month` que devolve [] em vez de propagar falha de rede."""
+    try:
+        return _fetch_month(date_str)
+    except (URLError, HTTPError, TimeoutError) as e:
+        print(f"  ✗ {date_str} falhou: {e}")
+        return []
+
+
+def _latest_month_on_disk() -> str | None:
+    """Último mês (YYYY_MM) já derivado em bronze/dict_chaves_participante/."""
+    labels = [
+        p.stem.removeprefix("dict_chaves_part_")
+        for p in (BRONZE_PATH / "dict_chaves_participante").glob("dict_chaves_part_*.parquet")
+    ]
+    return max(labels, default=None)
+
+
 def find_latest_available(max_attempts: int = 4) -> tuple[str, list[dict]] | None:
     """
-    Tenta o mês corrente e recua até `max_attempts` meses procurando o
-    snapshot mais recente disponível (o BACEN publica com defasagem).
+    Sonda em paralelo o mês corrente e até `max_attempts - 1` meses para
+    trás (o BACEN publica com defasagem) e devolve o mais recente
+    disponível. Meses já derivados em bronze não são sondados de novo —
+    se nada mais novo saiu, retorna None (não há o que atualizar).
     """
-    candidate = _month_end(date.today())
-    for _ in range(max_attempts):
-        date_str = candidate.isoformat()
-        try:
-            rows = _fetch_month(date_str)
-        except (URLError, HTTPError, TimeoutError) as e:
-            print(f"  ✗ {date_str} falhou: {e}")
-            rows = []
-        if rows:
-            return date_str, rows
-        candidate = _shift_months(candidate, 1)
+    newest_on_disk = _latest_month_on_disk()
+    candidates = [
+        _shift_months(_month_end(date.today()), i).isoformat() for i in range(max_attempts)
+    ]
+    to_probe = [
+        d for d in candidates
+        if newest_on_disk is None or d.replace("-", "_")[:7] > newest_on_disk
+    ]
+    if not to_probe:
+        return None
+
+    with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(to_probe))) as pool:
+        results = dict(zip(to_probe, pool.map(_try_fetch, to_probe)))
+    for date_str in to_probe:  # do mais novo para o mais antigo
+        if results[date_str]:
+            return date_str, results[date_str]
     return None
 
 
@@ -228,6 +255,9 @@ if __name__ == "__main__":
     print()
 
     latest = find_latest_available()
+    if not latest and _latest_month_on_disk():
+        print(f"ℹ Nenhum mês mais novo que {_latest_month_on_disk()} publicado — bronze DICT já atualizado.")
+        sys.exit(0)
     if not latest:
         print("✗ Nenhum snapshot de ChavesPix disponível nas últimas tentativas.")
         print("  A ingestão DICT será pulada — o pipeline continua com as")
@@ -13,8 +13,20 @@ exato, não um proxy nem uma estimativa.
 Publicado com defasagem maior que outros datasets do PIX — por isso a
 busca tenta vários meses até achar o mais recente disponível.
 
+Bronze append-only, um arquivo por AnoMes: meses já em disco nunca são
+buscados de novo. Cada execução sonda, em paralelo (PROBE_WORKERS), todo
+AnoMes ausente dos últimos RETRY_MONTHS meses (ou, sem bronze, dos
+últimos DEFAULT_LOOKBACK_MONTHS) — um mês que falhou ou ainda não tinha
+sido publicado é tentado de novo nas execuções seguintes, sem que um
+buraco antigo custe uma sondagem por execução para sempre. `--backfill`
+estende a busca até BACKFILL_START (uma vez, para preencher o histórico
+ou um buraco mais velho que a janela). Todo período encontrado é gravado;
+o payload do frontend sai sempre do período mais recente em disco e a
+série acumulada alimenta `transform_fraudes_usuarios.py`.
+
 Uso:
     python ingestion/ingest_fraudes.py
+    python ingestion/ingest_fraudes.py --backfill
 
 Saída:
     data/bronze/fraudes_pix/fraudes_pix_{YYYYMM}.parquet
@@ -22,8 +34,10 @@ Saída:
     assets/data/pix_fraudes.json   (consumido pelo frontend em runtime)
 """
 
+import argparse
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import date, datetime, timezone
 from urllib.request import Request, urlopen
@@ -36,6 +50,10 @@ BRONZE = Path("data/bronze/fraudes_pix")
 GOLD = Path("data/gold")
 FRONTEND_OUT = Path("assets/data/pix_fraudes.json")
 TIMEOUT = 60
+DEFAULT_LOOKBACK_MONTHS = 6        # sem bronze: meses consultados para trás
+RETRY_MONTHS = 12                  # janela de meses ausentes re-sondados a cada execução
+PROBE_WORKERS = 4                  # sondagens simultâneas na Olinda
+BACKFILL_START = date(2021, 11, 1) # --backfill: início do MED / da série publicada
 
 
 def _anomes(d: date) -> str:
@@ -60,20 +78,83 @@ def _fetch_month(anomes: str) -> dict | None:
     return rows[0] if rows else None
 
 
-def _find_latest_available(max_attempts: int = 6) -> tuple[str, dict] | None:
-    """Publicação de fraudes tem mais defasagem — tenta até 6 meses atrás."""
-    candidate = date.today()
-    for _ in range(max_attempts):
-        anomes = _anomes(candidate)
-        try:
-            row = _fetch_month(anomes)
-        except (URLError, HTTPError, TimeoutError) as e:
-            print(f"  ✗ {anomes} falhou: {e}")
-            row = None
-        if row:
-            return anomes, row
+def _periods_on_disk() -> set[str]:
+    """AnoMes (YYYYMM) já gravados em bronze."""
+    return {p.stem.removeprefix("fraudes_pix_") for p in BRONZE.glob("fraudes_pix_*.parquet")}
+
+
+def _missing_periods(start: date) -> list[str]:
+    """AnoMes de `start` até o mês corrente ausentes do bronze, do mais recente
+    para o mais antigo."""
+    on_disk = _periods_on_disk()
+    missing = []
+    candidate = date.today().replace(day=1)
+    while candidate >= start:
+        if _anomes(candidate) not in on_disk:
+            missing.append(_anomes(candidate))
         candidate = _shift_months(candidate, 1)
-    return None
+    return missing
+
+
+def _try_fetch(anomes: str) -> dict | None:
+    try:
+        return _fetch_month(anomes)
+    except (URLError, HTTPError, TimeoutError) as e:
+        print(f"  ✗ {anomes} falhou: {e}")
+        return None
+
+
+def _collect_new_periods(backfill: bool = False) -> dict[str, dict]:
+    """
+    Sonda em paralelo todo AnoMes ausente dos últimos RETRY_MONTHS meses
+    (DEFAULT_LOOKBACK_MONTHS sem bronze; desde BACKFILL_START com
+    `backfill`). Falha de rede num mês não move nenhuma marca — o mês
+    continua ausente e é tentado de novo enquanto estiver na janela.
+    """
+    this_month = date.today().replace(day=1)
+    if backfill:
+        start = BACKFILL_START
+    elif _periods_on_disk():
+        start = _shift_months(this_month, RETRY_MONTHS - 1)
+    else:
+        start = _shift_months(this_month, DEFAULT_LOOKBACK_MONTHS - 1)
+
+    missing = _missing_periods(start)
+    if not missing:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(missing))) as pool:
+        rows = dict(zip(missing, pool.map(_try_fetch, missing)))
+    return {anomes: row for anomes, row in rows.items() if row}
+
+
+def _save_bronze(anomes: str, row: dict) -> None:
+    try:
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("  ⚠ pandas/pyarrow indisponíveis — pulando bronze.")
+        return
+
+    df = pd.DataFrame([row])
+    df["_ingest_ts"] = datetime.now(timezone.utc).isoformat()
+    BRONZE.mkdir(parents=True, exist_ok=True)
+    out_path = BRONZE / f"fraudes_pix_{anomes}.parquet"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), out_path, compression="snappy")
+    print(f"  ✓ {out_path}")
+
+
+def _load_latest_bronze() -> tuple[str, dict] | None:
+    """Período mais recente gravado em bronze (sem a coluna de ingestão)."""
+    periods = _periods_on_disk()
+    if not periods:
+        return None
+    import pandas as pd
+
+    anomes = max(periods)
+    df = pd.read_parquet(BRONZE / f"fraudes_pix_{anomes}.parquet")
+    row = df.drop(columns=["_ingest_ts"], errors="ignore").iloc[0].to_dict()
+    return anomes, row
 
 
 def build_payload(anomes: str, row: dict) -> dict:
@@ -111,30 +192,32 @@ def build_payload(anomes: str, row: dict) -> dict:
     }
 
 
-def main() -> int:
-    print("→ Buscando estatísticas de fraude mais recentes disponíveis...")
-    latest = _find_latest_available()
-    if not latest:
-        print("  ✗ Nenhum snapshot de EstatisticasFraudesPix disponível.")
-        return 1
-
-    anomes, row = latest
-    print(f"  ✓ Snapshot mais recente: {anomes}")
-
-    # Bronze
-    try:
-        import pandas as pd
-        import pyarrow as pa
-        import pyarrow.parquet as pq
-
-        df = pd.DataFrame([row])
-        df["_ingest_ts"] = datetime.now(timezone.utc).isoformat()
-        BRONZE.mkdir(parents=True, exist_ok=True)
-        out_path = BRONZE / f"fraudes_pix_{anomes}.parquet"
-        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), out_path, compression="snappy")
-        print(f"  ✓ {out_path}")
-    except ImportError:
-        print("  ⚠ pandas/pyarrow indisponíveis — pulando bronze.")
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Estatísticas de fraude PIX e MED (BACEN Olinda)")
+    parser.add_argument(
+        "--backfill", action="store_true",
+        help=f"sonda todo mês ausente desde {BACKFILL_START:%Y-%m}, não só os últimos "
+             f"{RETRY_MONTHS}",
+    )
+    args = parser.parse_args(argv)
+
+    print("→ Buscando estatísticas de fraude de períodos ainda não coletados"
+          + (f" (backfill desde {_anomes(BACKFILL_START)})..." if args.backfill else "..."))
+    found = _collect_new_periods(args.backfill)
+    for anomes in sorted(found):
+        _save_bronze(anomes, found[anomes])
+
+    if found:
+        anomes = max(found)
+        row = found[anomes]
+        print(f"  ✓ {len(found)} período(s) novo(s) — mais recente: {anomes}")
+    else:
+        latest = _load_latest_bronze()
+        if not latest:
+            print("  ✗ Nenhum snapshot de EstatisticasFraudesPix disponível.")
+            return 1
+        anomes, row = latest
+        print(f"  ℹ Nenhum período novo publicado — usando {anomes} do bronze.")
 
     payload = build_payload(anomes, row)
 
@@ -27,20 +27,32 @@ Descobertas de integração (documentadas para futura manutenção):
        top 1000 linhas (mesmo que a cauda longa de cooperativas pequenas
        fique de fora — irrelevante para este ranking).
 
+Histórico local (backfill):
+    Cada snapshot mensal baixado fica em bronze, um arquivo por mês
+    (partição = mês). Meses já em disco nunca são rebaixados: a busca do
+    "mais recente" só sonda os meses POSTERIORES ao último em disco, e o
+    snapshot de comparação é lido do bronze quando já existe. O modo
+    `--backfill` sonda um intervalo inteiro de fins de mês em paralelo
+    (no máximo PROBE_WORKERS requisições simultâneas) e grava todo mês
+    disponível que ainda falta.
+
 Uso:
     python ingestion/ingest_ranking.py
+    python ingestion/ingest_ranking.py --backfill [YYYY-MM]   (default: 2020-11)
 
 Saída:
-    data/bronze/chaves_pix_participante/chaves_pix_{YYYY_MM}.parquet  (×2 meses)
+    data/bronze/chaves_pix_participante/chaves_pix_{YYYY_MM_DD}.parquet  (1 por mês)
     data/gold/pix_ranking_participantes.parquet
     assets/data/pix_ranking.json   (consumido pelo frontend em runtime)
 """
 
+import argparse
 import json
 import sys
 import calendar
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timezone
 from urllib.request import Request, urlopen
 from urllib.error import URLError, HTTPError
@@ -55,6 +67,8 @@ FRONTEND_OUT = Path("assets/data/pix_ranking.json")
 TOP_N = 10               # tamanho de cada ranking exibido
 MONTHS_BACK_COMPARE = 3  # janela de comparação para "últimos meses"
 TIMEOUT = 60
+PROBE_WORKERS = 6        # sondagens simultâneas na Olinda (educado com o BACEN)
+BACKFILL_START = date(2020, 11, 30)  # primeiro fechamento de mês do PIX
 
 
 def _month_end(d: date) -> date:
@@ -102,25 +116,92 @@ def _aggregate(rows: list[dict]) -> dict[tuple[str, str], int]:
     return agg
 
 
+def _try_fetch(date_str: str) -> list[dict]:
+    """`_fetch_month` que devolve [] em vez de propagar falha de rede."""
+    try:
+        return _fetch_month(date_str)
+    except (URLError, HTTPError, TimeoutError) as e:
+        print(f"  ✗ {date_str} falhou: {e}")
+        return []
+
+
+def _probe_months(date_strs: list[str]) -> dict[str, list[dict]]:
+    """
+    Sonda vários fins de mês em paralelo (até PROBE_WORKERS por vez) e
+    devolve só os disponíveis — o custo total vira ~1 round-trip (ou 1
+    timeout) por lote, em vez de 1 por mês ainda não publicado.
+    """
+    if not date_strs:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(date_strs))) as pool:
+        results = dict(zip(date_strs, pool.map(_try_fetch, date_strs)))
+    return {d: rows for d, rows in results.items() if rows}
+
+
+def _months_on_disk() -> set[str]:
+    """Fins de mês (ISO) que já têm snapshot no bronze."""
+    return {
+        p.stem.removeprefix("chaves_pix_").replace("_", "-")
+        for p in BRONZE.glob("chaves_pix_*.parquet")
+    }
+
+
+def _load_bronze(date_str: str) -> list[dict]:
+    """Lê de volta um snapshot já gravado em bronze (sem a coluna de ingestão)."""
+    import pandas as pd
+
+    path = BRONZE / f"chaves_pix_{date_str.replace('-', '_')}.parquet"
+    df = pd.read_parquet(path).drop(columns=["_ingest_ts"], errors="ignore")
+    return df.to_dict(orient="records")
+
+
 def _find_latest_available(max_attempts: int = 4) -> tuple[str, list[dict]] | None:
     """
-    Tenta o mês corrente e recua até `max_attempts` meses procurando o
-    snapshot mais recente disponível (o BACEN publica com defasagem).
+    Sonda, em paralelo, o mês corrente e até `max_attempts - 1` meses para
+    trás (o BACEN publica com defasagem) — mas só os meses posteriores ao
+    último snapshot já em disco. Todo mês encontrado vai para o bronze; se
+    nenhum mês novo saiu, usa o mais recente em disco.
     """
-    candidate = _month_end(date.today())
-    for _ in range(max_attempts):
-        date_str = candidate.isoformat()
-        try:
-            rows = _fetch_month(date_str)
-        except (URLError, HTTPError, TimeoutError) as e:
-            print(f"  ✗ {date_str} falhou: {e}")
-            rows = []
-        if rows:
-            return date_str, rows
-        candidate = _shift_months(candidate, 1)
+    on_disk = _months_on_disk()
+    newest_on_disk = max(on_disk, default=None)
+    candidates = [
+        _shift_months(_month_end(date.today()), i).isoformat() for i in range(max_attempts)
+    ]
+    to_probe = [d for d in candidates if newest_on_disk is None or d > newest_on_disk]
+
+    found = _probe_months(to_probe)
+    for date_str, rows in sorted(found.items()):
+        _save_bronze(rows, date_str)
+    if found:
+        newest = max(found)
+        return newest, found[newest]
+    if newest_on_disk:
+        print(f"  ℹ Nenhum mês novo publicado — usando {newest_on_disk} do bronze.")
+        return newest_on_disk, _load_bronze(newest_on_disk)
     return None
 
 
+def backfill(start: date = BACKFILL_START) -> list[str]:
+    """
+    Preenche o bronze com todo fechamento de mês disponível desde `start`
+    que ainda não está em disco. Retorna os meses gravados.
+    """
+    on_disk = _months_on_disk()
+    months, candidate = [], _month_end(date.today())
+    while candidate >= _month_end(start):
+        if candidate.isoformat() not in on_disk:
+            months.append(candidate.isoformat())
+        candidate = _shift_months(candidate, 1)
+
+    print(f"→ Backfill: {len(months)} mês(es) faltando desde {start:%Y-%m} "
+          f"({len(on_disk)} já em disco)...")
+    found = _probe_months(months)
+    for date_str, rows in sorted(found.items()):
+        _save_bronze(rows, date_str)
+    print(f"  ✓ {len(found)} snapshot(s) novo(s) gravado(s) em {BRONZE}")
+    return sorted(found)
+
+
 def _save_bronze(rows: list[dict], date_str: str) -> None:
     """Salva o snapshot bruto em Parquet (bronze)."""
     try:
@@ -151,20 +232,21 @@ def build_ranking() -> dict:
         raise RuntimeError("Nenhum snapshot de ChavesPix disponível nas últimas tentativas.")
     latest_date_str, latest_rows = latest
     print(f"  ✓ Snapshot mais recente: {latest_date_str} ({len(latest_rows)} linhas)")
-    _save_bronze(latest_rows, latest_date_str)
 
     latest_date = date.fromisoformat(latest_date_str)
     past_date = _shift_months(latest_date, MONTHS_BACK_COMPARE)
     past_date_str = past_date.isoformat()
 
     print(f"→ Buscando snapshot de comparação ({MONTHS_BACK_COMPARE} meses antes: {past_date_str})...")
-    try:
-        past_rows = _fetch_month(past_date_str)
-    except (URLError, HTTPError, TimeoutError) as e:
-        print(f"  ✗ {past_date_str} falhou: {e} — ranking de crescimento ficará vazio.")
-        past_rows = []
+    if past_date_str in _months_on_disk():
+        past_rows = _load_bronze(past_date_str)
+    else:
+        past_rows = _try_fetch(past_date_str)
+        if past_rows:
+            _save_bronze(past_rows, past_date_str)
+        else:
+            print(f"  ✗ {past_date_str} indisponível — ranking de crescimento ficará vazio.")
     if past_rows:
-        _save_bronze(past_rows, past_date_str)
         print(f"  ✓ Snapshot de comparação: {past_date_str} ({len(past_rows)} linhas)")
 
     recent_agg = _aggregate(latest_rows)
@@ -250,6 +332,19 @@ def main() -> int:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--backfill", nargs="?", const=BACKFILL_START.strftime("%Y-%m"), metavar="YYYY-MM",
+        help="grava em bronze todo mês disponível desde YYYY-MM que ainda não está em disco",
+    )
+    args = parser.parse_args()
+
+    if args.backfill:
+        print("🗄  Backfill do histórico de ChavesPix (bronze)")
+        print()
+        backfill(date.fromisoformat(f"{args.backfill}-01"))
+        print()
+
     print("🏆 Construindo ranking de instituições PIX (chaves DICT)")
     print()
     sys.exit(main())
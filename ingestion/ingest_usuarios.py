@@ -9,6 +9,12 @@ chamada retorna o HISTÓRICO COMPLETO desde o lançamento do PIX (nov/2020)
 até o mês mais recente disponível. Não precisa de paginação nem de
 lógica de "mês mais recente" — o próprio dataset é pequeno (~67 linhas).
 
+Bronze append-only: o histórico acumulado fica em disco e cada execução só
+pede ao BACEN os meses POSTERIORES ao último já gravado (`$filter` na
+DataGraficosPix). Se o filtro for rejeitado pela API, cai na série completa
+e mantém só os meses novos. O payload é montado a partir do bronze
+acumulado — a série não depende de a API devolver o histórico inteiro.
+
 Uso:
     python ingestion/ingest_usuarios.py
 
@@ -38,14 +44,37 @@ FRONTEND_OUT = Path("assets/data/pix_usuarios.json")
 TIMEOUT = 60
 
 
-def fetch_series() -> list[dict]:
-    """Busca a série histórica completa de usuários cadastrados no DICT."""
-    req = Request(URL, headers={"User-Agent": "pix-observatory/1.0"})
-    with urlopen(req, timeout=TIMEOUT) as resp:
-        data = json.load(resp)
+def fetch_series(after: str | None = None) -> list[dict]:
+    """
+    Busca os meses de usuários cadastrados no DICT posteriores a `after`
+    (YYYY-MM-DD) — ou a série histórica completa se `after` for None.
+    """
+    url = URL
+    if after:
+        url += f"&$filter=DataGraficosPix%20gt%20%27{after}%27"
+    req = Request(url, headers={"User-Agent": "pix-observatory/1.0"})
+    try:
+        with urlopen(req, timeout=TIMEOUT) as resp:
+            data = json.load(resp)
+    except HTTPError as e:
+        if not after:
+            raise
+        print(f"  ⚠ filtro incremental rejeitado ({e.code}) — buscando a série completa.")
+        return [r for r in fetch_series() if r["DataGraficosPix"] > after]
     return data.get("value", [])
 
 
+def _load_bronze() -> list[dict]:
+    """Histórico já acumulado em bronze (sem a coluna de ingestão)."""
+    path = BRONZE / "usuarios_dict.parquet"
+    if not path.exists():
+        return []
+    import pandas as pd
+
+    df = pd.read_parquet(path).drop(columns=["_ingest_ts"], errors="ignore")
+    return json.loads(df.to_json(orient="records"))
+
+
 def build_payload(rows: list[dict]) -> dict:
     """
     Monta o payload com a série completa + KPIs derivados (crescimento
@@ -87,30 +116,40 @@ def build_payload(rows: list[dict]) -> dict:
 
 
 def main() -> int:
-    print("→ Buscando série histórica de usuários cadastrados (DICT)...")
+    stored = _load_bronze()
+    last_month = max((r["DataGraficosPix"] for r in stored), default=None)
+    print(f"→ Buscando usuários cadastrados (DICT) após {last_month or 'o início da série'}...")
     try:
-        rows = fetch_series()
+        new_rows = fetch_series(after=last_month)
     except (URLError, HTTPError, TimeoutError) as e:
         print(f"  ✗ Falha: {e}")
-        return 1
+        if not stored:
+            return 1
+        new_rows = []
 
-    print(f"  ✓ {len(rows)} meses recebidos")
+    print(f"  ✓ {len(new_rows)} mês(es) novo(s) recebido(s) ({len(stored)} já em bronze)")
+    rows = stored + new_rows
     payload = build_payload(rows)
 
-    # Bronze
-    try:
-        import pandas as pd
-        import pyarrow as pa
-        import pyarrow.parquet as pq
-
-        df = pd.DataFrame(rows)
-        df["_ingest_ts"] = datetime.now(timezone.utc).isoformat()
-        BRONZE.mkdir(parents=True, exist_ok=True)
-        out_path = BRONZE / "usuarios_dict.parquet"
-        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), out_path, compression="snappy")
-        print(f"  ✓ {out_path}")
-    except ImportError:
-        print("  ⚠ pandas/pyarrow indisponíveis — pulando bronze.")
+    # Bronze (append-only: acrescenta só os meses novos ao histórico)
+    if new_rows:
+        try:
+            import pandas as pd
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            new_df = pd.DataFrame(new_rows)
+            new_df["_ingest_ts"] = datetime.now(timezone.utc).isoformat()
+            BRONZE.mkdir(parents=True, exist_ok=True)
+            out_path = BRONZE / "usuarios_dict.parquet"
+            if out_path.exists():
+                new_df = pd.concat([pd.read_parquet(out_path), new_df], ignore_index=True)
+            new_df = new_df.drop_duplicates(subset=["DataGraficosPix"], keep="first")
+            pq.write_table(pa.Table.from_pandas(new_df, preserve_index=False), out_path,
+                           compression="snappy")
+            print(f"  ✓ {out_path} ({len(new_df)} meses)")
+        except ImportError:
+            print("  ⚠ pandas/pyarrow indisponíveis — pulando bronze.")
 
     # Gold + frontend
     GOLD.mkdir(parents=True, exist_ok=True)
@@ -14,15 +14,19 @@ Dependências:
 """
 
 import json
+import math
 import sys
 from pathlib import Path
-from datetime import date
+from datetime import date, timedelta
 
 import pandas as pd
-import duckdb
 import pyarrow.parquet as pq
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
+from common.duckdb_profile import connect  # noqa: E402
+from common.quality import (  # noqa: E402
+    enforce, fresh, in_range, not_null, references, row_count_delta, run_suite, unique,
+)
 
 BRONZE = Path("data/bronze")
 SILVER = Path("data/silver")
@@ -31,6 +35,14 @@ GOLD = Path("data/gold")
 for p in [SILVER, GOLD]:
     p.mkdir(parents=True, exist_ok=True)
 
+# Detecção de anomalias diárias (build_gold_anomalias): EWMA por dia da semana
+# sobre log(qtd_transacoes) — log porque a série cresce exponencialmente e o
+# desvio relativo é o que importa; por dia da semana porque fds ≠ dia útil.
+ANOMALY_ALPHA = 0.1       # peso da observação nova (~10 semanas de memória)
+ANOMALY_Z = 4.0           # |z| acima disto → dia anômalo
+ANOMALY_WARMUP = 8        # observações por dia da semana antes de pontuar
+ANOMALY_STATE = GOLD / "pix_anomalias_estado.json"
+
 
 # ─── Bronze → Silver ──────────────────────────────────────────────────────────
 
@@ -88,6 +100,13 @@ def build_silver_daily() -> pd.DataFrame:
     print(f"  ✓ {out} ({len(df):,} linhas)")
     print(f"  Período: {df['data'].min().date()} → {df['data'].max().date()}")
 
+    con = connect(ordered=False)
+    enforce(run_suite(con, "silver.pix_daily", f"read_parquet('{out}')", [
+        not_null("data"), unique("data"), in_range("qtd_transacoes", 1),
+        in_range("valor_total_reais", 0), fresh("data", 10), row_count_delta(5),
+    ]))
+    con.close()
+
     return df
 
 
@@ -108,7 +127,7 @@ def build_gold_monthly() -> pd.DataFrame:
         print("  ⚠ pix_daily.parquet não encontrado — execute build_silver_daily() primeiro.")
         return pd.DataFrame()
 
-    con = duckdb.connect()
+    con = connect(ordered=False)
     df = con.execute("""
         WITH base AS (
             SELECT
@@ -143,6 +162,14 @@ def build_gold_monthly() -> pd.DataFrame:
     out = GOLD / "pix_monthly.parquet"
     df.to_parquet(out, index=False, compression="snappy")
     print(f"  ✓ {out} ({len(df):,} meses)")
+
+    enforce(run_suite(con, "gold.pix_monthly", f"read_parquet('{out}')", [
+        not_null("mes"), unique("mes"), in_range("qtd_transacoes", 1),
+        in_range("dias_com_dados", 1, 31),
+        references("mes", "(SELECT DATE_TRUNC('month', data) AS mes "
+                          "FROM read_parquet('data/silver/pix_daily.parquet'))"),
+    ]))
+    con.close()
     return df
 
 
@@ -164,7 +191,7 @@ def build_gold_kpis() -> dict:
         print("  ⚠ pix_daily.parquet não encontrado — execute build_silver_daily() primeiro.")
         return {}
 
-    con = duckdb.connect()
+    con = connect(ordered=False)
 
     kpis_df = con.execute("""
         SELECT
@@ -247,6 +274,95 @@ def build_gold_chaves() -> pd.DataFrame:
     return df
 
 
+def build_gold_anomalias() -> pd.DataFrame:
+    """
+    Pontua SÓ os dias novos de pix_daily.parquet (data > último dia do
+    estado) contra um estado online por dia da semana (média/variância
+    EWMA de log(qtd)), e anexa os dias sinalizados em pix_anomalias.parquet.
+
+    Tipos sinalizados:
+        - pico / queda: |z| >= ANOMALY_Z (feriado, instabilidade, Black Friday)
+        - lacuna:       dia de calendário ausente na série (falha de reporte)
+
+    Custo O(dias novos): o estado (7 médias/variâncias + último dia) fica em
+    pix_anomalias_estado.json; o histórico nunca é reajustado. Dias
+    sinalizados atualizam o estado com o valor limitado a ±ANOMALY_Z desvios,
+    para um outlier não contaminar a referência das semanas seguintes.
+    """
+    silver_path = SILVER / "pix_daily.parquet"
+    if not silver_path.exists():
+        print("  ⚠ pix_daily.parquet não encontrado — execute build_silver_daily() primeiro.")
+        return pd.DataFrame()
+
+    state = (
+        json.loads(ANOMALY_STATE.read_text(encoding="utf-8")) if ANOMALY_STATE.exists()
+        else {"ultimo_dia": None, "por_dia_semana": {}}
+    )
+    last_day = state["ultimo_dia"]
+
+    con = connect()
+    new_days = con.execute("""
+        SELECT CAST(data AS DATE) AS data, qtd_transacoes
+        FROM read_parquet('data/silver/pix_daily.parquet')
+        WHERE qtd_transacoes > 0 AND ($last_day IS NULL OR data > CAST($last_day AS DATE))
+        ORDER BY data
+    """, {"last_day": last_day}).fetchall()
+    con.close()
+
+    if not new_days:
+        print(f"  ✓ sem dias novos desde {last_day}")
+        return pd.DataFrame()
+
+    flagged = []
+    prev = date.fromisoformat(last_day) if last_day else None
+    for day, qtd in new_days:
+        # Lacunas de calendário desde o último dia processado
+        if prev is not None:
+            gap = prev + timedelta(days=1)
+            while gap < day:
+                flagged.append({"data": gap, "dia_semana": gap.weekday(), "qtd_transacoes": None,
+                                "qtd_esperada": None, "z": None, "tipo": "lacuna"})
+                gap += timedelta(days=1)
+        prev = day
+
+        x = math.log(qtd)
+        st = state["por_dia_semana"].setdefault(str(day.weekday()), {"n": 0, "media": x, "var": 0.0})
+        std = math.sqrt(st["var"])
+        z = (x - st["media"]) / std if std > 0 else 0.0
+        if st["n"] >= ANOMALY_WARMUP and abs(z) >= ANOMALY_Z:
+            flagged.append({"data": day, "dia_semana": day.weekday(), "qtd_transacoes": int(qtd),
+                            "qtd_esperada": round(math.exp(st["media"])), "z": round(z, 2),
+                            "tipo": "pico" if z > 0 else "queda"})
+            x = st["media"] + math.copysign(ANOMALY_Z * std, z)
+
+        diff = x - st["media"]
+        st["media"] += ANOMALY_ALPHA * diff
+        st["var"] = (1 - ANOMALY_ALPHA) * (st["var"] + ANOMALY_ALPHA * diff * diff)
+        st["n"] += 1
+
+    out = GOLD / "pix_anomalias.parquet"
+    new = pd.DataFrame(flagged, columns=["data", "dia_semana", "qtd_transacoes",
+                                         "qtd_esperada", "z", "tipo"])
+    new["data"] = pd.to_datetime(new["data"])
+    new["qtd_transacoes"] = new["qtd_transacoes"].astype("Int64")
+    new["qtd_esperada"] = new["qtd_esperada"].astype("Int64")
+    new["z"] = new["z"].astype("float64")
+    if out.exists():
+        # dias já no parquet são substituídos, não duplicados: se a gravação do
+        # estado abaixo falhou numa execução anterior, os mesmos dias voltam aqui
+        old = pd.read_parquet(out)
+        new = pd.concat([old[~old["data"].isin(new["data"])], new], ignore_index=True)
+    new.to_parquet(out, index=False, compression="snappy")
+
+    # Estado só avança depois que os dias sinalizados estão no parquet — se a
+    # gravação acima falhar, a próxima execução pontua os mesmos dias de novo.
+    state["ultimo_dia"] = new_days[-1][0].isoformat()
+    ANOMALY_STATE.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+    print(f"  ✓ {out} ({len(new_days):,} dia(s) novo(s) pontuado(s), "
+          f"{len(flagged)} sinalizado(s); {len(new):,} no total)")
+    return new
+
+
 if __name__ == "__main__":
     print("🔄 Iniciando transformações Bronze → Silver → Gold")
     print()
@@ -270,4 +386,8 @@ if __name__ == "__main__":
     build_gold_chaves()
     print()
 
+    print("[ Gold ] pix_anomalias.parquet (incremental)")
+    build_gold_anomalias()
+    print()
+
     print("✅ Transformações concluídas.")
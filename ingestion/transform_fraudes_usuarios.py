@@ -0,0 +1,137 @@
+"""
+PIX Observatory — Série mensal de fraudes × usuários × transações (Gold)
+=========================================================================
+Junta, numa única query DuckDB, os três históricos mensais já acumulados:
+
+    data/bronze/fraudes_pix/fraudes_pix_{YYYYMM}.parquet   (ingest_fraudes.py)
+    data/bronze/usuarios_dict/usuarios_dict.parquet        (ingest_usuarios.py)
+    data/gold/pix_monthly.parquet                          (transform.py)
+
+e deriva, por mês: crescimento MoM/YoY de usuários cadastrados e de
+contestações, e a taxa de fraude por milhão de transações (contestações e
+contestações aceitas ÷ qtd_transacoes do mês × 10⁶). MoM/YoY só são
+calculados quando o mês de comparação existe de fato (séries com buraco
+não viram crescimento falso).
+
+Uso:
+    python ingestion/transform_fraudes_usuarios.py
+
+Saída:
+    data/gold/pix_fraudes_usuarios_mensal.parquet
+    assets/data/pix_fraudes_usuarios_mensal.json
+"""
+
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from common.duckdb_profile import connect  # noqa: E402
+from common.quality import enforce, in_range, not_null, run_suite, unique  # noqa: E402
+
+FRAUDES_GLOB = "data/bronze/fraudes_pix/fraudes_pix_*.parquet"
+USUARIOS_PATH = Path("data/bronze/usuarios_dict/usuarios_dict.parquet")
+MONTHLY_PATH = Path("data/gold/pix_monthly.parquet")
+GOLD_OUT = Path("data/gold/pix_fraudes_usuarios_mensal.parquet")
+FRONTEND_OUT = Path("assets/data/pix_fraudes_usuarios_mensal.json")
+
+# Métricas com crescimento MoM/YoY derivado.
+GROWTH_METRICS = ["usuarios_total", "contestacoes", "contestacoes_aceitas"]
+
+
+def _growth_sql(col: str, months: int, suffix: str) -> str:
+    """Crescimento % vs. `months` meses antes — NULL se aquele mês não existe."""
+    return f"""
+        CASE WHEN LAG(mes, {months}) OVER w = mes - INTERVAL {months} MONTH THEN
+            ROUND(100.0 * ({col} - LAG({col}, {months}) OVER w)
+                  / NULLIF(LAG({col}, {months}) OVER w, 0), 2)
+        END AS {col}_{suffix}_pct"""
+
+
+def build_gold() -> int:
+    fraudes_files = sorted(Path(".").glob(FRAUDES_GLOB))
+    if not fraudes_files or not USUARIOS_PATH.exists():
+        print("  ⚠ Bronze de fraudes/usuários ausente — execute ingest_fraudes.py "
+              "e ingest_usuarios.py primeiro.")
+        return 0
+
+    tx_cte = (
+        f"SELECT CAST(mes AS DATE) AS mes, qtd_transacoes FROM read_parquet('{MONTHLY_PATH}')"
+        if MONTHLY_PATH.exists() else
+        "SELECT NULL::DATE AS mes, NULL::BIGINT AS qtd_transacoes WHERE false"
+    )
+    growth = ",".join(
+        _growth_sql(c, 1, "mom") + "," + _growth_sql(c, 12, "yoy") for c in GROWTH_METRICS
+    )
+
+    con = connect()
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE serie AS
+        WITH fraudes AS (
+            SELECT
+                CAST(strptime(CAST(AnoMes AS VARCHAR), '%Y%m') AS DATE)       AS mes,
+                ARG_MAX(QtdePixcontestados, _ingest_ts)                        AS contestacoes,
+                ARG_MAX(Qtdecontestacoesaceitas, _ingest_ts)                   AS contestacoes_aceitas,
+                ARG_MAX(ValorPixcontestadosaceitos, _ingest_ts)                AS valor_contestado_aceito,
+                ARG_MAX(QtdeUsuarioscommarcacoesdefraude, _ingest_ts)          AS usuarios_marcados_fraude,
+                ARG_MAX(PercentualdeDevolucao, _ingest_ts)                     AS med_percentual_devolucao
+            FROM read_parquet('{FRAUDES_GLOB}', union_by_name = true)
+            GROUP BY 1
+        ),
+        usuarios AS (
+            SELECT
+                CAST(DATE_TRUNC('month', CAST(DataGraficosPix AS DATE)) AS DATE) AS mes,
+                ARG_MAX(qtdUsuariosCadastradosDICTTotal, _ingest_ts)              AS usuarios_total,
+                ARG_MAX(qtdUsuariosPessoaFisica, _ingest_ts)                      AS usuarios_pf,
+                ARG_MAX(qtdUsuariosPessoaJuridica, _ingest_ts)                    AS usuarios_pj
+            FROM read_parquet('{USUARIOS_PATH}')
+            GROUP BY 1
+        ),
+        tx AS ({tx_cte}),
+        base AS (
+            SELECT *
+            FROM usuarios
+            FULL JOIN fraudes USING (mes)
+            LEFT JOIN tx USING (mes)
+        )
+        SELECT
+            *,
+            {growth},
+            ROUND(1e6 * contestacoes / NULLIF(qtd_transacoes, 0), 2)          AS contestacoes_por_milhao_tx,
+            ROUND(1e6 * contestacoes_aceitas / NULLIF(qtd_transacoes, 0), 2)  AS fraudes_aceitas_por_milhao_tx
+        FROM base
+        WINDOW w AS (ORDER BY mes)
+        ORDER BY mes
+    """)
+
+    GOLD_OUT.parent.mkdir(parents=True, exist_ok=True)
+    con.execute(f"COPY serie TO '{GOLD_OUT}' (FORMAT PARQUET)")
+    n = con.execute("SELECT COUNT(*) FROM serie").fetchone()[0]
+    print(f"  ✓ {GOLD_OUT} ({n} meses)")
+
+    enforce(run_suite(con, "gold.pix_fraudes_usuarios_mensal", "serie", [
+        not_null("mes"), unique("mes"), in_range("usuarios_total", 0),
+        in_range("contestacoes_aceitas", 0), in_range("med_percentual_devolucao", 0, 100),
+    ]))
+
+    df = con.execute("SELECT * REPLACE (strftime(mes, '%Y-%m') AS mes) FROM serie").df()
+    con.close()
+
+    payload = {
+        "gerado_em": datetime.now(timezone.utc).isoformat(),
+        "fonte": "BACEN Olinda API — EstatisticasFraudesPix, PixUsuariosCadastradosDICT, "
+                 "PixLiquidadosAtual",
+        "serie_mensal": json.loads(df.to_json(orient="records")),
+    }
+    FRONTEND_OUT.parent.mkdir(parents=True, exist_ok=True)
+    FRONTEND_OUT.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"  ✓ {FRONTEND_OUT}")
+    return n
+
+
+if __name__ == "__main__":
+    print("📈 Série mensal de fraudes × usuários × transações")
+    print()
+    build_gold()
+    sys.exit(0)
@@ -0,0 +1,166 @@
+"""
+PIX Observatory — Liga de instituições ao longo do histórico de ChavesPix
+==========================================================================
+Gold sobre o bronze mensal de `ingest_ranking.py`
+(`data/bronze/chaves_pix_participante/`, um snapshot por fechamento de mês —
+ver o modo `--backfill` para preencher o histórico). Diferente do ranking
+de `ingest_ranking.py`, que compara só dois pontos no tempo, aqui UMA query
+DuckDB com window functions calcula, para todo mês em disco:
+
+    - estoque de chaves por instituição (ISPB)
+    - posição no ranking do mês e variação vs. o mês anterior
+    - market share (% das chaves do mês) e variação em p.p.
+    - concentração do mercado: HHI (0–10.000) e CR5 (share dos 5 maiores)
+
+Mesma ressalva metodológica do ranking: `ChavesPix` devolve no máximo
+1000 linhas por mês (ordenadas por qtdChaves desc), então o share é sobre
+o topo do mercado — estável e comparável mês a mês, não o total exato.
+
+O JSON do frontend tem tamanho FIXO: top TOP_N do último mês com a
+trajetória dos últimos TRAJECTORY_MONTHS meses + a série de concentração
+da mesma janela. O histórico completo fica só no Parquet gold.
+
+Uso:
+    python ingestion/transform_ranking.py
+
+Saída:
+    data/gold/pix_ranking_liga.parquet
+    assets/data/pix_ranking_liga.json
+"""
+
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from common.duckdb_profile import connect  # noqa: E402
+from common.quality import enforce, in_range, not_null, run_suite, unique  # noqa: E402
+
+BRONZE_GLOB = "data/bronze/chaves_pix_participante/chaves_pix_*.parquet"
+GOLD_OUT = Path("data/gold/pix_ranking_liga.parquet")
+FRONTEND_OUT = Path("assets/data/pix_ranking_liga.json")
+
+TOP_N = 10               # instituições exibidas
+TRAJECTORY_MONTHS = 12   # janela da trajetória/série no JSON
+
+
+def build_league(con) -> int:
+    """Materializa a liga mês × instituição no gold. Retorna nº de meses."""
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE liga AS
+        WITH snap AS (
+            SELECT
+                CAST(Data AS DATE)                  AS mes,
+                ISPB                                AS ispb,
+                ARG_MAX(TRIM(Nome), _ingest_ts)     AS nome_mes,
+                CAST(SUM(qtdChaves) AS BIGINT)      AS chaves
+            FROM read_parquet('{BRONZE_GLOB}', union_by_name = true)
+            WHERE ISPB IS NOT NULL
+            GROUP BY 1, 2
+        ),
+        share AS (
+            SELECT
+                *,
+                -- nome canônico = o do mês mais recente (bancos trocam de razão social)
+                ARG_MAX(nome_mes, mes) OVER (PARTITION BY ispb)              AS nome,
+                RANK() OVER (PARTITION BY mes ORDER BY chaves DESC, ispb)    AS posicao,
+                100.0 * chaves / SUM(chaves) OVER (PARTITION BY mes)         AS share_pct
+            FROM snap
+        )
+        SELECT
+            mes,
+            ispb,
+            nome,
+            chaves,
+            posicao,
+            LAG(posicao) OVER w - posicao                                   AS posicao_delta,
+            ROUND(share_pct, 3)                                             AS share_pct,
+            ROUND(share_pct - LAG(share_pct) OVER w, 3)                     AS share_delta_pp,
+            ROUND(SUM(share_pct * share_pct) OVER (PARTITION BY mes), 1)      AS hhi,
+            ROUND(SUM(CASE WHEN posicao <= 5 THEN share_pct END) OVER (PARTITION BY mes), 2) AS cr5_pct,
+            COUNT(*) OVER (PARTITION BY mes)                                AS n_instituicoes
+        FROM share
+        WINDOW w AS (PARTITION BY ispb ORDER BY mes)
+        ORDER BY mes, posicao
+    """)
+
+    GOLD_OUT.parent.mkdir(parents=True, exist_ok=True)
+    con.execute(f"COPY liga TO '{GOLD_OUT}' (FORMAT PARQUET)")
+    n_months = con.execute("SELECT COUNT(DISTINCT mes) FROM liga").fetchone()[0]
+    print(f"  ✓ {GOLD_OUT} ({n_months} meses)")
+
+    enforce(run_suite(con, "gold.pix_ranking_liga", "liga", [
+        not_null("mes"), not_null("ispb"), unique("mes", "ispb"),
+        in_range("share_pct", 0, 100), in_range("hhi", 0, 10000),
+    ]))
+    return n_months
+
+
+def export_json(con) -> dict:
+    """JSON de tamanho fixo: top N do último mês + trajetórias + concentração."""
+    top = con.execute(f"""
+        WITH janela AS (
+            SELECT DISTINCT mes FROM liga ORDER BY mes DESC LIMIT {TRAJECTORY_MONTHS}
+        ),
+        ultimo AS (SELECT MAX(mes) AS mes FROM liga),
+        top_n AS (
+            SELECT l.* FROM liga l, ultimo u
+            WHERE l.mes = u.mes AND l.posicao <= {TOP_N}
+        )
+        SELECT
+            t.posicao, t.ispb, t.nome, t.chaves, t.posicao_delta, t.share_pct, t.share_delta_pp,
+            -- alinhado a `meses`: null nos meses em que a instituição não aparece
+            LIST(l.posicao ORDER BY j.mes)   AS trajetoria_posicao,
+            LIST(l.share_pct ORDER BY j.mes) AS trajetoria_share_pct
+        FROM top_n t
+        CROSS JOIN janela j
+        LEFT JOIN liga l ON l.ispb = t.ispb AND l.mes = j.mes
+        GROUP BY ALL
+        ORDER BY t.posicao
+    """).df()
+
+    concentracao = con.execute(f"""
+        SELECT DISTINCT strftime(mes, '%Y-%m') AS mes, hhi, cr5_pct, n_instituicoes
+        FROM liga
+        WHERE mes IN (SELECT DISTINCT mes FROM liga ORDER BY mes DESC LIMIT {TRAJECTORY_MONTHS})
+        ORDER BY mes
+    """).df()
+
+    meses = concentracao["mes"].tolist()
+    top["trajetoria_posicao"] = top["trajetoria_posicao"].apply(list)
+    top["trajetoria_share_pct"] = top["trajetoria_share_pct"].apply(list)
+
+    payload = {
+        "gerado_em": datetime.now(timezone.utc).isoformat(),
+        "fonte": "BACEN Olinda API — Pix_DadosAbertos / ChavesPix (DICT)",
+        "metrica": "Estoque de chaves PIX por instituição — share sobre o topo "
+                   "(até 1000 linhas/mês) publicado pelo BACEN",
+        "meses": meses,
+        "top": json.loads(top.to_json(orient="records")),
+        "concentracao": json.loads(concentracao.to_json(orient="records")),
+    }
+
+    FRONTEND_OUT.parent.mkdir(parents=True, exist_ok=True)
+    FRONTEND_OUT.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"  ✓ {FRONTEND_OUT} (top {len(top)}, {len(meses)} meses)")
+    return payload
+
+
+def main() -> int:
+    if not list(Path(".").glob(BRONZE_GLOB)):
+        print("  ⚠ Nenhum snapshot em bronze/chaves_pix_participante/ — "
+              "execute ingestion/ingest_ranking.py primeiro.")
+        return 0
+
+    con = connect()
+    build_league(con)
+    export_json(con)
+    con.close()
+    return 0
+
+
+if __name__ == "__main__":
+    print("🏆 Liga de instituições PIX — histórico de chaves DICT")
+    print()
+    sys.exit(main())
@@ -0,0 +1,386 @@
+"""
+PIX Observatory — Confiabilidade do SPI (interrupções + disponibilidade)
+=========================================================================
+Consome o bronze que `ingest_spi.py` já coleta e que até aqui ficava parado:
+
+    bronze/spi_interrupcoes/     (PixInterrupcaoSPI — log de incidentes)
+    bronze/spi_disponibilidade/  (PixDisponibilidadeSPI — índice mensal oficial)
+
+Silver (incremental): cada interrupção vira uma linha tipada (início,
+término, duração, tempo no ar desde a interrupção anterior). Só linhas com
+início a partir de `marca d'água − LOOKBACK_DAYS` (maior `inicio` já no
+silver, menos a janela de revisão) são relidas e regravadas por `inicio` —
+assim um término/duração preenchido ou corrigido depois da primeira coleta
+é incorporado; o "tempo no ar" é recalculado com LAG() contra a última
+linha mantida.
+
+Gold (incremental): por mês fechado desde o lançamento do PIX —
+uptime %, nº de interrupções, MTTR, MTBF, distribuição de duração
+(p50/p90/máx) e um score de confiabilidade 0–100 (consumo do error budget
+de SLA_TARGET_PCT) com média móvel de 3 meses. Só os meses a partir da
+primeira interrupção nova (ou do primeiro mês ainda sem linha no gold) são
+recalculados; os anteriores são mantidos como estão. Meses anteriores à
+cobertura do bronze (primeiro arquivo coletado ou primeira interrupção
+registrada, o que vier antes) saem com uptime/score NULL — sem log não há
+como afirmar 100% no ar.
+
+Uso:
+    python ingestion/transform_spi.py
+
+Saída:
+    data/silver/spi_interrupcoes.parquet
+    data/gold/pix_spi_confiabilidade.parquet
+    assets/data/pix_spi_confiabilidade.json   (compacto, p/ o frontend)
+"""
+
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from common.duckdb_profile import connect  # noqa: E402
+from common.quality import enforce, in_range, not_null, run_suite, unique  # noqa: E402
+
+BRONZE = Path("data/bronze")
+SILVER_OUT = Path("data/silver/spi_interrupcoes.parquet")
+GOLD_OUT = Path("data/gold/pix_spi_confiabilidade.parquet")
+FRONTEND_OUT = Path("assets/data/pix_spi_confiabilidade.json")
+
+PIX_LAUNCH = "2020-11-01"   # primeiro mês da série mensal
+LOOKBACK_DAYS = 30          # interrupções já gravadas que ainda podem ser corrigidas
+SLA_TARGET_PCT = 99.99      # meta usada no error budget do score
+JSON_MONTHS = 24            # meses exibidos no JSON do frontend
+
+# Faixas de duração da distribuição exibida (limite superior em segundos).
+DURATION_BUCKETS = [
+    ("< 1 min", 60),
+    ("1–5 min", 300),
+    ("5–30 min", 1800),
+    ("30 min–2 h", 7200),
+    ("> 2 h", None),
+]
+
+
+def _files_sql(files: list[Path]) -> str:
+    return "[" + ", ".join(f"'{f}'" for f in files) + "]"
+
+
+# ─── Bronze → Silver ──────────────────────────────────────────────────────────
+
+def build_silver_interrupcoes(con) -> pd.Timestamp | None:
+    """
+    Regrava no silver as interrupções com início a partir de
+    `marca d'água − LOOKBACK_DAYS` (upsert por `inicio`): novas entram e as
+    já gravadas cujo término/duração mudou no bronze são corrigidas.
+
+    Returns:
+        Início da primeira interrupção nova ou alterada (None se nada mudou).
+    """
+    files = sorted(BRONZE.glob("spi_interrupcoes/*.parquet"))
+    if not files:
+        print("  ⚠ Nenhum arquivo bronze/spi_interrupcoes/ encontrado.")
+        print("  → Execute ingestion/ingest_spi.py primeiro.")
+        return None
+
+    existing = SILVER_OUT.exists()
+    watermark = (
+        con.execute(f"SELECT MAX(inicio) FROM read_parquet('{SILVER_OUT}')").fetchone()[0]
+        if existing else None
+    )
+    cutoff = watermark - pd.Timedelta(days=LOOKBACK_DAYS) if watermark is not None else None
+
+    # A linha "TOTAL" do endpoint (e qualquer linha sem data válida) cai no
+    # TRY_STRPTIME → NULL. Duração vem das datas; o texto "1h2m3s" é só
+    # fallback quando o término não vem preenchido. A mesma interrupção pode
+    # aparecer em vários arquivos — vale a versão da coleta mais recente.
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE janela_bronze AS
+        SELECT
+            inicio,
+            termino,
+            COALESCE(
+                DATE_DIFF('second', inicio, termino),
+                COALESCE(TRY_CAST(regexp_extract(Interrupcao, '(\\d+)h', 1) AS INTEGER), 0) * 3600
+                + COALESCE(TRY_CAST(regexp_extract(Interrupcao, '(\\d+)m', 1) AS INTEGER), 0) * 60
+                + COALESCE(TRY_CAST(regexp_extract(Interrupcao, '(\\d+)s', 1) AS INTEGER), 0)
+            ) AS duracao_s
+        FROM (
+            SELECT
+                TRY_STRPTIME(DataHoraInicioInt, '%d/%m/%Y %H:%M:%S') AS inicio,
+                TRY_STRPTIME(DataHoraTerminoInt, '%d/%m/%Y %H:%M:%S') AS termino,
+                Interrupcao,
+                _ingest_ts,
+                filename
+            FROM read_parquet({_files_sql(files)}, union_by_name = true, filename = true)
+        )
+        WHERE inicio IS NOT NULL
+          AND ($cutoff IS NULL OR inicio >= $cutoff)
+        QUALIFY ROW_NUMBER() OVER (
+            PARTITION BY inicio ORDER BY _ingest_ts DESC NULLS LAST, filename DESC
+        ) = 1
+    """, {"cutoff": cutoff})
+
+    previous = (
+        f"SELECT inicio, termino, duracao_s, uptime_antes_s FROM read_parquet('{SILVER_OUT}')"
+        if existing else
+        "SELECT NULL::TIMESTAMP AS inicio, NULL::TIMESTAMP AS termino, "
+        "NULL::BIGINT AS duracao_s, NULL::BIGINT AS uptime_antes_s WHERE false"
+    )
+    con.execute(f"CREATE OR REPLACE TEMP TABLE silver_atual AS {previous}")
+
+    n_changed, first_new = con.execute("""
+        SELECT COUNT(*), MIN(inicio) FROM (
+            SELECT inicio, termino, duracao_s FROM janela_bronze
+            EXCEPT
+            SELECT inicio, termino, duracao_s FROM silver_atual
+        )
+    """).fetchone()
+    if not n_changed:
+        print(f"  ✓ {SILVER_OUT} sem interrupções novas ou alteradas "
+              f"(marca d'água: {watermark}, revisão desde {cutoff})")
+        return None
+
+    # Antes do corte: linhas mantidas como estão. Da janela em diante: versão
+    # do bronze (ou a do silver, se a interrupção não está mais no bronze) e
+    # "tempo no ar" recalculado com LAG() — inclusive contra a última mantida.
+    con.execute("""
+        CREATE OR REPLACE TEMP TABLE silver_spi AS
+        WITH todas AS (
+            SELECT inicio, termino, duracao_s, uptime_antes_s, false AS revisar
+            FROM silver_atual
+            WHERE $cutoff IS NOT NULL AND inicio < $cutoff
+            UNION ALL
+            SELECT inicio, termino, duracao_s, NULL, true FROM janela_bronze
+            UNION ALL
+            SELECT s.inicio, s.termino, s.duracao_s, NULL, true
+            FROM silver_atual s
+            ANTI JOIN janela_bronze b USING (inicio)
+            WHERE $cutoff IS NULL OR s.inicio >= $cutoff
+        )
+        SELECT
+            inicio,
+            termino,
+            duracao_s,
+            CASE WHEN revisar THEN DATE_DIFF(
+                'second',
+                LAG(COALESCE(termino, inicio + duracao_s * INTERVAL 1 SECOND)) OVER (ORDER BY inicio),
+                inicio
+            ) ELSE uptime_antes_s END AS uptime_antes_s
+        FROM todas
+        ORDER BY inicio
+    """, {"cutoff": cutoff})
+    SILVER_OUT.parent.mkdir(parents=True, exist_ok=True)
+    con.execute(f"COPY silver_spi TO '{SILVER_OUT}' (FORMAT PARQUET)")
+    n_total = con.execute("SELECT COUNT(*) FROM silver_spi").fetchone()[0]
+    print(f"  ✓ {SILVER_OUT} ({n_changed} interrupções novas/alteradas, {n_total} no total)")
+    return pd.Timestamp(first_new)
+
+
+# ─── Silver → Gold ────────────────────────────────────────────────────────────
+
+def _disponibilidade_oficial_sql() -> str | None:
+    """SELECT (mes, disponibilidade_oficial_pct) do bronze PixDisponibilidadeSPI,
+    ou None se o bronze não existir / não tiver a coluna esperada."""
+    files = sorted(BRONZE.glob("spi_disponibilidade/*.parquet"))
+    if not files:
+        return None
+    cols = pd.read_parquet(files[-1]).columns
+    value_col = next((c for c in cols if "disponib" in c.lower()), None)
+    if "DataBase" not in cols or value_col is None:
+        return None
+    return f"""
+        SELECT DATE_TRUNC('month', TRY_CAST(DataBase AS DATE)) AS mes,
+               ARG_MAX(TRY_CAST("{value_col}" AS DOUBLE), _ingest_ts) AS disponibilidade_oficial_pct
+        FROM read_parquet('{files[-1]}')
+        GROUP BY 1
+    """
+
+
+def _coverage_start_sql() -> str:
+    """Primeiro mês com log de interrupções: o do arquivo bronze mais antigo
+    (spi_interrupcoes_YYYY_MM) ou o da primeira interrupção, o que vier antes."""
+    months = [f.stem.split("_")[-2:] for f in BRONZE.glob("spi_interrupcoes/*.parquet")]
+    first_file = min(f"{y}-{m}-01" for y, m in months) if months else None
+    first_file_sql = f"DATE '{first_file}'" if first_file else "NULL::DATE"
+    return (f"(SELECT LEAST(DATE_TRUNC('month', MIN(inicio))::DATE, {first_file_sql}) "
+            f"FROM read_parquet('{SILVER_OUT}'))")
+
+
+def build_gold_confiabilidade(con, first_new: pd.Timestamp | None) -> pd.DataFrame:
+    """
+    Recalcula os meses afetados por interrupções novas (e os meses fechados
+    ainda sem linha no gold) e mantém o restante do gold como está.
+    """
+    if not SILVER_OUT.exists():
+        print("  ⚠ spi_interrupcoes.parquet não encontrado — nada a agregar.")
+        return pd.DataFrame()
+
+    gold_exists = GOLD_OUT.exists()
+    candidates = []
+    if first_new is not None:
+        candidates.append(f"DATE_TRUNC('month', TIMESTAMP '{first_new}')::DATE")
+    if gold_exists:
+        candidates.append(
+            f"(SELECT MAX(mes) + INTERVAL 1 MONTH FROM read_parquet('{GOLD_OUT}'))::DATE"
+        )
+    recompute_from = (
+        f"LEAST({', '.join(candidates)})" if gold_exists else f"DATE '{PIX_LAUNCH}'"
+    )
+
+    oficial_sql = _disponibilidade_oficial_sql()
+    oficial_join = (
+        f"LEFT JOIN ({oficial_sql}) o ON o.mes = m.mes" if oficial_sql else
+        "LEFT JOIN (SELECT NULL::DATE AS mes, NULL::DOUBLE AS disponibilidade_oficial_pct) o "
+        "ON o.mes = m.mes"
+    )
+    kept = (
+        f"SELECT * EXCLUDE (score_3m) FROM read_parquet('{GOLD_OUT}') "
+        f"WHERE mes < (SELECT inicio FROM janela)"
+        if gold_exists else "SELECT * FROM recalculado WHERE false"
+    )
+
+    budget_frac = 1 - SLA_TARGET_PCT / 100
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE gold_spi AS
+        WITH janela AS (
+            SELECT {recompute_from} AS inicio,
+                   (DATE_TRUNC('month', current_date) - INTERVAL 1 MONTH)::DATE AS fim
+        ),
+        meses AS (
+            SELECT CAST(mes AS DATE) AS mes,
+                   EXTRACT(epoch FROM (mes + INTERVAL 1 MONTH) - mes) AS segundos_mes
+            FROM janela, generate_series(janela.inicio, janela.fim, INTERVAL 1 MONTH) g(mes)
+        ),
+        por_mes AS (
+            SELECT
+                DATE_TRUNC('month', inicio)::DATE AS mes,
+                COUNT(*)                                  AS n_interrupcoes,
+                SUM(duracao_s)                            AS downtime_s,
+                AVG(duracao_s)                            AS mttr_s,
+                AVG(uptime_antes_s) / 3600.0              AS mtbf_h,
+                QUANTILE_CONT(duracao_s, 0.5)             AS duracao_p50_s,
+                QUANTILE_CONT(duracao_s, 0.9)             AS duracao_p90_s,
+                MAX(duracao_s)                            AS duracao_max_s
+            FROM read_parquet('{SILVER_OUT}')
+            WHERE inicio >= (SELECT inicio FROM janela)
+            GROUP BY 1
+        ),
+        recalculado AS (
+            SELECT
+                m.mes,
+                COALESCE(p.n_interrupcoes, 0)                          AS n_interrupcoes,
+                COALESCE(p.downtime_s, 0)                              AS downtime_s,
+                ROUND(100 * (1 - COALESCE(p.downtime_s, 0) / m.segundos_mes), 5) AS uptime_pct,
+                o.disponibilidade_oficial_pct,
+                ROUND(p.mttr_s, 1)                                     AS mttr_s,
+                ROUND(p.mtbf_h, 1)                                     AS mtbf_h,
+                p.duracao_p50_s,
+                p.duracao_p90_s,
+                p.duracao_max_s,
+                ROUND(100 * GREATEST(
+                    0, 1 - COALESCE(p.downtime_s, 0) / (m.segundos_mes * {budget_frac})
+                ), 1)                                                  AS score
+            FROM meses m
+            LEFT JOIN por_mes p ON p.mes = m.mes
+            {oficial_join}
+        ),
+        combinado AS (
+            {kept}
+            UNION ALL BY NAME
+            SELECT * FROM recalculado
+        ),
+        cobertura AS (
+            SELECT {_coverage_start_sql()} AS inicio
+        ),
+        coberto AS (
+            SELECT * REPLACE (
+                CASE WHEN mes >= (SELECT inicio FROM cobertura) THEN n_interrupcoes END AS n_interrupcoes,
+                CASE WHEN mes >= (SELECT inicio FROM cobertura) THEN downtime_s END AS downtime_s,
+                CASE WHEN mes >= (SELECT inicio FROM cobertura) THEN uptime_pct END AS uptime_pct,
+                CASE WHEN mes >= (SELECT inicio FROM cobertura) THEN score END AS score
+            )
+            FROM combinado
+        )
+        SELECT
+            *,
+            ROUND(AVG(score) OVER (ORDER BY mes ROWS BETWEEN 2 PRECEDING AND CURRENT ROW), 1)
+                AS score_3m
+        FROM coberto
+        ORDER BY mes
+    """)
+
+    GOLD_OUT.parent.mkdir(parents=True, exist_ok=True)
+    con.execute(f"COPY gold_spi TO '{GOLD_OUT}' (FORMAT PARQUET)")
+    df = con.execute("SELECT * FROM gold_spi ORDER BY mes").df()
+    print(f"  ✓ {GOLD_OUT} ({len(df):,} meses)")
+
+    enforce(run_suite(con, "gold.pix_spi_confiabilidade", f"read_parquet('{GOLD_OUT}')", [
+        not_null("mes"), unique("mes"), in_range("uptime_pct", 0, 100),
+        in_range("score", 0, 100), in_range("n_interrupcoes", 0),
+    ]))
+    return df
+
+
+def _duration_distribution(con) -> list[dict]:
+    """Contagem histórica de interrupções por faixa de duração."""
+    cases, lower = [], 0
+    for label, upper in DURATION_BUCKETS:
+        cond = f"duracao_s >= {lower}" + (f" AND duracao_s < {upper}" if upper else "")
+        cases.append(f"COUNT_IF({cond}) AS \"{label}\"")
+        lower = upper
+    row = con.execute(
+        f"SELECT {', '.join(cases)} FROM read_parquet('{SILVER_OUT}')"
+    ).fetchone()
+    return [{"faixa": label, "n": int(n)} for (label, _), n in zip(DURATION_BUCKETS, row)]
+
+
+def export_json(con, gold: pd.DataFrame) -> dict:
+    """JSON compacto: últimos JSON_MONTHS meses + agregados do histórico."""
+    recent = gold.tail(JSON_MONTHS).copy()
+    recent["mes"] = recent["mes"].astype(str).str[:7]
+    meses = json.loads(recent.to_json(orient="records", double_precision=5))
+
+    total_down = float(gold["downtime_s"].sum())
+    # meses antes do log de interrupções ficam no gold sem uptime/score —
+    # o histórico começa no primeiro mês com cobertura, não em 2020-11
+    covered = gold.loc[gold["uptime_pct"].notna(), "mes"]
+    payload = {
+        "gerado_em": datetime.now(timezone.utc).isoformat(),
+        "fonte": "BACEN SPI — PixInterrupcaoSPI / PixDisponibilidadeSPI",
+        "sla_meta_pct": SLA_TARGET_PCT,
+        "historico": {
+            "desde": str(covered.min())[:7] if not covered.empty else None,
+            "n_interrupcoes": int(gold["n_interrupcoes"].sum()),
+            "downtime_total_min": round(total_down / 60, 1),
+            "uptime_medio_pct": round(float(gold["uptime_pct"].mean()), 5),
+            "distribuicao_duracao": _duration_distribution(con),
+        },
+        "meses": meses,
+    }
+
+    FRONTEND_OUT.parent.mkdir(parents=True, exist_ok=True)
+    FRONTEND_OUT.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"  ✓ {FRONTEND_OUT}")
+    return payload
+
+
+if __name__ == "__main__":
+    print("🔄 Confiabilidade do SPI — interrupções → silver → gold")
+    print()
+
+    con = connect()
+    print("[ Silver ] spi_interrupcoes.parquet")
+    first_new = build_silver_interrupcoes(con)
+    print()
+
+    print("[ Gold ] pix_spi_confiabilidade.parquet + JSON")
+    gold = build_gold_confiabilidade(con, first_new)
+    if not gold.empty:
+        export_json(con, gold)
+    con.close()
+    print()
+
+    print("✅ Confiabilidade do SPI concluída.")
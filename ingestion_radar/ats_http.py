@@ -0,0 +1,251 @@
+"""
+Data Stack Radar BR — Núcleo HTTP compartilhado dos coletores ATS
+==================================================================
+Os coletores Greenhouse/Lever/Ashby/InHire faziam uma empresa por vez com
+`time.sleep` fixo entre requests — quase todo o tempo de parede era espera
+ociosa. Este módulo dá a eles um "cliente" comum (dict simples, como o
+resto do repo) com:
+
+    - pool de conexões (uma `requests.Session` com HTTPAdapter dimensionado
+      para a concorrência) — keep-alive entre boards do mesmo host
+    - token bucket POR HOST (`rate` req/s, rajada `burst`) — a educação com
+      cada API é por host, não por script: com vários boards em voo, o host
+      continua vendo no máximo `rate` req/s
+    - teto GLOBAL de requests simultâneos (semáforo)
+    - retry com backoff exponencial + jitter em erro de rede, 429 e 5xx;
+      `Retry-After` pausa o HOST inteiro (todas as threads), não só o
+      request que levou o 429
+    - ritmo adaptativo (AIMD): 429/503 ou resposta lenta (> SLOW_LATENCY)
+      reduz a taxa do host; respostas rápidas a devolvem aos poucos até
+      `rate` — `rate` é teto, nunca é ultrapassado
+
+`run_boards()` roda a coleta de cada board num ThreadPoolExecutor e devolve
+os resultados NA ORDEM do catálogo (log e bronze determinísticos). O
+coletor Gupy (`collect_jobs.py`) usa o mesmo cliente para paginar termos
+em paralelo sob um único orçamento de requests.
+
+Threads + requests (e não asyncio/httpx): o gargalo é espera de rede, as
+threads liberam o GIL no I/O, e `requests` já é a dependência do radar.
+
+Fingerprint de board (Greenhouse/Lever/Ashby): `board_state.json` no
+diretório bronze de cada fonte guarda, por empresa, os validadores HTTP
+(`ETag`/`Last-Modified`), um hash da lista ordenada de (job id, versão)
+e o snapshot com as linhas completas do board. Board inalterado (304 ou mesmo
+hash) vira UMA linha marcadora `_unchanged_from` no bronze da semana, que o
+`silver_jobs.py` expande a partir do snapshot apontado.
+
+Uso (como módulo):
+    from ats_http import get, make_client, run_boards
+    client = make_client(rate=1.0)
+    results = run_boards(client, _collect_board, COMPANIES.items())
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = "data-stack-radar-br/1.0"
+TIMEOUT = 30
+
+DEFAULT_RATE = 1.0          # req/s por host (≈ o antigo sleep de 1s)
+DEFAULT_BURST = 2           # rajada inicial permitida por host
+DEFAULT_CONCURRENCY = 8     # requests simultâneos no total
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0          # s — 1, 2, 4 (+ jitter)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+THROTTLE_STATUS = {429, 503}
+BOARD_STATE_FILE = "board_state.json"
+SLOW_LATENCY = 2.0          # s — acima disso o host está sofrendo: desacelera
+MIN_RATE_FRACTION = 0.1     # piso do ritmo adaptativo (fração de `rate`)
+
+
+def make_client(rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                concurrency: int = DEFAULT_CONCURRENCY) -> dict:
+    """Cria o cliente compartilhado (sessão + buckets por host + semáforo)."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return {
+        "session": session,
+        "rate": float(rate),
+        "burst": float(burst),
+        "concurrency": concurrency,
+        "buckets": {},              # host → {"tokens", "ts", "rate", "blocked_until"}
+        "lock": threading.Lock(),
+        "slots": threading.BoundedSemaphore(concurrency),
+    }
+
+
+def _bucket(client: dict, host: str, now: float) -> dict:
+    """Bucket do host (criado cheio). Chamar com `client["lock"]` tomado."""
+    return client["buckets"].setdefault(host, {
+        "tokens": client["burst"], "ts": now, "rate": client["rate"], "blocked_until": 0.0,
+    })
+
+
+def _acquire(client: dict, host: str) -> None:
+    """Token bucket do host: bloqueia até haver 1 token disponível (e até
+    passar um eventual `Retry-After` do host)."""
+    while True:
+        with client["lock"]:
+            now = time.monotonic()
+            bucket = _bucket(client, host, now)
+            if now < bucket["blocked_until"]:
+                wait = bucket["blocked_until"] - now
+            else:
+                refill_from = max(bucket["ts"], bucket["blocked_until"])
+                bucket["tokens"] = min(client["burst"],
+                                       bucket["tokens"] + (now - refill_from) * bucket["rate"])
+                bucket["ts"] = now
+                if bucket["tokens"] >= 1:
+                    bucket["tokens"] -= 1
+                    return
+                wait = (1 - bucket["tokens"]) / bucket["rate"]
+        time.sleep(wait)
+
+
+def _observe(client: dict, host: str, latency: float, resp: requests.Response | None) -> None:
+    """Ajusta o ritmo do host pela resposta: corte multiplicativo em
+    throttling/lentidão, recuperação aditiva em resposta rápida."""
+    ceiling = client["rate"]
+    with client["lock"]:
+        now = time.monotonic()
+        bucket = _bucket(client, host, now)
+        throttled = resp is not None and resp.status_code in THROTTLE_STATUS
+        if throttled:
+            bucket["rate"] = max(ceiling * MIN_RATE_FRACTION, bucket["rate"] / 2)
+            retry_after = _retry_after(resp)
+            if retry_after is not None:
+                bucket["blocked_until"] = max(bucket["blocked_until"], now + retry_after)
+                bucket["tokens"] = 0.0
+        elif latency > SLOW_LATENCY:
+            bucket["rate"] = max(ceiling * MIN_RATE_FRACTION, bucket["rate"] * 0.75)
+        else:
+            bucket["rate"] = min(ceiling, bucket["rate"] + ceiling * 0.1)
+
+
+def _retry_after(resp: requests.Response) -> float | None:
+    value = (resp.headers.get("Retry-After") or "").strip()
+    return float(value) if value.isdigit() else None
+
+
+def _retry_delay(attempt: int, resp: requests.Response | None) -> float:
+    """Backoff + jitter. Com `Retry-After` o host já está bloqueado até lá
+    (ver `_observe`), então basta o jitter para não voltar em rajada."""
+    if resp is not None and _retry_after(resp) is not None:
+        return BACKOFF_BASE * random.random()
+    return BACKOFF_BASE * (2 ** attempt) * (1 + random.random())
+
+
+def get(client: dict, url: str, **kwargs) -> requests.Response:
+    """GET educado: espera o bucket do host, ocupa um slot global, e refaz
+    (backoff + jitter) em erro de rede/429/5xx. Levanta a última falha."""
+    host = urlsplit(url).netloc
+    kwargs.setdefault("timeout", TIMEOUT)
+    for attempt in range(MAX_RETRIES + 1):
+        _acquire(client, host)
+        resp = None
+        started = time.monotonic()
+        try:
+            with client["slots"]:
+                resp = client["session"].get(url, **kwargs)
+            _observe(client, host, time.monotonic() - started, resp)
+            if resp.status_code not in RETRY_STATUS:
+                resp.raise_for_status()
+                return resp
+            if attempt == MAX_RETRIES:
+                resp.raise_for_status()
+        except (requests.ConnectionError, requests.Timeout):
+            _observe(client, host, float("inf"), None)   # falha de rede conta como lentidão
+            if attempt == MAX_RETRIES:
+                raise
+        time.sleep(_retry_delay(attempt, resp))
+    raise RuntimeError("unreachable")
+
+
+def run_boards(client: dict, fn, boards) -> list:
+    """Roda `fn(client, slug, name)` para cada (slug, name) em paralelo
+    (até `concurrency` boards em voo) e devolve os resultados na ordem."""
+    boards = list(boards)
+    if not boards:
+        return []
+    with ThreadPoolExecutor(max_workers=min(client["concurrency"], len(boards))) as pool:
+        return list(pool.map(lambda b: fn(client, *b), boards))
+
+
+# ─── Fingerprint de board (requests condicionais) ──────────────────────────
+
+def weekly_snapshot(bronze_dir: Path, prefix: str) -> Path:
+    """Arquivo bronze da semana ISO corrente: {prefix}_{YYYY}_W{WW}.parquet."""
+    iso_year, iso_week, _ = datetime.now(timezone.utc).isocalendar()
+    return bronze_dir / f"{prefix}_{iso_year}_W{iso_week:02d}.parquet"
+
+
+def load_board_state(bronze_dir: Path) -> dict:
+    path = bronze_dir / BOARD_STATE_FILE
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+
+def save_board_state(bronze_dir: Path, state: dict) -> None:
+    bronze_dir.mkdir(parents=True, exist_ok=True)
+    (bronze_dir / BOARD_STATE_FILE).write_text(
+        json.dumps(state, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def reusable_snapshot(entry: dict | None, bronze_dir: Path, out_path: Path) -> str | None:
+    """Snapshot anterior do board, se ainda dá para apontar para ele — o da
+    própria semana não serve (vai ser sobrescrito por esta execução)."""
+    snapshot = (entry or {}).get("snapshot")
+    if snapshot and snapshot != out_path.name and (bronze_dir / snapshot).exists():
+        return snapshot
+    return None
+
+
+def conditional_headers(entry: dict | None) -> dict:
+    headers = {}
+    if (entry or {}).get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if (entry or {}).get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def board_validators(resp: requests.Response) -> dict:
+    return {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified")}
+
+
+def jobs_fingerprint(jobs: list[dict], id_key: str = "id", version_key: str | None = None,
+                     version_fields: tuple[str, ...] = ()) -> str:
+    """Hash da lista ordenada de job ids + versão de cada vaga: o campo
+    `version_key` quando a API o dá (Greenhouse `updated_at`), senão um
+    digest dos `version_fields` que o coletor usa (Lever/Ashby não expõem
+    data de edição — sem isso, vaga editada pareceria inalterada)."""
+    def version(job: dict) -> str:
+        if version_key:
+            return str(job.get(version_key))
+        if version_fields:
+            fields = json.dumps([job.get(f) for f in version_fields], sort_keys=True, default=str)
+            return hashlib.sha256(fields.encode("utf-8")).hexdigest()[:16]
+        return ""
+
+    keys = sorted(f"{job.get(id_key)}|{version(job)}" for job in jobs)
+    return hashlib.sha256("\n".join(keys).encode("utf-8")).hexdigest()[:16]
+
+
+def unchanged_marker(slug: str, name: str, snapshot: str) -> dict:
+    """Linha marcadora de board inalterado (resolvida no silver)."""
+    return {"company_slug": slug, "company": name, "_unchanged_from": snapshot}
+
@@ -1,10 +1,20 @@
 """
 Data Stack Radar BR — Sinal GitHub (repositórios novos por ferramenta)
 ========================================================================
-Fonte real: GitHub Search API (REST), sem PyGithub externo — usa apenas
+Fonte real: GitHub Search API, sem PyGithub externo — usa apenas
 `requests` para manter a dependência mínima e o mesmo padrão de
-autenticação via `GITHUB_TOKEN` do Actions (30 req/min é suficiente para
-14 ferramentas × 1 request cada).
+autenticação via `GITHUB_TOKEN` do Actions.
+
+Com token, as contagens vêm da API GraphQL: cada request leva até
+BATCH_SIZE buscas `search(type: REPOSITORY)` com alias (t0, t1, …), cada
+uma lendo só `repositoryCount`, e a lista inteira de topics resolve em
+poucas chamadas. O agendador lê `rateLimit { cost remaining resetAt }` da
+própria resposta: se o saldo não cobre o custo do próximo lote, espera
+até `resetAt`. 429 — e 403 com `Retry-After` ou `X-RateLimit-Remaining: 0`
+(limite secundário/primário) — espera e tenta de novo; qualquer outro 403
+(token inválido, sem permissão) falha na hora, sem retry. Sem
+token a API GraphQL não responde — cai no REST (um request por topic,
+com pausa para o limite de busca).
 
 Para cada ferramenta monitorada, contamos quantos repositórios com aquele
 `topic` foram criados desde 1º de janeiro do ano vigente — um proxy de
@@ -32,8 +42,11 @@ import requests
 from catalog import TOOL_TOPICS
 
 API_URL = "https://api.github.com/search/repositories"
+GRAPHQL_URL = "https://api.github.com/graphql"
 BRONZE_DIR = Path("data/bronze/radar_github")
 TIMEOUT = 30
+BATCH_SIZE = 20     # buscas com alias por request GraphQL
+MAX_RETRIES = 3
 
 
 def _token() -> str | None:
@@ -56,12 +69,100 @@ def _created_since() -> str:
     return date(date.today().year, 1, 1).isoformat()
 
 
-def collect_all() -> list[dict]:
-    since = _created_since()
+def _row(topic: str, since: str, total: int | None, error: object = None) -> dict:
+    canonical_name = TOOL_TOPICS[topic]
+    if total is None:
+        print(f"  ✗ {canonical_name}: falha na busca" + (f" ({error})" if error else ""))
+    else:
+        print(f"  ✓ {canonical_name:<16} topic:{topic:<16} → {total:,} repos novos desde {since}")
+    return {"topic": topic, "tool": canonical_name, "new_repos_ytd": total, "since": since}
+
+
+# ─── GraphQL: buscas com alias em lote + agendador de rate limit ───────────
+
+def _batch_query(n: int) -> str:
+    variables = ", ".join(f"$q{i}: String!" for i in range(n))
+    searches = "\n".join(f"  t{i}: search(query: $q{i}, type: REPOSITORY) {{ repositoryCount }}"
+                          for i in range(n))
+    return f"query({variables}) {{\n  rateLimit {{ cost remaining resetAt }}\n{searches}\n}}"
+
+
+def _wait_for_budget(rate: dict | None, cost: int) -> None:
+    """Dorme até `resetAt` se o saldo restante não cobre o custo do próximo lote."""
+    if not rate or rate["remaining"] >= cost:
+        return
+    reset = datetime.fromisoformat(rate["resetAt"].replace("Z", "+00:00"))
+    wait = max(0.0, (reset - datetime.now(timezone.utc)).total_seconds()) + 1
+    print(f"  ⚠ rate limit GraphQL: {rate['remaining']} pontos restantes — aguardando {wait:.0f}s")
+    time.sleep(wait)
+
+
+def _retry_wait(resp: requests.Response, attempt: int) -> float | None:
+    """Espera antes de repetir um 403/429 de rate limit; None = não repetir.
+    403 sem `Retry-After` e com saldo (ou sem cabeçalho de saldo) é erro de
+    autenticação/permissão — repetir só atrasaria a falha."""
+    retry_after = resp.headers.get("Retry-After")
+    exhausted = resp.headers.get("X-RateLimit-Remaining") == "0"
+    if resp.status_code == 403 and not (retry_after or exhausted):
+        return None
+    if retry_after:
+        return float(retry_after)
+    if exhausted and resp.headers.get("X-RateLimit-Reset"):
+        return max(0.0, float(resp.headers["X-RateLimit-Reset"]) - time.time()) + 1
+    return 2 ** (attempt + 1) * 15.0
+
+
+def _post_batch(session: requests.Session, queries: list[str]) -> dict:
+    payload = {"query": _batch_query(len(queries)),
+               "variables": {f"q{i}": q for i, q in enumerate(queries)}}
+    for attempt in range(MAX_RETRIES + 1):
+        resp = session.post(GRAPHQL_URL, json=payload, timeout=TIMEOUT)
+        wait = (_retry_wait(resp, attempt)
+                if resp.status_code in (403, 429) and attempt < MAX_RETRIES else None)
+        if wait is not None:
+            print(f"  ⚠ GitHub HTTP {resp.status_code} — nova tentativa em {wait:.0f}s")
+            time.sleep(wait)
+            continue
+        resp.raise_for_status()
+        return resp.json()
+    raise RuntimeError("GitHub GraphQL: tentativas esgotadas")
+
+
+def _collect_graphql(since: str) -> list[dict]:
+    topics = list(TOOL_TOPICS)
+    session = requests.Session()
+    session.headers.update(_headers())
     rows: list[dict] = []
-    headers = _headers()
+    rate, cost = None, 1
+    for start in range(0, len(topics), BATCH_SIZE):
+        batch = topics[start:start + BATCH_SIZE]
+        _wait_for_budget(rate, cost)
+        try:
+            body = _post_batch(session, [f"topic:{t} created:>{since}" for t in batch])
+        except (requests.RequestException, RuntimeError) as e:
+            rows += [_row(t, since, None, e) for t in batch]
+            continue
+        for err in body.get("errors") or []:
+            print(f"  ⚠ GraphQL: {err.get('message')}")
+        data = body.get("data") or {}
+        rate = data.get("rateLimit") or rate
+        if rate:
+            cost = max(cost, int(rate["cost"]))
+        for i, topic in enumerate(batch):
+            result = data.get(f"t{i}")
+            rows.append(_row(topic, since, result["repositoryCount"] if result else None))
+    calls = -(-len(topics) // BATCH_SIZE)
+    if rate:
+        print(f"  → {calls} chamada(s) GraphQL; rate limit restante: {rate['remaining']}")
+    return rows
+
+
+# ─── REST (sem token): um request por topic ─────────────────────────────────
 
-    for topic, canonical_name in TOOL_TOPICS.items():
+def _collect_rest(since: str) -> list[dict]:
+    rows: list[dict] = []
+    headers = _headers()
+    for topic in TOOL_TOPICS:
         query = f"topic:{topic} created:>{since}"
         try:
             resp = requests.get(
@@ -71,28 +172,16 @@ def collect_all() -> list[dict]:
                 timeout=TIMEOUT,
             )
             resp.raise_for_status()
-            data = resp.json()
-            total = data.get("total_count", 0)
-            rows.append({
-                "topic": topic,
-                "tool": canonical_name,
-                "new_repos_ytd": total,
-                "since": since,
-            })
-            print(f"  ✓ {canonical_name:<16} topic:{topic:<16} → {total:,} repos novos desde {since}")
+            rows.append(_row(topic, since, resp.json().get("total_count", 0)))
         except requests.RequestException as e:
-            print(f"  ✗ {canonical_name}: falha na busca ({e})")
-            rows.append({
-                "topic": topic,
-                "tool": canonical_name,
-                "new_repos_ytd": None,
-                "since": since,
-            })
+            rows.append(_row(topic, since, None, e))
+        time.sleep(2.1)  # limite da Search API REST → ~1 req cada 2s
+    return rows
 
-        remaining = resp.headers.get("X-RateLimit-Remaining") if 'resp' in dir() else None
-        time.sleep(2.1)  # 30 req/min do token do Actions → ~1 req cada 2s é seguro
 
-    return rows
+def collect_all() -> list[dict]:
+    since = _created_since()
+    return _collect_graphql(since) if _token() else _collect_rest(since)
 
 
 def _save_bronze(rows: list[dict]) -> Path:
@@ -115,7 +204,8 @@ def main() -> int:
     print()
 
     if not _token():
-        print("  ⚠ GITHUB_TOKEN não definido — requests sem autenticação (limite de 10/min).")
+        print("  ⚠ GITHUB_TOKEN não definido — REST sem autenticação (limite de 10/min), "
+              "GraphQL exige token.")
 
     rows = collect_all()
     if not rows:
@@ -21,29 +21,60 @@ Compliance:
       `_check_robots()`. O host da API (`employability-portal.gupy.io`)
       é um backend interno sem robots.txt próprio (404), então a política
       do portal principal é a que vale.
-    - Rate limit: 1 req/s + jitter (0.3–0.9s) entre chamadas.
+    - Rate limit: orçamento GLOBAL de `REQUESTS_PER_SEC` no host da API,
+      somando todos os termos em voo (token bucket de `ats_http`), com
+      ritmo adaptativo — resposta lenta ou 429/503 desacelera, e
+      `Retry-After` pausa todos os termos.
     - Sem login, sem cookies de sessão, sem headers de autenticação.
 
+Coleta paralela por termo: até `TERM_WORKERS` termos paginam ao mesmo
+tempo (`RADAR_GUPY_WORKERS=1` volta ao serial). O dedup por job id é
+compartilhado EM VOO — a mesma vaga bate em vários termos sobrepostos
+("data engineer" × "engenheiro de dados"). Cada termo lista TODAS as
+páginas (até `MAX_PAGES_PER_TERM`): vaga aberta que some da listagem some
+do snapshot da semana. `_matched_term` fica com o
+primeiro termo de `SEARCH_TERMS` (ordem do catálogo) que trouxe a vaga,
+e o log sai na ordem dos termos.
+
+Coleta incremental (ledger de ids vistos, `LEDGER_PATH`):
+    - cada job id tem primeira/última semana em que apareceu e o snapshot
+      bronze que guarda o registro COMPLETO dele
+    - o ledger só evita regravar a descrição de vaga já conhecida — a
+      listagem continua completa
+    - vaga já conhecida que continua aberta entra no bronze da semana só
+      com id + `_matched_term` + `publishedDate` + `_snapshot` (nome do
+      arquivo com o registro completo) — sem repetir a descrição. O
+      `silver_jobs.py` resolve os campos a partir do `_snapshot`.
+    - id sem aparecer há `LEDGER_RETENTION_WEEKS` semanas (ou cujo snapshot
+      sumiu do disco) sai do ledger
+Sem ledger (primeira execução), ele é reconstruído dos bronzes em disco.
+A coleta roda todo dia, mas o snapshot é semanal: a segunda execução da
+semana FUNDE suas linhas no arquivo da semana em vez de sobrescrevê-lo —
+vaga que fechou no meio da semana continua no snapshot, e o ledger
+continua apontando registros que existem.
+
 Uso:
     python ingestion_radar/collect_jobs.py
 
 Saída:
     data/bronze/radar_jobs/gupy_{YYYY}_W{WW}.parquet   (bronze, snapshot semanal)
+    data/bronze/radar_jobs/gupy_ledger.json            (ledger de ids)
 """
 
 from __future__ import annotations
 
 import json
-import random
+import os
 import sys
-import time
-from datetime import datetime, timezone
+import threading
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from urllib.error import HTTPError, URLError
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
 from urllib.robotparser import RobotFileParser
 
+import requests
+
+from ats_http import get, make_client, run_boards
 from catalog import SEARCH_TERMS
 
 API_BASE = "https://employability-portal.gupy.io/api/v1/jobs"
@@ -52,8 +83,14 @@ USER_AGENT = "data-stack-radar-br/1.0 (+https://donotavio.github.io)"
 
 PAGE_LIMIT = 100          # itens por página aceitos pela API
 MAX_PAGES_PER_TERM = 5    # cap de segurança (até 500 vagas/termo)
-TIMEOUT = 30
+REQUESTS_PER_SEC = 1.0    # orçamento global no host da API (todos os termos)
+TERM_WORKERS = 4          # termos paginando em paralelo
 BRONZE_DIR = Path("data/bronze/radar_jobs")
+LEDGER_PATH = BRONZE_DIR / "gupy_ledger.json"
+LEDGER_RETENTION_WEEKS = 12  # id fora da listagem há mais tempo sai do ledger
+
+# Campos gravados para vaga já conhecida (o resto vem do `_snapshot`).
+SLIM_FIELDS = ("id", "_matched_term", "publishedDate")
 
 
 def _check_robots() -> bool:
@@ -71,69 +108,169 @@ def _check_robots() -> bool:
     return allowed
 
 
-def _fetch_page(term: str, offset: int) -> dict:
+def _fetch_page(client: dict, term: str, offset: int) -> dict:
     params = {"term": term, "limit": PAGE_LIMIT, "offset": offset}
-    url = f"{API_BASE}?{urlencode(params)}"
-    req = Request(url, headers={"User-Agent": USER_AGENT, "Accept": "application/json"})
-    with urlopen(req, timeout=TIMEOUT) as resp:
-        return json.load(resp)
+    headers = {"User-Agent": USER_AGENT, "Accept": "application/json"}
+    return get(client, API_BASE, params=params, headers=headers).json()
+
+
+def _term_workers() -> int:
+    return max(1, int(os.environ.get("RADAR_GUPY_WORKERS", TERM_WORKERS)))
+
+
+def _collect_term(client: dict, rank: int, term: str, seen: dict, lock: threading.Lock) -> list[str]:
+    """Pagina um termo registrando as vagas em `seen` (id → (rank, seq, job),
+    compartilhado entre termos). Lista até o fim (`total`) ou até
+    `MAX_PAGES_PER_TERM` — sem parada antecipada por id já visto, que
+    dependeria da ordem em que os termos paralelos rodam. Retorna o log."""
+    log = [f"→ Buscando: '{term}'"]
+    offset = 0
+    for _ in range(MAX_PAGES_PER_TERM):
+        try:
+            payload = _fetch_page(client, term, offset)
+        except (requests.RequestException, ValueError) as e:
+            log.append(f"  ✗ falha em offset={offset}: {e}")
+            break
+
+        jobs = payload.get("data", [])
+        total = payload.get("pagination", {}).get("total", 0)
+        if not jobs:
+            break
+
+        new = 0
+        with lock:
+            for seq, job in enumerate(jobs, start=offset):
+                jid = job.get("id")
+                if jid is None:
+                    continue
+                prev = seen.get(jid)
+                if prev is None:
+                    new += 1
+                if prev is None or rank < prev[0]:
+                    # termo mais cedo no catálogo fica com a vaga (como no serial)
+                    seen[jid] = (rank, seq, {**job, "_matched_term": term})
 
+        log.append(f"  ✓ offset={offset}: +{new}/{len(jobs)} vagas novas (total disponível: {total})")
 
-def _sleep_polite() -> None:
-    time.sleep(1.0 + random.uniform(0.3, 0.9))
+        offset += PAGE_LIMIT
+        if offset >= total:
+            break
+    return log
 
 
 def collect_all() -> list[dict]:
-    all_jobs: dict[int, dict] = {}  # dedup por job id (mesma vaga pode bater em vários termos)
-
-    for term in SEARCH_TERMS:
-        print(f"→ Buscando: '{term}'")
-        offset = 0
-        for page in range(MAX_PAGES_PER_TERM):
-            try:
-                payload = _fetch_page(term, offset)
-            except (URLError, HTTPError, TimeoutError) as e:
-                print(f"  ✗ falha em offset={offset}: {e}")
-                break
-
-            jobs = payload.get("data", [])
-            total = payload.get("pagination", {}).get("total", 0)
-            if not jobs:
-                break
-
-            for job in jobs:
-                jid = job.get("id")
-                if jid is not None:
-                    job["_matched_term"] = term
-                    all_jobs.setdefault(jid, job)
+    seen: dict[int, tuple[int, int, dict]] = {}  # dedup por job id, compartilhado entre termos
+    lock = threading.Lock()
+    workers = _term_workers()
+    client = make_client(rate=REQUESTS_PER_SEC, burst=1, concurrency=workers)
+
+    def collect_term(c: dict, rank: int, term: str) -> list[str]:
+        return _collect_term(c, rank, term, seen, lock)
+
+    for log in run_boards(client, collect_term, enumerate(SEARCH_TERMS)):
+        print("\n".join(log))
 
-            print(f"  ✓ offset={offset}: +{len(jobs)} vagas (total disponível: {total})")
+    # ordem estável: termo (catálogo), depois posição na paginação do termo
+    return [job for _, _, job in sorted(seen.values(), key=lambda v: v[:2])]
 
-            offset += PAGE_LIMIT
-            if offset >= total:
-                break
-            _sleep_polite()
 
-        _sleep_polite()
+# ─── Ledger de ids vistos ───────────────────────────────────────────────────
 
-    return list(all_jobs.values())
+def _week_label(path: Path) -> str:
+    # gupy_2026_W27.parquet → "2026-W27" (mesmo rótulo do silver)
+    _, year, week = path.stem.split("_")
+    return f"{year}-{week}"
 
 
-def _save_bronze(jobs: list[dict]) -> Path:
+def _rebuild_ledger() -> dict:
+    """Reconstrói o ledger dos bronzes em disco (primeira execução)."""
+    import pandas as pd
+
+    ledger = {"jobs": {}}
+    for f in sorted(BRONZE_DIR.glob("gupy_*.parquet")):
+        df = pd.read_parquet(f)
+        week = _week_label(f)
+        full = df["_snapshot"].isna() if "_snapshot" in df.columns else pd.Series(True, index=df.index)
+        for jid, is_full in zip(df["id"].astype(str), full):
+            entry = ledger["jobs"].setdefault(jid, {"first_seen": week, "snapshot": None})
+            entry["last_seen"] = week
+            if is_full:
+                entry["snapshot"] = f.name
+    ledger["jobs"] = {jid: e for jid, e in ledger["jobs"].items() if e["snapshot"]}
+    return ledger
+
+
+def _load_ledger() -> dict:
+    if LEDGER_PATH.exists():
+        return json.loads(LEDGER_PATH.read_text(encoding="utf-8"))
+    return _rebuild_ledger()
+
+
+def _week_start(label: str) -> date:
+    year, week = label.split("-W")
+    return date.fromisocalendar(int(year), int(week), 1)
+
+
+def _prune_ledger(ledger: dict, week: str) -> int:
+    """Tira do ledger ids sem aparecer há `LEDGER_RETENTION_WEEKS` semanas ou
+    cujo snapshot completo não está mais em disco. Retorna quantos saíram."""
+    cutoff = _week_start(week) - timedelta(weeks=LEDGER_RETENTION_WEEKS)
+    kept = {jid: e for jid, e in ledger["jobs"].items()
+            if _week_start(e["last_seen"]) >= cutoff and (BRONZE_DIR / e["snapshot"]).exists()}
+    dropped = len(ledger["jobs"]) - len(kept)
+    ledger["jobs"] = kept
+    ledger.pop("high_water", None)  # ledgers antigos
+    return dropped
+
+
+def _save_ledger(ledger: dict) -> None:
+    LEDGER_PATH.parent.mkdir(parents=True, exist_ok=True)
+    LEDGER_PATH.write_text(json.dumps(ledger, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+
+
+def _save_bronze(jobs: list[dict], ledger: dict) -> tuple[Path, int]:
+    """Grava o snapshot da semana: completo para id novo, enxuto (sem
+    descrição) para id cujo registro completo já está em outro snapshot.
+    Se o snapshot da semana já existe (coleta anterior nesta semana), as
+    linhas dele cujo id não voltou nesta execução são mantidas. Atualiza o
+    ledger em memória. Retorna (arquivo, nº de linhas enxutas)."""
     import pandas as pd
     import pyarrow as pa
     import pyarrow.parquet as pq
 
     now = datetime.now(timezone.utc)
     iso_year, iso_week, _ = now.isocalendar()
-
-    df = pd.DataFrame(jobs)
+    out_path = BRONZE_DIR / f"gupy_{iso_year}_W{iso_week:02d}.parquet"
+    week = _week_label(out_path)
+
+    rows = []
+    for job in jobs:
+        jid = str(job["id"])
+        entry = ledger["jobs"].get(jid)
+        # snapshot desta mesma semana vai ser sobrescrito → regrava completo
+        known = (entry is not None and entry["snapshot"] != out_path.name
+                 and (BRONZE_DIR / entry["snapshot"]).exists())
+        if known:
+            rows.append({**{k: job.get(k) for k in SLIM_FIELDS}, "_snapshot": entry["snapshot"]})
+            entry["last_seen"] = week
+        else:
+            rows.append({**job, "_snapshot": None})
+            ledger["jobs"][jid] = {"first_seen": (entry or {}).get("first_seen", week),
+                                   "last_seen": week, "snapshot": out_path.name}
+
+    df = pd.DataFrame(rows)
     df["_ingest_ts"] = now.isoformat()
+    if out_path.exists():
+        # vaga que fechou desde a última coleta da semana continua no snapshot —
+        # e o ledger continua apontando um registro que existe
+        previous = pd.read_parquet(out_path)
+        previous = previous[~previous["id"].astype(str).isin({str(job["id"]) for job in jobs})]
+        df = pd.concat([previous, df], ignore_index=True)
+    df["_snapshot"] = df["_snapshot"].astype("string")
 
     BRONZE_DIR.mkdir(parents=True, exist_ok=True)
-    out_path = BRONZE_DIR / f"gupy_{iso_year}_W{iso_week:02d}.parquet"
     pq.write_table(pa.Table.from_pandas(df, preserve_index=False), out_path, compression="snappy")
-    return out_path
+    return out_path, int(df["_snapshot"].notna().sum())
 
 
 def main() -> int:
@@ -144,6 +281,9 @@ def main() -> int:
         print("✗ robots.txt bloqueia a coleta — abortando.")
         return 1
 
+    ledger = _load_ledger()
+    print(f"  ✓ ledger: {len(ledger['jobs']):,} ids conhecidos")
+
     jobs = collect_all()
     if not jobs:
         print("✗ Nenhuma vaga coletada — abortando gravação.")
@@ -152,8 +292,12 @@ def main() -> int:
     print()
     print(f"→ Total de vagas únicas coletadas: {len(jobs)}")
 
-    out_path = _save_bronze(jobs)
-    print(f"  ✓ {out_path} ({len(jobs):,} linhas)")
+    out_path, n_slim = _save_bronze(jobs, ledger)
+    n_pruned = _prune_ledger(ledger, _week_label(out_path))
+    _save_ledger(ledger)
+    print(f"  ✓ {out_path} ({len(jobs):,} vagas nesta execução, {n_slim:,} linhas "
+          f"só por id no snapshot da semana)")
+    print(f"  ✓ {LEDGER_PATH} ({len(ledger['jobs']):,} ids, {n_pruned:,} expirados)")
 
     return 0
 
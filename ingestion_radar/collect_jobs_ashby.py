@@ -16,19 +16,38 @@ client-side: título casa `DATA_TITLE_PATTERN` + localização BR.
 Uso:
     python ingestion_radar/collect_jobs_ashby.py
 
+Board inalterado desde a última coleta (304 via ETag/Last-Modified, ou
+mesmo hash de job ids + digest dos campos usados de cada vaga) vira uma
+linha marcadora `_unchanged_from` resolvida no silver (ver `ats_http`).
+Sem 304 o corpo inteiro ainda é baixado (a API não tem listagem leve) —
+o que se poupa é refiltrar e regravar o board.
+
 Saída:
     data/bronze/radar_jobs_ashby/ashby_{YYYY}_W{WW}.parquet
+    data/bronze/radar_jobs_ashby/board_state.json   (fingerprints)
 """
 
 from __future__ import annotations
 
 import sys
-import time
 from datetime import datetime, timezone
 from pathlib import Path
 
 import requests
 
+from ats_http import (
+    board_validators,
+    conditional_headers,
+    get,
+    jobs_fingerprint,
+    load_board_state,
+    make_client,
+    reusable_snapshot,
+    run_boards,
+    save_board_state,
+    unchanged_marker,
+    weekly_snapshot,
+)
 from catalog import (
     ATS_COMPANIES,
     is_br_location,
@@ -39,8 +58,11 @@ from catalog import (
 API_BASE = "https://api.ashbyhq.com/posting-api/job-board/{org}"
 BRONZE_DIR = Path("data/bronze/radar_jobs_ashby")
 COMPANIES: dict[str, str] = ATS_COMPANIES["ashby"]
-TIMEOUT = 30
-TIMEOUT_SLEEP = 1.0
+REQUESTS_PER_SEC = 1.0   # teto no host api.ashbyhq.com (ver ats_http)
+# Campos lidos de cada vaga — a API não expõe data de edição, então o
+# fingerprint do board usa um digest deles como versão da vaga.
+VERSION_FIELDS = ("title", "location", "isRemote", "employmentType", "descriptionPlain",
+                  "jobUrl", "publishedAt", "compensation")
 
 
 def _parse_compensation(comp: dict | None) -> tuple[float | None, float | None, str | None]:
@@ -69,70 +91,86 @@ def _parse_compensation(comp: dict | None) -> tuple[float | None, float | None,
     return None, None, None
 
 
-def collect_all() -> list[dict]:
+def _collect_board(client: dict, slug: str, canonical_name: str,
+                   state: dict, out_path: Path) -> tuple[list[dict], str]:
+    """Baixa e filtra o board de uma empresa. Retorna (linhas, linha de log).
+
+    Board inalterado desde o snapshot anterior (304 com ETag/Last-Modified,
+    ou mesmo hash de ids + `VERSION_FIELDS`) vira uma linha marcadora, sem
+    refiltrar o corpo."""
+    entry = state.get(slug)
+    previous = reusable_snapshot(entry, BRONZE_DIR, out_path)
+    unchanged = ([unchanged_marker(slug, canonical_name, previous)],
+                 f"  = {canonical_name:<20} ({slug:<16}) → inalterado desde {previous}")
+    headers = conditional_headers(entry) if previous else {}
+    try:
+        resp = get(client, API_BASE.format(org=slug), params={"includeCompensation": "true"},
+                   headers=headers)
+        if resp.status_code == 304:
+            return unchanged
+        jobs = resp.json().get("jobs", [])
+    except (requests.RequestException, ValueError) as e:
+        return [], f"  ✗ {canonical_name} ({slug}): falha na busca ({e})"
+
+    fingerprint = jobs_fingerprint(jobs, version_fields=VERSION_FIELDS)
+    if previous and fingerprint == entry.get("fingerprint"):
+        state[slug] = {**entry, **board_validators(resp)}   # validadores novos p/ o próximo 304
+        return unchanged
+    state[slug] = {**board_validators(resp), "snapshot": out_path.name, "fingerprint": fingerprint}
     rows: list[dict] = []
-
-    for slug, canonical_name in COMPANIES.items():
-        url = API_BASE.format(org=slug)
-        try:
-            resp = requests.get(
-                url,
-                params={"includeCompensation": "true"},
-                headers={"User-Agent": "data-stack-radar-br/1.0"},
-                timeout=TIMEOUT,
-            )
-            resp.raise_for_status()
-            jobs = resp.json().get("jobs", [])
-        except (requests.RequestException, ValueError) as e:
-            print(f"  ✗ {canonical_name} ({slug}): falha na busca ({e})")
+    for job in jobs:
+        title = job.get("title", "")
+        if not is_data_title(title):
             continue
+        location = job.get("location", "") or ""
+        is_remote = bool(job.get("isRemote"))
+        if not (is_br_location(location) or (is_remote and is_br_location("remoto"))):
+            continue
+        smin, smax, scur = _parse_compensation(job.get("compensation"))
+        rows.append({
+            "id": str(job.get("id", "")),
+            "company": canonical_name,
+            "company_slug": slug,
+            "title": title,
+            "description": job.get("descriptionPlain", "") or "",
+            "location": location,
+            "absolute_url": job.get("jobUrl", "") or "",
+            "updated_at": str(job.get("publishedAt", "") or ""),
+            "is_remote": is_remote,
+            "contract_type_raw": normalize_contract(job.get("employmentType")),
+            "salary_min": smin,
+            "salary_max": smax,
+            "salary_currency": scur,
+        })
+
+    return rows, f"  ✓ {canonical_name:<20} ({slug:<16}) → {len(rows)}/{len(jobs)} vagas de dados BR"
+
+
+def collect_all(state: dict, out_path: Path) -> list[dict]:
+    rows: list[dict] = []
+    client = make_client(rate=REQUESTS_PER_SEC)
 
-        kept = 0
-        for job in jobs:
-            title = job.get("title", "")
-            if not is_data_title(title):
-                continue
-            location = job.get("location", "") or ""
-            is_remote = bool(job.get("isRemote"))
-            if not (is_br_location(location) or (is_remote and is_br_location("remoto"))):
-                continue
-            smin, smax, scur = _parse_compensation(job.get("compensation"))
-            rows.append({
-                "id": str(job.get("id", "")),
-                "company": canonical_name,
-                "company_slug": slug,
-                "title": title,
-                "description": job.get("descriptionPlain", "") or "",
-                "location": location,
-                "absolute_url": job.get("jobUrl", "") or "",
-                "updated_at": str(job.get("publishedAt", "") or ""),
-                "is_remote": is_remote,
-                "contract_type_raw": normalize_contract(job.get("employmentType")),
-                "salary_min": smin,
-                "salary_max": smax,
-                "salary_currency": scur,
-            })
-            kept += 1
-
-        print(f"  ✓ {canonical_name:<20} ({slug:<16}) → {kept}/{len(jobs)} vagas de dados BR")
-        time.sleep(TIMEOUT_SLEEP)
+    def collect_board(c: dict, slug: str, name: str) -> tuple[list[dict], str]:
+        return _collect_board(c, slug, name, state, out_path)
 
+    for board_rows, log in run_boards(client, collect_board, COMPANIES.items()):
+        print(log)
+        rows.extend(board_rows)
     return rows
 
 
-def _save_bronze(rows: list[dict]) -> Path:
+def _save_bronze(rows: list[dict], out_path: Path) -> Path:
     import pandas as pd
     import pyarrow as pa
     import pyarrow.parquet as pq
 
-    now = datetime.now(timezone.utc)
-    iso_year, iso_week, _ = now.isocalendar()
-
     df = pd.DataFrame(rows)
-    df["_ingest_ts"] = now.isoformat()
+    if "_unchanged_from" not in df.columns:
+        df["_unchanged_from"] = None
+    df["_unchanged_from"] = df["_unchanged_from"].astype("string")
+    df["_ingest_ts"] = datetime.now(timezone.utc).isoformat()
 
     BRONZE_DIR.mkdir(parents=True, exist_ok=True)
-    out_path = BRONZE_DIR / f"ashby_{iso_year}_W{iso_week:02d}.parquet"
     pq.write_table(pa.Table.from_pandas(df, preserve_index=False), out_path, compression="snappy")
     return out_path
 
@@ -145,15 +183,20 @@ def main() -> int:
         print("  ⚠ Nenhuma empresa Ashby no catálogo — nada a coletar.")
         return 0
 
-    rows = collect_all()
+    state = load_board_state(BRONZE_DIR)
+    out_path = weekly_snapshot(BRONZE_DIR, "ashby")
+    rows = collect_all(state, out_path)
     if not rows:
         print("✗ Nenhuma vaga BR coletada — abortando gravação.")
         return 1
 
+    n_unchanged = sum(1 for r in rows if r.get("_unchanged_from"))
     print()
-    print(f"→ Total de vagas de dados BR coletadas (Ashby, {len(COMPANIES)} empresas): {len(rows)}")
+    print(f"→ Total de vagas de dados BR coletadas (Ashby, {len(COMPANIES)} empresas): "
+          f"{len(rows) - n_unchanged} (+ {n_unchanged} boards inalterados)")
 
-    out_path = _save_bronze(rows)
+    _save_bronze(rows, out_path)
+    save_board_state(BRONZE_DIR, state)
     print(f"  ✓ {out_path} ({len(rows):,} linhas)")
     return 0
 
@@ -35,20 +35,37 @@ métrica vinda de mais uma fonte, conforme decisão de produto documentada).
 Uso:
     python ingestion_radar/collect_jobs_greenhouse.py
 
+Board inalterado desde a última coleta (ETag/Last-Modified, ou hash dos
+ids na listagem leve) não é baixado de novo — vira uma linha marcadora
+`_unchanged_from` resolvida no silver (ver `ats_http`).
+
 Saída:
     data/bronze/radar_jobs_greenhouse/greenhouse_{YYYY}_W{WW}.parquet
+    data/bronze/radar_jobs_greenhouse/board_state.json   (fingerprints)
 """
 
 from __future__ import annotations
 
 import re
 import sys
-import time
 from datetime import datetime, timezone
 from pathlib import Path
 
 import requests
 
+from ats_http import (
+    board_validators,
+    conditional_headers,
+    get,
+    jobs_fingerprint,
+    load_board_state,
+    make_client,
+    reusable_snapshot,
+    run_boards,
+    save_board_state,
+    unchanged_marker,
+    weekly_snapshot,
+)
 from catalog import (
     ATS_COMPANIES,
     BR_LOCATION_KEYWORDS,
@@ -58,13 +75,13 @@ from catalog import (
 
 API_BASE = "https://boards-api.greenhouse.io/v1/boards/{company}/jobs"
 BRONZE_DIR = Path("data/bronze/radar_jobs_greenhouse")
-TIMEOUT = 30
 
 # Curadoria de empresas vem do catálogo (fonte única). name: nome canônico
 # exibido; slug: identificador na URL da Greenhouse.
 COMPANIES: dict[str, str] = ATS_COMPANIES["greenhouse"]
 
-TIMEOUT_SLEEP = 1.0
+# Teto de requests/s no host da Greenhouse (todas as empresas dividem o host).
+REQUESTS_PER_SEC = 1.0
 
 
 def _is_data_role(title: str) -> bool:
@@ -94,63 +111,82 @@ def _strip_html(html: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
 
 
-def collect_all() -> list[dict]:
+def _collect_board(client: dict, slug: str, canonical_name: str,
+                   state: dict, out_path: Path) -> tuple[list[dict], str]:
+    """Baixa e filtra o board de uma empresa. Retorna (linhas, linha de log).
+
+    Board inalterado desde o snapshot anterior (304 com ETag/Last-Modified,
+    ou — sem validadores — mesmo hash de (id, updated_at) na listagem leve,
+    sem `content`) vira uma linha marcadora e não é baixado de novo."""
+    url = API_BASE.format(company=slug)
+    entry = state.get(slug)
+    previous = reusable_snapshot(entry, BRONZE_DIR, out_path)
+    unchanged_log = f"  = {canonical_name:<20} ({slug:<18}) → inalterado desde {previous}"
+    try:
+        headers = conditional_headers(entry) if previous else {}
+        if previous and not headers:
+            listing = get(client, url).json().get("jobs", [])
+            if jobs_fingerprint(listing, version_key="updated_at") == entry.get("fingerprint"):
+                return [unchanged_marker(slug, canonical_name, previous)], unchanged_log
+        resp = get(client, url, params={"content": "true"}, headers=headers)
+        if resp.status_code == 304:
+            return [unchanged_marker(slug, canonical_name, previous)], unchanged_log
+        jobs = resp.json().get("jobs", [])
+    except (requests.RequestException, ValueError) as e:
+        return [], f"  ✗ {canonical_name} ({slug}): falha na busca ({e})"
+
+    state[slug] = {**board_validators(resp), "snapshot": out_path.name,
+                   "fingerprint": jobs_fingerprint(jobs, version_key="updated_at")}
     rows: list[dict] = []
-
-    for slug, canonical_name in COMPANIES.items():
-        url = API_BASE.format(company=slug)
-        try:
-            resp = requests.get(
-                url,
-                params={"content": "true"},
-                headers={"User-Agent": "data-stack-radar-br/1.0"},
-                timeout=TIMEOUT,
-            )
-            resp.raise_for_status()
-            jobs = resp.json().get("jobs", [])
-        except requests.RequestException as e:
-            print(f"  ✗ {canonical_name} ({slug}): falha na busca ({e})")
+    for job in jobs:
+        title = job.get("title", "")
+        if not _is_data_role(title):
             continue
+        location_name = (job.get("location") or {}).get("name", "")
+        if not _is_br_location(location_name):
+            continue
+        rows.append({
+            "id": job.get("id"),
+            "company": canonical_name,
+            "company_slug": slug,
+            "title": job.get("title", ""),
+            "description": _strip_html(job.get("content", "")),
+            "location": location_name,
+            "absolute_url": job.get("absolute_url", ""),
+            "updated_at": job.get("updated_at", ""),
+        })
+
+    return rows, f"  ✓ {canonical_name:<20} ({slug:<18}) → {len(rows)}/{len(jobs)} vagas de dados BR"
+
+
+def collect_all(state: dict, out_path: Path) -> list[dict]:
+    """Boards em paralelo via `ats_http` (token bucket por host); log e
+    linhas saem na ordem do catálogo. Atualiza `state` (fingerprints)."""
+    rows: list[dict] = []
+    client = make_client(rate=REQUESTS_PER_SEC)
 
-        kept = 0
-        for job in jobs:
-            title = job.get("title", "")
-            if not _is_data_role(title):
-                continue
-            location_name = (job.get("location") or {}).get("name", "")
-            if not _is_br_location(location_name):
-                continue
-            rows.append({
-                "id": job.get("id"),
-                "company": canonical_name,
-                "company_slug": slug,
-                "title": job.get("title", ""),
-                "description": _strip_html(job.get("content", "")),
-                "location": location_name,
-                "absolute_url": job.get("absolute_url", ""),
-                "updated_at": job.get("updated_at", ""),
-            })
-            kept += 1
-
-        print(f"  ✓ {canonical_name:<20} ({slug:<18}) → {kept}/{len(jobs)} vagas de dados BR")
-        time.sleep(TIMEOUT_SLEEP)
+    def collect_board(c: dict, slug: str, name: str) -> tuple[list[dict], str]:
+        return _collect_board(c, slug, name, state, out_path)
 
+    for board_rows, log in run_boards(client, collect_board, COMPANIES.items()):
+        print(log)
+        rows.extend(board_rows)
     return rows
 
 
-def _save_bronze(rows: list[dict]) -> Path:
+def _save_bronze(rows: list[dict], out_path: Path) -> Path:
     import pandas as pd
     import pyarrow as pa
     import pyarrow.parquet as pq
 
-    now = datetime.now(timezone.utc)
-    iso_year, iso_week, _ = now.isocalendar()
-
     df = pd.DataFrame(rows)
-    df["_ingest_ts"] = now.isoformat()
+    if "_unchanged_from" not in df.columns:
+        df["_unchanged_from"] = None
+    df["_unchanged_from"] = df["_unchanged_from"].astype("string")
+    df["id"] = df["id"].astype("Int64")   # marcador tem id nulo — sem virar float
+    df["_ingest_ts"] = datetime.now(timezone.utc).isoformat()
 
     BRONZE_DIR.mkdir(parents=True, exist_ok=True)
-    out_path = BRONZE_DIR / f"greenhouse_{iso_year}_W{iso_week:02d}.parquet"
     pq.write_table(pa.Table.from_pandas(df, preserve_index=False), out_path, compression="snappy")
     return out_path
 
@@ -159,15 +195,20 @@ def main() -> int:
     print("📋 Data Stack Radar BR — coleta de vagas (Greenhouse, sub-fonte BR)")
     print()
 
-    rows = collect_all()
+    state = load_board_state(BRONZE_DIR)
+    out_path = weekly_snapshot(BRONZE_DIR, "greenhouse")
+    rows = collect_all(state, out_path)
     if not rows:
         print("✗ Nenhuma vaga BR coletada — abortando gravação.")
         return 1
 
+    n_unchanged = sum(1 for r in rows if r.get("_unchanged_from"))
     print()
-    print(f"→ Total de vagas de dados BR coletadas (Greenhouse, {len(COMPANIES)} empresas): {len(rows)}")
+    print(f"→ Total de vagas de dados BR coletadas (Greenhouse, {len(COMPANIES)} empresas): "
+          f"{len(rows) - n_unchanged} (+ {n_unchanged} boards inalterados)")
 
-    out_path = _save_bronze(rows)
+    _save_bronze(rows, out_path)
+    save_board_state(BRONZE_DIR, state)
     print(f"  ✓ {out_path} ({len(rows):,} linhas)")
     return 0
 
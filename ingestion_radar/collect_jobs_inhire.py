@@ -30,12 +30,12 @@ from __future__ import annotations
 
 import re
 import sys
-import time
 from datetime import datetime, timezone
 from pathlib import Path
 
 import requests
 
+from ats_http import get, make_client, run_boards
 from catalog import ATS_COMPANIES, is_br_location, is_data_title, normalize_contract
 
 PAGES_URL = "https://api.inhire.app/job-posts/public/pages"
@@ -43,8 +43,7 @@ DETAIL_URL = "https://api.inhire.app/job-posts/public/pages/{job_id}"
 CAREER_URL = "https://carreiras.inhire.app/{tenant}/vaga/{job_id}"
 BRONZE_DIR = Path("data/bronze/radar_jobs_inhire")
 TENANTS: dict[str, str] = ATS_COMPANIES["inhire"]
-TIMEOUT = 30
-TIMEOUT_SLEEP = 0.6
+REQUESTS_PER_SEC = 1.5   # teto no host api.inhire.app (≈ o antigo sleep de 0.6s)
 
 
 def _strip_html(html: str) -> str:
@@ -66,64 +65,63 @@ def _first(value) -> str | None:
     return str(value) if value else None
 
 
-def collect_all() -> list[dict]:
-    rows: list[dict] = []
+def _collect_tenant(client: dict, tenant: str, canonical_name: str) -> tuple[list[dict], str]:
+    """Lista lean + detalhe das candidatas de um tenant. Retorna (linhas, log)."""
+    headers = {"X-Tenant": tenant}
+    try:
+        lean = get(client, PAGES_URL, headers=headers).json().get("jobsPage", [])
+    except (requests.RequestException, ValueError) as e:
+        return [], f"  ✗ {canonical_name} ({tenant}): falha na página ({e})"
 
-    for tenant, canonical_name in TENANTS.items():
-        headers = {"User-Agent": "data-stack-radar-br/1.0", "X-Tenant": tenant}
+    candidates = [
+        j for j in lean
+        if j.get("status") == "published"
+        and is_data_title(j.get("displayName", ""))
+        and _inhire_is_br(j.get("location", ""))
+    ]
+
+    rows: list[dict] = []
+    log: list[str] = []
+    for lean_job in candidates:
+        job_id = lean_job.get("jobId")
+        if not job_id:
+            continue
         try:
-            resp = requests.get(PAGES_URL, headers=headers, timeout=TIMEOUT)
-            resp.raise_for_status()
-            lean = resp.json().get("jobsPage", [])
+            detail = get(client, DETAIL_URL.format(job_id=job_id), headers=headers).json()
         except (requests.RequestException, ValueError) as e:
-            print(f"  ✗ {canonical_name} ({tenant}): falha na página ({e})")
-            continue
+            log.append(f"    ⚠ vaga {job_id} sem detalhe ({e})")
+            detail = {}
+
+        title = detail.get("displayName") or lean_job.get("displayName", "")
+        workplace = (detail.get("workplaceType") or lean_job.get("workplaceType") or "")
+        rows.append({
+            "id": str(job_id),
+            "company": canonical_name,
+            "company_slug": tenant,
+            "title": title,
+            "description": _strip_html(detail.get("description", "")),
+            "location": detail.get("location") or lean_job.get("location", "") or "BR",
+            "absolute_url": CAREER_URL.format(tenant=tenant, job_id=job_id),
+            "updated_at": str(detail.get("publishedAt") or detail.get("createdAt") or ""),
+            "is_remote": "remot" in workplace.lower(),
+            "contract_type_raw": normalize_contract(_first(detail.get("contractType"))),
+            "salary_min": None,
+            "salary_max": None,
+            "salary_currency": None,
+        })
+
+    log.append(f"  ✓ {canonical_name:<18} ({tenant:<16}) → {len(rows)}/{len(lean)} vagas de dados BR")
+    return rows, "\n".join(log)
 
-        candidates = [
-            j for j in lean
-            if j.get("status") == "published"
-            and is_data_title(j.get("displayName", ""))
-            and _inhire_is_br(j.get("location", ""))
-        ]
-
-        kept = 0
-        for lean_job in candidates:
-            job_id = lean_job.get("jobId")
-            if not job_id:
-                continue
-            try:
-                d = requests.get(
-                    DETAIL_URL.format(job_id=job_id), headers=headers, timeout=TIMEOUT
-                )
-                d.raise_for_status()
-                detail = d.json()
-            except (requests.RequestException, ValueError) as e:
-                print(f"    ⚠ vaga {job_id} sem detalhe ({e})")
-                detail = {}
-            time.sleep(TIMEOUT_SLEEP)
-
-            title = detail.get("displayName") or lean_job.get("displayName", "")
-            workplace = (detail.get("workplaceType") or lean_job.get("workplaceType") or "")
-            rows.append({
-                "id": str(job_id),
-                "company": canonical_name,
-                "company_slug": tenant,
-                "title": title,
-                "description": _strip_html(detail.get("description", "")),
-                "location": detail.get("location") or lean_job.get("location", "") or "BR",
-                "absolute_url": CAREER_URL.format(tenant=tenant, job_id=job_id),
-                "updated_at": str(detail.get("publishedAt") or detail.get("createdAt") or ""),
-                "is_remote": "remot" in workplace.lower(),
-                "contract_type_raw": normalize_contract(_first(detail.get("contractType"))),
-                "salary_min": None,
-                "salary_max": None,
-                "salary_currency": None,
-            })
-            kept += 1
-
-        print(f"  ✓ {canonical_name:<18} ({tenant:<16}) → {kept}/{len(lean)} vagas de dados BR")
-        time.sleep(TIMEOUT_SLEEP)
 
+def collect_all() -> list[dict]:
+    """Tenants em paralelo; os requests de detalhe de todos eles dividem o
+    mesmo token bucket do host api.inhire.app."""
+    rows: list[dict] = []
+    client = make_client(rate=REQUESTS_PER_SEC)
+    for tenant_rows, log in run_boards(client, _collect_tenant, TENANTS.items()):
+        print(log)
+        rows.extend(tenant_rows)
     return rows
 
 
@@ -8,6 +8,26 @@ ferramentas/tecnologias de dados são mencionadas.
 Não usa NLP probabilístico nem LLM — apenas correspondência de padrões,
 conforme constraint do projeto ("Sem componente de IA").
 
+Motor de matching em duas fases:
+
+  1. Pré-filtro: de cada padrão da taxonomia sai um literal obrigatório
+     (ex.: `\\bspark\\b` → "spark", `dbt[\\s\\-]core` → "core"). O texto é
+     normalizado para minúsculas UMA vez e cada literal vira uma busca de
+     substring em C (`lit in texto`) — bem mais barato que um `.search`
+     case-insensitive sobre a descrição inteira.
+  2. Confirmação: só roda o regex completo dos padrões cujo literal
+     apareceu — e, quando a posição do literal no match é fixa, ancorado
+     (`.match`) em cada ocorrência dele em vez de `.search` no texto todo.
+     Padrão sem literal extraível roda sempre, do jeito ingênuo.
+
+A saída é idêntica à do loop ingênuo skill × padrão (mesmas skills, na
+ordem da taxonomia) — conferido em `tests/test_skills_extractor.py` sobre
+vagas gravadas do bronze.
+
+Para colunas inteiras (silver), `extract_skills_batch(titles, descriptions)`
+roda o pré-filtro como kernels Arrow vetorizados e devolve direto uma
+coluna `list<string>`.
+
 Uso (como módulo):
     from skills_extractor import extract_skills
     skills = extract_skills(job_title + " " + job_description)
@@ -15,12 +35,24 @@ Uso (como módulo):
 
 from __future__ import annotations
 
+import hashlib
+import json
 import re
 
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
 # Taxonomia e universo de tools vêm do catálogo (fonte única). Re-exportados
 # aqui por compatibilidade com quem já importava de `skills_extractor`.
 from catalog import RAW_TAXONOMY, TOOL_TOPICS  # noqa: F401
 
+# Versão da taxonomia (hash dos padrões e da ordem das skills) — chaveia o
+# cache de extração do silver: mudou o RAW_TAXONOMY, o cache é descartado.
+TAXONOMY_VERSION = hashlib.sha256(
+    json.dumps(list(RAW_TAXONOMY.items()), ensure_ascii=False).encode("utf-8")
+).hexdigest()[:16]
+
 # Compila tudo uma única vez no import — evita recompilar regex por vaga.
 _COMPILED: dict[str, list[re.Pattern]] = {
     skill: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
@@ -28,16 +60,153 @@ _COMPILED: dict[str, list[re.Pattern]] = {
 }
 
 
+# ─── Pré-filtro: literais obrigatórios ──────────────────────────────────────
+
+# Construções que tornam trechos do padrão opcionais/alternativos — nesses
+# casos não dá pra garantir um literal obrigatório e o padrão roda sempre.
+_UNSAFE_META = re.compile(r"[|?*{}()^$]")
+# Átomos do padrão: classe, escape, '.' ou caractere — com '+' opcional.
+_ATOM = re.compile(r"(\[[^\]]*\]|\\.|.)(\+?)")
+
+
+def _required_literal(pattern: str) -> tuple[str | None, int | None]:
+    """Maior trecho literal que TODO match de `pattern` contém + quantos
+    caracteres o precedem em qualquer match (None se variável).
+
+    Retorna (None, None) quando não há literal garantido.
+    """
+    body = pattern.replace(r"\b", "")   # \b tem largura zero
+    if _UNSAFE_META.search(body):
+        return None, None
+    best, best_offset = "", None
+    run, run_offset, width = "", 0, 0
+    for atom, plus in _ATOM.findall(body):
+        is_char = not atom.startswith("[") and atom != "." and not (
+            atom.startswith("\\") and atom[1].isalnum())
+        if is_char and not plus:
+            if not run:
+                run_offset = width
+            run += atom[-1]
+            width = width + 1 if width is not None else None
+            continue
+        if len(run) > len(best):
+            best, best_offset = run, run_offset
+        run = ""
+        width = None if plus or width is None else width + 1
+    if len(run) > len(best):
+        best, best_offset = run, run_offset
+    return (best.lower(), best_offset) if best else (None, None)
+
+
+def _ignorecase_extras() -> dict[str, str]:
+    """Caracteres não-ASCII que o `re.IGNORECASE` casa com uma letra ASCII
+    (ex.: 'ı' → i, 'ſ' → s, 'K' (Kelvin) → k). Trocados antes de baixar a
+    caixa — sem isso o pré-filtro teria falso negativo onde o regex
+    completo casaria."""
+    ascii_alnum = re.compile(r"[a-z0-9]", re.IGNORECASE)
+    extras = {}
+    for code in range(128, 0x10000):
+        char = chr(code)
+        if ascii_alnum.fullmatch(char):
+            extras[char] = next(c for c in "abcdefghijklmnopqrstuvwxyz0123456789"
+                                if re.fullmatch(c, char, re.IGNORECASE))
+    return extras
+
+
+_IGNORECASE_EXTRAS = _ignorecase_extras()
+
+# skill → [(literal obrigatório, deslocamento do literal, regex)], na ordem da taxonomia
+_MATCHERS: dict[str, list[tuple[str | None, int | None, re.Pattern]]] = {
+    skill: [(*_required_literal(p.pattern), p) for p in compiled]
+    for skill, compiled in _COMPILED.items()
+}
+
+
+def _fold(text: str) -> str:
+    for char, letter in _IGNORECASE_EXTRAS.items():
+        if char in text:
+            text = text.replace(char, letter)
+    return text.lower()
+
+
+def _confirm(pattern: re.Pattern, lit: str | None, offset: int | None,
+             text: str, folded: str) -> bool:
+    """Roda o regex completo — ancorado nas ocorrências do literal quando a
+    posição dele no match é fixa (evita o `.search` sobre o texto inteiro)."""
+    if lit is None or offset is None or len(folded) != len(text):
+        return pattern.search(text) is not None
+    k = folded.find(lit)
+    while k != -1:
+        if k >= offset and pattern.match(text, k - offset):
+            return True
+        k = folded.find(lit, k + 1)
+    return False
+
+
 def extract_skills(text: str) -> list[str]:
     """Retorna a lista de skills (chaves da taxonomia) encontradas em `text`."""
     if not text:
         return []
-    found = []
-    for skill, patterns in _COMPILED.items():
-        if any(p.search(text) for p in patterns):
-            found.append(skill)
-    return found
+    folded = _fold(text)
+    return [
+        skill for skill, matchers in _MATCHERS.items()
+        if any((lit is None or lit in folded) and _confirm(p, lit, off, text, folded)
+               for lit, off, p in matchers)
+    ]
 
 
 def extract_skills_row(title: str, description: str) -> list[str]:
     return extract_skills(f"{title or ''} {description or ''}")
+
+
+def job_texts(titles, descriptions) -> pa.StringArray:
+    """Texto de entrada da extração por vaga (título + " " + descrição, nulos
+    viram ""), como coluna Arrow — o mesmo que `extract_skills_row` monta."""
+    return pc.binary_join_element_wise(
+        pc.fill_null(pa.array(titles, type=pa.string(), from_pandas=True), ""),
+        pc.fill_null(pa.array(descriptions, type=pa.string(), from_pandas=True), ""),
+        " ",
+    )
+
+
+def extract_skills_batch(titles, descriptions) -> pa.ListArray:
+    """Versão colunar de `extract_skills_row` para uma coluna inteira de vagas.
+
+    Concatena título + descrição, normaliza a caixa e roda o pré-filtro de
+    literais como kernels Arrow (um `match_substring_regex` por padrão, sobre a
+    coluna toda). O regex completo só roda nas linhas candidatas de cada
+    padrão. Retorna uma coluna Arrow `list<string>` alinhada à entrada, com
+    o mesmo conteúdo (e ordem de skills) de `extract_skills_row` linha a linha.
+    """
+    texts = job_texts(titles, descriptions)
+    folded = texts
+    for char, letter in _IGNORECASE_EXTRAS.items():
+        folded = pc.replace_substring(folded, char, letter)
+    folded = pc.utf8_lower(folded)
+
+    n_rows = len(texts)
+    py_texts = texts.to_pylist()
+    py_folded: dict[int, str] = {}
+    hits = np.zeros((n_rows, len(_MATCHERS)), dtype=bool)
+    for j, matchers in enumerate(_MATCHERS.values()):
+        for lit, offset, pattern in matchers:
+            if lit is None:
+                rows = np.arange(n_rows)
+            else:
+                # literal escapado via RE2 (DFA) — mais rápido que match_substring
+                mask = pc.match_substring_regex(folded, re.escape(lit))
+                rows = np.flatnonzero(mask.to_numpy(zero_copy_only=False))
+            rows = rows[~hits[rows, j]]
+            for i in rows:
+                text = py_texts[i]
+                if i not in py_folded:
+                    py_folded[i] = _fold(text)
+                if _confirm(pattern, lit, offset, text, py_folded[i]):
+                    hits[i, j] = True
+
+    # np.nonzero percorre a matriz linha a linha → skills na ordem da taxonomia
+    _, skill_idx = np.nonzero(hits)
+    offsets = np.concatenate([[0], np.cumsum(hits.sum(axis=1))]).astype(np.int32)
+    values = pa.array(list(_MATCHERS), type=pa.string()).take(pa.array(skill_idx))
+    return pa.ListArray.from_arrays(pa.array(offsets), values)
+
@@ -0,0 +1,30 @@
+"""Os scripts do pipeline rodam da raiz do repo com `sys.path.insert` —
+os testes importam os módulos do mesmo jeito. Benchmarks em escala real
+(marcados `slow`) só rodam com `pytest --runslow`."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "ingestion_radar", ROOT / "transform_radar"):
+    sys.path.insert(0, str(path))
+
+
+def pytest_addoption(parser):
+    parser.addoption("--runslow", action="store_true",
+                     help="roda também os benchmarks (testes marcados `slow`)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: benchmark em escala real — só com --runslow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"):
+        return
+    skip = pytest.mark.skip(reason="benchmark — rode com --runslow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,115 @@
+"""Núcleo HTTP dos coletores ATS contra um stub HTTP local (dois "hosts"
+no mesmo servidor, latência artificial)."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import ats_http
+from ats_http import get, jobs_fingerprint, make_client, run_boards
+
+LATENCY = 0.05
+RATE = 10.0
+
+
+@pytest.fixture
+def stub():
+    """Servidor local: /board/{i} devolve 50 vagas; /throttle responde 429
+    com Retry-After na primeira chamada. Registra os instantes por host."""
+    hits: dict[str, list[float]] = {}
+    throttled: list[str] = []
+
+    class Stub(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            hits.setdefault(self.headers.get("Host", "").split(":")[0], []).append(time.monotonic())
+            time.sleep(LATENCY)
+            if self.path == "/throttle" and not throttled:
+                throttled.append(self.path)
+                self.send_response(429)
+                self.send_header("Retry-After", "1")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = json.dumps({"jobs": [{"id": i} for i in range(50)], "path": self.path}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 64   # o default (5) recusa conexões com 8 boards em voo
+
+    server = Server(("127.0.0.1", 0), Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1], hits
+    server.shutdown()
+
+
+def test_run_boards_keeps_order_and_per_host_rate(stub):
+    port, hits = stub
+    boards = [(f"http://{host}:{port}/board/{i}", f"{host}#{i}")
+              for host in ("127.0.0.1", "localhost") for i in range(8)]
+    client = make_client(rate=RATE, burst=1)
+
+    results = run_boards(client, lambda c, url, name: get(c, url).json()["path"], boards)
+
+    assert results == [url.split(str(port))[1] for url, _ in boards]
+    for times in hits.values():
+        times.sort()
+        assert (len(times) - 1) / (times[-1] - times[0]) <= RATE * 1.05
+
+
+def test_concurrent_boards_beat_serial(stub):
+    """Mesma latência por request: com 8 boards em voo, 16 boards levam uma
+    fração do tempo da coleta serial (o teto de taxa não é o gargalo aqui)."""
+    port, _ = stub
+    boards = [(f"http://{host}:{port}/board/{i}", f"{host}#{i}")
+              for host in ("127.0.0.1", "localhost") for i in range(8)]
+
+    def collect(concurrency: int) -> tuple[list, float]:
+        client = make_client(rate=1_000.0, burst=len(boards), concurrency=concurrency)
+        t0 = time.monotonic()
+        results = run_boards(client, lambda c, url, name: get(c, url).json()["path"], boards)
+        return results, time.monotonic() - t0
+
+    serial, t_serial = collect(1)
+    concurrent, t_concurrent = collect(8)
+
+    assert concurrent == serial
+    assert t_serial >= len(boards) * LATENCY
+    assert t_concurrent < t_serial / 3
+
+
+def test_retry_after_pauses_the_host(stub, monkeypatch):
+    port, hits = stub
+    monkeypatch.setattr(ats_http, "BACKOFF_BASE", 0.01)
+    client = make_client(rate=RATE, burst=1)
+
+    t0 = time.monotonic()
+    resp = get(client, f"http://127.0.0.1:{port}/throttle")
+
+    assert resp.status_code == 200
+    assert time.monotonic() - t0 >= 1.0
+    assert client["buckets"][f"127.0.0.1:{port}"]["rate"] < RATE
+
+
+def test_jobs_fingerprint_ignores_order():
+    jobs = [{"id": 2, "v": "a"}, {"id": 1, "v": "b"}]
+    assert jobs_fingerprint(jobs) == jobs_fingerprint(jobs[::-1])
+    assert jobs_fingerprint(jobs, version_key="v") != jobs_fingerprint(
+        [{"id": 2, "v": "a"}, {"id": 1, "v": "c"}], version_key="v")
+
+
+def test_jobs_fingerprint_version_fields_catch_edits():
+    jobs = [{"id": 1, "text": "Engenheiro de Dados", "categories": {"commitment": "CLT"}}]
+    edited = [{"id": 1, "text": "Engenheiro de Dados", "categories": {"commitment": "PJ"}}]
+    fields = ("text", "categories")
+    assert jobs_fingerprint(jobs) == jobs_fingerprint(edited)
+    assert jobs_fingerprint(jobs, version_fields=fields) != jobs_fingerprint(edited, version_fields=fields)
@@ -0,0 +1,54 @@
+"""Board ATS inalterado: marcador `_unchanged_from` no bronze → expansão no
+silver (`_read_ats_snapshot`); vaga editada não pode passar por inalterada."""
+
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import collect_jobs_ashby
+import collect_jobs_lever
+import silver_jobs
+
+
+def _lever_board(description: str) -> list[dict]:
+    return [{"id": "abc", "text": "Engenheiro de Dados", "descriptionPlain": description,
+             "categories": {"location": "São Paulo", "commitment": "CLT"},
+             "hostedUrl": "https://jobs.lever.co/acme/abc", "createdAt": 1782000000000}]
+
+
+def _ashby_board(description: str) -> dict:
+    return {"jobs": [{"id": "abc", "title": "Engenheiro de Dados", "descriptionPlain": description,
+                      "location": "São Paulo", "isRemote": False, "employmentType": "FullTime",
+                      "jobUrl": "https://jobs.ashbyhq.com/acme/abc",
+                      "publishedAt": "2026-06-01T10:00:00Z"}]}
+
+
+@pytest.mark.parametrize("module, board, prefix", [
+    (collect_jobs_lever, _lever_board, "lever"),
+    (collect_jobs_ashby, _ashby_board, "ashby"),
+], ids=["lever", "ashby"])
+def test_unchanged_board_round_trip(tmp_path, monkeypatch, module, board, prefix):
+    monkeypatch.setattr(module, "BRONZE_DIR", tmp_path)
+    monkeypatch.setattr(module, "COMPANIES", {"acme": "Acme"})
+
+    def run(week: int, description: str) -> object:
+        monkeypatch.setattr(module, "weekly_snapshot",
+                            lambda d, p: d / f"{p}_2026_W{week:02d}.parquet")
+        resp = SimpleNamespace(status_code=200, headers={}, json=lambda: board(description))
+        monkeypatch.setattr(module, "get", lambda *a, **kw: resp)
+        assert module.main() == 0
+        return silver_jobs._read_ats_snapshot(tmp_path / f"{prefix}_2026_W{week:02d}.parquet")
+
+    first = run(27, "Python e SQL")
+    second = run(28, "Python e SQL")
+    # semana 28 grava só o marcador, e o silver remonta a vaga da semana 27
+    raw = pd.read_parquet(tmp_path / f"{prefix}_2026_W28.parquet")
+    assert raw["_unchanged_from"].tolist() == [f"{prefix}_2026_W27.parquet"]
+    assert second["_iso_week"].tolist() == ["2026-W28"]
+    assert second["description"].tolist() == first["description"].tolist() == ["Python e SQL"]
+
+    # mesma lista de ids, descrição editada → board regravado, não marcador
+    third = run(29, "Python, SQL e dbt")
+    assert third["description"].tolist() == ["Python, SQL e dbt"]
+    assert module.load_board_state(tmp_path)["acme"]["snapshot"] == f"{prefix}_2026_W29.parquet"
@@ -0,0 +1,144 @@
+"""Benchmarks em escala real (opt-in: `python -m pytest tests --runslow -s`).
+
+Cada um reproduz a medição que justificou a otimização e confere a meta:
+    - extração de skills com pré-filtro × implementação ingênua
+    - enriquecimento do silver com 200k vagas, 1 processo × pool
+    - dedup MinHash/LSH com 100k vagas sintéticas
+    - co-ocorrência de skills por Xᵀ·X com 500k vagas
+    - IC bootstrap do trending com 50k vagas por janela (< 1 s)
+"""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from catalog import SKILL_TO_TOOL
+from gold_insights import skill_cooccurrence
+from gold_radar import _bootstrap_delta_ci
+from job_dedup import block_keys, cluster_ids, minhash_signatures
+from silver_jobs import _ENRICH_INPUT, _map_batches
+from skills_extractor import RAW_TAXONOMY, extract_skills_batch
+
+pytestmark = pytest.mark.slow
+
+POSTINGS = json.loads((Path(__file__).parent / "fixtures" / "job_postings.json")
+                      .read_text(encoding="utf-8"))
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def test_skills_prefilter_speedup():
+    rng = np.random.default_rng(7)
+    sample = [POSTINGS[i] for i in rng.integers(0, len(POSTINGS), size=20_000)]
+    titles = [p["title"] for p in sample]
+    descriptions = [p["description"] for p in sample]
+    naive = {skill: [re.compile(p, re.IGNORECASE) for p in patterns]
+             for skill, patterns in RAW_TAXONOMY.items()}
+
+    def run_naive():
+        return [[skill for skill, patterns in naive.items()
+                 if any(p.search(f"{t or ''} {d or ''}") for p in patterns)]
+                for t, d in zip(titles, descriptions)]
+
+    ref, t_naive = _timed(run_naive)
+    got, t_batch = _timed(lambda: extract_skills_batch(titles, descriptions).to_pylist())
+    print(f"\n  ingênuo {1e6 * t_naive / len(titles):7.1f} µs/vaga · "
+          f"pré-filtro {1e6 * t_batch / len(titles):7.1f} µs/vaga ({t_naive / t_batch:.1f}×)")
+    assert got == ref
+    assert t_batch * 3 < t_naive
+
+
+def test_enrichment_pool_scaling():
+    n_rows = 200_000
+    rng = np.random.default_rng(7)
+    rows = [{col: POSTINGS[i].get(col) for col in _ENRICH_INPUT}
+            for i in rng.integers(0, len(POSTINGS), size=n_rows)]
+    frame = pd.DataFrame(rows, columns=_ENRICH_INPUT)
+    frame[["struct_salary_min", "struct_salary_max"]] = \
+        frame[["struct_salary_min", "struct_salary_max"]].astype(float)
+    table = pa.Table.from_pandas(frame.assign(_need_skills=True), preserve_index=False)
+
+    workers = min(os.cpu_count() or 1, 4)
+    serial, t_serial = _timed(_map_batches, table, 1)
+    print(f"\n  1 processo: {t_serial:6.2f}s ({1e6 * t_serial / n_rows:5.1f} µs/vaga)")
+    if workers < 2:
+        pytest.skip("1 CPU — sem pool para comparar")
+    pooled, t_pool = _timed(_map_batches, table, workers)
+    print(f"  {workers} processos: {t_pool:6.2f}s ({t_serial / t_pool:.1f}×)")
+    assert pooled.equals(serial)
+    assert t_serial / t_pool >= 0.6 * workers
+
+
+def test_dedup_throughput():
+    n_rows = 100_000
+    rng = np.random.default_rng(7)
+    words = np.array([f"palavra{i}" for i in range(20_000)])
+    n_dups = n_rows // 5
+    n_base = n_rows - n_dups
+    base_tokens = rng.integers(0, len(words), size=(n_base, 150))
+    titles = [f"Engenheiro de Dados {i}" for i in range(n_base)]
+    companies = [f"Empresa {i % 3000}" for i in range(n_base)]
+    descriptions = [" ".join(words[row]) for row in base_tokens]
+    # quase-duplicatas: mesma vaga em outra fonte, com ~2% das palavras trocadas
+    origin = rng.integers(0, n_base, size=n_dups)
+    for src in origin:
+        tokens = base_tokens[src].copy()
+        swap = rng.random(len(tokens)) < 0.02
+        tokens[swap] = rng.integers(0, len(words), size=int(swap.sum()))
+        titles.append(titles[src] + " (remoto)")
+        companies.append(companies[src])
+        descriptions.append(" ".join(words[tokens]))
+    ids = [f"job_{i:07d}" for i in range(n_rows)]
+    sources = ["gupy"] * n_base + ["greenhouse"] * n_dups
+    blocks = block_keys(["pleno"] * n_rows, ["São Paulo"] * n_rows, [False] * n_rows)
+
+    sigs, t_sig = _timed(minhash_signatures, titles, companies, descriptions)
+    clusters, t_lsh = _timed(cluster_ids, ids, sigs, titles, blocks, sources)
+    found = np.array([int(c[4:]) for c in clusters])
+    total = t_sig + t_lsh
+    print(f"\n  MinHash {t_sig:6.2f}s · LSH + clusters {t_lsh:6.2f}s · "
+          f"{n_rows / total:,.0f} vagas/s")
+    assert (found[n_base:] == origin).mean() >= 0.95
+    assert (found[:n_base] == np.arange(n_base)).all()
+    assert n_rows / total >= 2_000
+
+
+def test_cooccurrence_scales():
+    rng = np.random.default_rng(7)
+    vocab = np.array(sorted(RAW_TAXONOMY))
+    popularity = rng.pareto(1.5, len(vocab)) + 1
+    popularity /= popularity.sum()
+    timings = {}
+    for n_jobs in (50_000, 500_000):
+        skills = [sorted(set(rng.choice(vocab, size=n, p=popularity)))
+                  for n in rng.integers(0, 9, size=n_jobs)]
+        col = pa.array(skills, type=pa.list_(pa.string()))
+        pairs, timings[n_jobs] = _timed(skill_cooccurrence, col)
+        print(f"\n  {n_jobs:>7,} vagas: {1e3 * timings[n_jobs]:7.1f} ms ({len(pairs):,} pares)")
+    assert timings[500_000] < 1.0
+
+
+def test_bootstrap_under_a_second_for_50k():
+    rng = np.random.default_rng(7)
+    n_tools = len(set(SKILL_TO_TOOL.values()))
+    p_recent = np.linspace(0.02, 0.6, n_tools)
+    windows = []
+    for probs in (p_recent, p_recent * rng.uniform(0.9, 1.1, n_tools)):
+        units = (rng.random((50_000, n_tools)) < probs).astype(np.int64)
+        windows.append(units[units.sum(axis=1) > 0])
+
+    (low, high), elapsed = _timed(_bootstrap_delta_ci, *windows)
+    print(f"\n  bootstrap: {elapsed:.3f}s")
+    assert np.all(low <= high)
+    assert elapsed < 1.0
@@ -0,0 +1,110 @@
+"""Coletor GitHub (GraphQL) contra um stub HTTP local: retry de rate limit
+(429, 403 com sinal de limite), 403 de token inválido sem retry, espera até
+`resetAt` e alias nulo na resposta."""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+import collect_github
+
+TOPICS = {"dbt": "dbt", "duckdb": "DuckDB", "airflow": "Airflow"}
+
+
+@pytest.fixture
+def github(monkeypatch):
+    """Stub GraphQL: responde na ordem de `script` (status, headers, corpo —
+    None = contagens normais para as buscas do request) e grava os requests."""
+    script: list[tuple[int, dict, dict | None]] = []
+    requests_seen: list[dict] = []
+
+    class Stub(BaseHTTPRequestHandler):
+        def do_POST(self):  # noqa: N802
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            requests_seen.append(payload)
+            status, headers, body = script.pop(0) if script else (200, {}, None)
+            if body is None:
+                data = {f"t{i}": {"repositoryCount": 10 * (i + 1)}
+                        for i in range(len(payload["variables"]))}
+                reset = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+                body = {"data": {"rateLimit": {"cost": 1, "remaining": 4999, "resetAt": reset},
+                                 **data}}
+            raw = json.dumps(body).encode()
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    sleeps: list[float] = []
+    monkeypatch.setattr(collect_github, "GRAPHQL_URL", f"http://127.0.0.1:{server.server_address[1]}/")
+    monkeypatch.setattr(collect_github, "TOOL_TOPICS", TOPICS)
+    monkeypatch.setattr(collect_github, "time", SimpleNamespace(sleep=sleeps.append, time=time.time))
+    monkeypatch.setenv("GITHUB_TOKEN", "x")
+    yield script, requests_seen, sleeps
+    server.shutdown()
+
+
+def _counts(rows: list[dict]) -> dict:
+    return {row["topic"]: row["new_repos_ytd"] for row in rows}
+
+
+def test_429_is_retried_after_retry_after(github):
+    script, seen, sleeps = github
+    script.append((429, {"Retry-After": "7"}, {"message": "slow down"}))
+    rows = collect_github._collect_graphql("2026-01-01")
+    assert _counts(rows) == {"dbt": 10, "duckdb": 20, "airflow": 30}
+    assert len(seen) == 2 and sleeps == [7.0]
+
+
+def test_403_with_exhausted_quota_is_retried(github):
+    script, seen, sleeps = github
+    script.append((403, {"X-RateLimit-Remaining": "0",
+                         "X-RateLimit-Reset": str(int(time.time()) + 60)}, {"message": "limit"}))
+    rows = collect_github._collect_graphql("2026-01-01")
+    assert _counts(rows)["dbt"] == 10
+    assert len(seen) == 2 and 55 <= sleeps[0] <= 62
+
+
+def test_403_bad_token_fails_without_retry(github):
+    script, seen, sleeps = github
+    script.append((403, {"X-RateLimit-Remaining": "4999"}, {"message": "Bad credentials"}))
+    rows = collect_github._collect_graphql("2026-01-01")
+    assert set(_counts(rows).values()) == {None}
+    assert len(seen) == 1 and sleeps == []
+
+
+def test_waits_for_reset_at_when_budget_runs_out(github, monkeypatch):
+    script, seen, sleeps = github
+    monkeypatch.setattr(collect_github, "BATCH_SIZE", 2)
+    reset = datetime.now(timezone.utc) + timedelta(seconds=120)
+    script.append((200, {}, {"data": {
+        "rateLimit": {"cost": 1, "remaining": 0, "resetAt": reset.isoformat()},
+        "t0": {"repositoryCount": 1}, "t1": {"repositoryCount": 2}}}))
+    rows = collect_github._collect_graphql("2026-01-01")
+    assert _counts(rows) == {"dbt": 1, "duckdb": 2, "airflow": 10}
+    assert len(seen) == 2 and 115 <= sleeps[0] <= 122
+
+
+def test_null_alias_becomes_missing_count(github):
+    script, seen, sleeps = github
+    reset = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+    script.append((200, {}, {
+        "data": {"rateLimit": {"cost": 1, "remaining": 4999, "resetAt": reset},
+                 "t0": {"repositoryCount": 5}, "t1": None, "t2": {"repositoryCount": 9}},
+        "errors": [{"message": "Something went wrong while executing your query."}]}))
+    rows = collect_github._collect_graphql("2026-01-01")
+    assert _counts(rows) == {"dbt": 5, "duckdb": None, "airflow": 9}
+    assert len(seen) == 1 and sleeps == []
@@ -0,0 +1,79 @@
+"""Coletor Gupy: snapshot semanal × coleta diária, paginação e ledger."""
+
+import collect_jobs
+import pandas as pd
+import silver_jobs
+
+
+def _job(jid: int, published: str) -> dict:
+    return {
+        "id": jid, "name": f"Engenheiro de Dados {jid}", "description": "Python, SQL e Spark",
+        "city": "São Paulo", "state": "SP", "country": "Brasil", "isRemoteWork": False,
+        "workplaceType": "on-site", "publishedDate": published,
+        "careerPageName": f"Empresa {jid}", "jobUrl": f"https://x.gupy.io/jobs/{jid}",
+    }
+
+
+def _run(monkeypatch, jobs: list[dict]) -> None:
+    def fetch_page(client, term, offset):
+        return {"data": jobs if offset == 0 else [], "pagination": {"total": len(jobs)}}
+
+    monkeypatch.setattr(collect_jobs, "_fetch_page", fetch_page)
+    assert collect_jobs.main() == 0
+
+
+def _isolate(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(collect_jobs, "BRONZE_DIR", tmp_path)
+    monkeypatch.setattr(collect_jobs, "LEDGER_PATH", tmp_path / "gupy_ledger.json")
+    monkeypatch.setattr(collect_jobs, "_check_robots", lambda: True)
+    monkeypatch.setenv("RADAR_GUPY_WORKERS", "1")
+
+
+def test_second_run_in_same_week_keeps_earlier_rows(tmp_path, monkeypatch):
+    _isolate(tmp_path, monkeypatch)
+
+    _run(monkeypatch, [_job(2, "2026-07-02T10:00:00Z"), _job(1, "2026-07-01T10:00:00Z")])
+    # dia seguinte: a vaga 1 fechou, a 3 abriu
+    _run(monkeypatch, [_job(3, "2026-07-03T10:00:00Z"), _job(2, "2026-07-02T10:00:00Z")])
+
+    (snapshot,) = tmp_path.glob("gupy_*.parquet")
+    bronze = pd.read_parquet(snapshot)
+    assert sorted(bronze["id"]) == [1, 2, 3]
+
+    ledger = collect_jobs._load_ledger()
+    assert {e["snapshot"] for e in ledger["jobs"].values()} == {snapshot.name}
+
+    resolved = silver_jobs._load_gupy([snapshot])
+    assert sorted(resolved["id"]) == ["gupy_1", "gupy_2", "gupy_3"]
+    assert resolved["description"].notna().all()
+
+
+def test_known_and_old_pages_do_not_stop_pagination(tmp_path, monkeypatch):
+    """Vaga antiga ainda aberta na página 3 entra no snapshot mesmo com as
+    páginas anteriores só trazendo ids já conhecidos (e mais antigos)."""
+    _isolate(tmp_path, monkeypatch)
+    monkeypatch.setattr(collect_jobs, "SEARCH_TERMS", ["engenheiro de dados"])
+    monkeypatch.setattr(collect_jobs, "PAGE_LIMIT", 2)
+    jobs = [_job(jid, f"2026-06-{30 - jid:02d}T10:00:00Z") for jid in range(1, 7)]
+
+    def fetch_page(client, term, offset):
+        return {"data": jobs[offset:offset + 2], "pagination": {"total": len(jobs)}}
+
+    monkeypatch.setattr(collect_jobs, "_fetch_page", fetch_page)
+    assert collect_jobs.main() == 0
+    assert collect_jobs.main() == 0
+
+    (snapshot,) = tmp_path.glob("gupy_*.parquet")
+    assert sorted(pd.read_parquet(snapshot)["id"]) == [1, 2, 3, 4, 5, 6]
+
+
+def test_ledger_prunes_stale_and_orphan_ids(tmp_path, monkeypatch):
+    monkeypatch.setattr(collect_jobs, "BRONZE_DIR", tmp_path)
+    (tmp_path / "gupy_2026_W27.parquet").touch()
+    ledger = {"high_water": "2026-07-01", "jobs": {
+        "1": {"first_seen": "2026-W10", "last_seen": "2026-W14", "snapshot": "gupy_2026_W27.parquet"},
+        "2": {"first_seen": "2026-W20", "last_seen": "2026-W26", "snapshot": "gupy_2026_W27.parquet"},
+        "3": {"first_seen": "2026-W25", "last_seen": "2026-W27", "snapshot": "gupy_2026_W25.parquet"},
+    }}
+    assert collect_jobs._prune_ledger(ledger, "2026-W27") == 2
+    assert list(ledger) == ["jobs"] and list(ledger["jobs"]) == ["2"]
@@ -0,0 +1,54 @@
+"""Co-ocorrência de skills: produto Xᵀ·X (por blocos) × self-join SQL de
+`unnest(skills)`, e as métricas derivadas num exemplo feito à mão."""
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import gold_insights
+from gold_insights import skill_cooccurrence
+
+
+def _self_join(col: pa.Array) -> pd.DataFrame:
+    con = duckdb.connect()
+    con.register("jobs", pa.table({"id": pa.array(np.arange(len(col))), "skills": col}))
+    return con.execute("""
+        SELECT a.skill AS skill_a, b.skill AS skill_b, COUNT(*) AS n_vagas
+        FROM (SELECT id, unnest(skills) AS skill FROM jobs) a
+        JOIN (SELECT id, unnest(skills) AS skill FROM jobs) b
+            ON a.id = b.id AND a.skill < b.skill
+        GROUP BY ALL
+    """).df()
+
+
+@pytest.mark.parametrize("chunk", [700, 200_000])
+def test_counts_match_self_join(chunk, monkeypatch):
+    monkeypatch.setattr(gold_insights, "COOC_CHUNK", chunk)
+    rng = np.random.default_rng(7)
+    vocab = np.array([f"skill_{i:02d}" for i in range(30)])
+    popularity = rng.pareto(1.5, len(vocab)) + 1
+    popularity /= popularity.sum()
+    skills = [sorted(set(rng.choice(vocab, size=n, p=popularity)))
+              for n in rng.integers(0, 9, size=5_000)]
+    skills[3] = None                                   # vaga sem lista
+    col = pa.array(skills, type=pa.list_(pa.string()))
+
+    got = skill_cooccurrence(col)[["skill_a", "skill_b", "n_vagas"]]
+    ref = _self_join(col)
+    key = ["skill_a", "skill_b"]
+    pd.testing.assert_frame_equal(got.sort_values(key).reset_index(drop=True),
+                                  ref.sort_values(key).reset_index(drop=True),
+                                  check_dtype=False)
+
+
+def test_derived_metrics():
+    col = pa.array([["python", "sql"], ["python", "sql"], ["python"], ["spark"]],
+                   type=pa.list_(pa.string()))
+    (row,) = skill_cooccurrence(col).to_dict("records")
+    assert (row["skill_a"], row["skill_b"], row["n_vagas"]) == ("python", "sql", 2)
+    assert row["pct_of_jobs"] == 50.0
+    assert row["lift"] == pytest.approx(2 * 4 / (3 * 2), abs=0.01)
+    assert row["pmi"] == pytest.approx(np.log2(4 / 3), abs=1e-3)
+    assert row["jaccard"] == pytest.approx(2 / 3, abs=1e-3)
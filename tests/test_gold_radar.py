@@ -0,0 +1,101 @@
+"""Trending do radar: SQL de uma passada (`_trending_shares`) × referência
+em pandas, para cada tamanho de histórico, sobre um `skills_by_week`
+gravado (tests/fixtures/skills_by_week.csv, 8 semanas); e o IC bootstrap
+do delta de share × a reamostragem ingênua das vagas."""
+
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+import gold_radar
+from catalog import SKILL_TO_TOOL, TOOL_CATEGORY
+from gold_radar import (
+    CI_LEVEL, _bootstrap_delta_ci, _bootstrap_shares, _load_dims, _trending_shares,
+    _trending_window,
+)
+
+SKILLS_BY_WEEK = pd.read_csv(Path(__file__).parent / "fixtures" / "skills_by_week.csv")
+WEEKS = sorted(SKILLS_BY_WEEK["iso_week"].unique(), reverse=True)
+
+
+def _trending_reference(sbw: pd.DataFrame, span: int) -> pd.DataFrame:
+    """Trending em pandas puro, sem SQL."""
+    weeks = sorted(sbw["iso_week"].unique(), reverse=True)
+    mapped = sbw.merge(pd.DataFrame(SKILL_TO_TOOL.items(), columns=["skill", "tool"]), on="skill")
+    out = pd.DataFrame({"tool": list(TOOL_CATEGORY)})
+    for col, window in (("recent", weeks[:span]), ("prior", weeks[span:2 * span])):
+        m = mapped[mapped["iso_week"].isin(window)].groupby("tool")["n_jobs"].sum()
+        out[f"mentions_{col}"] = out["tool"].map(m).fillna(0).astype("int64")
+        total = out[f"mentions_{col}"].sum()
+        out[f"share_{col}_pct"] = ((100.0 * out[f"mentions_{col}"] / total).round(1)
+                                   if total else float("nan"))
+    return out
+
+
+@pytest.fixture
+def con(tmp_path, monkeypatch):
+    path = tmp_path / "skills_by_week.parquet"
+    SKILLS_BY_WEEK.to_parquet(path, index=False)
+    monkeypatch.setattr(gold_radar, "SKILLS_BY_WEEK", path)
+    con = duckdb.connect()
+    _load_dims(con)
+    yield con
+    con.close()
+
+
+@pytest.mark.parametrize("n_weeks", range(1, len(WEEKS) + 1))
+def test_trending_matches_reference(con, n_weeks):
+    kept = SKILLS_BY_WEEK[SKILLS_BY_WEEK["iso_week"].isin(WEEKS[:n_weeks])]
+    con.register("kept", kept)
+    con.execute("CREATE OR REPLACE TEMP TABLE skills_by_week AS SELECT * FROM kept")
+    span, mode, _ = _trending_window(n_weeks)
+    if not span:
+        assert mode == "insuficiente"
+        return
+    got = _trending_shares(con, span).sort_values("tool").reset_index(drop=True)
+    ref = _trending_reference(kept, span).sort_values("tool").reset_index(drop=True)
+    pd.testing.assert_frame_equal(got, ref[got.columns], check_dtype=False)
+
+
+def _windows(n_jobs: int) -> list[np.ndarray]:
+    """Janelas sintéticas vaga × ferramenta (0/1), só vagas com menção."""
+    rng = np.random.default_rng(7)
+    n_tools = len(set(SKILL_TO_TOOL.values()))
+    p_recent = np.linspace(0.02, 0.6, n_tools)
+    p_prior = p_recent * rng.uniform(0.9, 1.1, n_tools)
+    windows = []
+    for probs in (p_recent, p_prior):
+        units = (rng.random((n_jobs, n_tools)) < probs).astype(np.int64)
+        windows.append(units[units.sum(axis=1) > 0])
+    return windows
+
+
+def test_bootstrap_ci_matches_naive_resampling():
+    recent, prior = _windows(5_000)
+    low, high = _bootstrap_delta_ci(recent, prior)
+
+    # referência: reamostragem ingênua das vagas (índices), réplica a réplica
+    rng = np.random.default_rng(11)
+    ref = np.empty((500, recent.shape[1]))
+    for b in range(len(ref)):
+        shares = []
+        for units in (recent, prior):
+            sample = units[rng.integers(0, len(units), len(units))].sum(axis=0)
+            shares.append(100.0 * sample / sample.sum())
+        ref[b] = shares[0] - shares[1]
+    ref_low, ref_high = np.quantile(ref, [(1 - CI_LEVEL) / 2, (1 + CI_LEVEL) / 2], axis=0)
+
+    assert np.all(np.abs((high - low) / (ref_high - ref_low) - 1) < 0.25)
+    point = (100.0 * recent.sum(axis=0) / recent.sum()) - (100.0 * prior.sum(axis=0) / prior.sum())
+    assert np.all((low <= point) & (point <= high))
+
+
+def test_bootstrap_is_deterministic_and_handles_empty_window():
+    recent, prior = _windows(500)
+    np.testing.assert_array_equal(_bootstrap_delta_ci(recent, prior)[0],
+                                  _bootstrap_delta_ci(recent, prior)[0])
+    empty = np.zeros((0, recent.shape[1]), dtype=np.int64)
+    assert np.isnan(_bootstrap_shares(empty, np.random.default_rng(0))).all()
@@ -0,0 +1,119 @@
+"""Dedup MinHash/LSH: pares conhecidos do bronze (postings gravados em
+tests/fixtures/dedup_postings.json) — mesmo texto-modelo, vagas diferentes."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from job_dedup import SIM_THRESHOLD, block_keys, cluster_ids, minhash_signatures
+
+POSTINGS = json.loads((Path(__file__).parent / "fixtures" / "dedup_postings.json")
+                      .read_text(encoding="utf-8"))
+
+# (a, b, motivo) — mesma empresa e descrição, mas aberturas distintas
+DISTINCT_PAIRS = [
+    ("gupy_11600789", "gupy_11598301", "Pleno × Senior (Leega GenAI)"),
+    ("gupy_11535007", "gupy_12075312", "PL × JR (Cogna)"),
+    ("gupy_11357558", "gupy_11357663", "RJ × SP (Visagio)"),
+    ("apibr_datascience-br/vagas_5091369827", "apibr_datascience-br/vagas_5109974000",
+     "remoto × híbrido (Sylision)"),
+]
+
+
+def _cluster(postings: list[dict], sources: list[str]) -> dict[str, str]:
+    sigs = minhash_signatures([p["title"] for p in postings], [p["company"] for p in postings],
+                              [p["description"] for p in postings])
+    blocks = block_keys([p["seniority"] for p in postings], [p["city"] for p in postings],
+                        [p["is_remote"] for p in postings])
+    ids = [p["id"] for p in postings]
+    return dict(zip(ids, cluster_ids(ids, sigs, [p["title"] for p in postings], blocks, sources)))
+
+
+@pytest.mark.parametrize("a, b, reason", DISTINCT_PAIRS, ids=[r for *_, r in DISTINCT_PAIRS])
+def test_distinct_openings_are_not_merged(a, b, reason):
+    postings = [p for p in POSTINGS if p["id"] in (a, b)]
+    sigs = minhash_signatures([p["title"] for p in postings], [p["company"] for p in postings],
+                              [p["description"] for p in postings])
+    # o texto sozinho não separa o par — quem separa é o bloqueio
+    assert (sigs[0] == sigs[1]).mean() >= SIM_THRESHOLD
+    # fontes diferentes de propósito: nem a regra de fonte salva o par
+    clusters = _cluster(postings, ["gupy", "greenhouse"])
+    assert clusters[a] != clusters[b]
+
+
+def test_same_posting_in_two_sources_is_merged():
+    (original,) = [p for p in POSTINGS if p["id"] == "gupy_11536105"]
+    copy = {**original, "id": "gh_leega_1", "title": original["title"] + " ",
+            "description": original["description"].replace("\n", " ") + " Candidate-se!"}
+    clusters = _cluster([original, copy], ["gupy", "greenhouse"])
+    assert clusters == {"gupy_11536105": "gh_leega_1", "gh_leega_1": "gh_leega_1"}
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_copy_found_when_template_sibling_shares_the_bucket(seed):
+    """Duas vagas Gupy da mesma empresa com o mesmo texto-modelo (papéis
+    diferentes) + a cópia Greenhouse da segunda: a cópia tem de casar com a
+    original mesmo quando a irmã é o primeiro membro do balde LSH."""
+    rng = np.random.default_rng(seed)
+    template = " ".join(f"palavra{i}" for i in rng.integers(0, 5_000, size=600))
+    postings = [
+        {"id": "gupy_1", "title": "Analista de Dados Pleno"},
+        {"id": "gupy_2", "title": "Engenheiro de Dados Pleno"},
+        {"id": "gh_acme_2", "title": "Engenheiro de Dados Pleno"},
+    ]
+    for p in postings:
+        p.update(company="Acme", description=template, seniority="pleno",
+                 city="São Paulo", is_remote=False)
+    clusters = _cluster(postings, ["gupy", "gupy", "greenhouse"])
+    assert clusters == {"gupy_1": "gupy_1", "gupy_2": "gh_acme_2", "gh_acme_2": "gh_acme_2"}
+
+
+def test_same_source_reposts_stay_separate():
+    (original,) = [p for p in POSTINGS if p["id"] == "gupy_11536105"]
+    repost = {**original, "id": "gupy_99999999"}
+    clusters = _cluster([original, repost], ["gupy", "gupy"])
+    assert clusters["gupy_11536105"] != clusters["gupy_99999999"]
+
+
+def test_empty_text_never_matches():
+    sigs = minhash_signatures(["", ""], ["", ""], ["", ""])
+    assert list(cluster_ids(["a", "b"], sigs, ["", ""], None, ["x", "y"])) == ["a", "b"]
+    assert np.all(sigs == np.iinfo(np.uint32).max)
+
+
+def test_planted_cross_source_duplicates():
+    """Postings sintéticos: 1 em cada 5 é cópia de outro em outra fonte, com
+    ~2% das palavras trocadas. Recall ≥ 95% e nenhuma fusão indevida."""
+    rng = np.random.default_rng(7)
+    words = np.array([f"palavra{i}" for i in range(20_000)])
+    n_base, n_dups = 2_000, 500
+    base_tokens = rng.integers(0, len(words), size=(n_base, 150))
+    titles = [f"Engenheiro de Dados {i}" for i in range(n_base)]
+    companies = [f"Empresa {i % 300}" for i in range(n_base)]
+    descriptions = [" ".join(words[row]) for row in base_tokens]
+
+    origin = rng.integers(0, n_base, size=n_dups)
+    for src in origin:
+        tokens = base_tokens[src].copy()
+        swap = rng.random(len(tokens)) < 0.02
+        tokens[swap] = rng.integers(0, len(words), size=int(swap.sum()))
+        titles.append(titles[src] + " (remoto)")
+        companies.append(companies[src])
+        descriptions.append(" ".join(words[tokens]))
+    n = n_base + n_dups
+    ids = [f"job_{i:07d}" for i in range(n)]
+    sources = ["gupy"] * n_base + ["greenhouse"] * n_dups
+
+    sigs = minhash_signatures(titles, companies, descriptions)
+    blocks = block_keys(["pleno"] * n, ["São Paulo"] * n, [False] * n)
+    found = np.array([int(c[4:]) for c in cluster_ids(ids, sigs, titles, blocks, sources)])
+
+    expected = np.concatenate([np.arange(n_base), origin])
+    assert (found[n_base:] == origin).mean() >= 0.95
+    # nenhuma vaga original é puxada para o cluster de outra
+    assert (found[:n_base] == expected[:n_base]).all()
+    # cópia não encontrada fica sozinha, não cai no cluster de outra vaga
+    missed = found[n_base:] != origin
+    assert (found[n_base:][missed] == np.arange(n_base, n)[missed]).all()
@@ -0,0 +1,76 @@
+"""Enriquecimento do silver: versões colunares (senioridade, contrato,
+salário) × funções por linha, e pool de processos × execução serial —
+sobre vagas gravadas do bronze (tests/fixtures/job_postings.json) mais
+casos estruturados que o bronze gravado não cobre."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import silver_jobs
+from silver_jobs import (
+    _ENRICH_INPUT, _contract_col, _infer_seniority, _map_batches, _resolve_contract,
+    _resolve_salary, _salary_cols, _seniority_col,
+)
+
+POSTINGS = json.loads((Path(__file__).parent / "fixtures" / "job_postings.json")
+                      .read_text(encoding="utf-8"))
+
+STRUCTURED = [
+    {"title": "Data Engineer Sr", "description": "Salário: R$ 9.000,00",
+     "contract_raw": "Full-Time", "struct_salary_min": 12000.0, "struct_salary_max": 15000.0,
+     "struct_salary_currency": "USD"},
+    {"title": "Analytics Engineer", "description": None, "contract_raw": "  PJ ",
+     "struct_salary_min": None, "struct_salary_max": 8000.0, "struct_salary_currency": ""},
+    {"title": "", "description": "Remuneração de R$ 4.037,00 a R$ 5.500,00, regime CLT",
+     "contract_raw": "contrato cnpj mensal", "struct_salary_min": 7000.0,
+     "struct_salary_max": 6000.0, "struct_salary_currency": None},
+    {"title": "Estagiário de Dados", "description": "bolsa R$ 2.000", "contract_raw": "",
+     "struct_salary_min": None, "struct_salary_max": None, "struct_salary_currency": None},
+    {"title": "Head of Data", "description": "temporário 6 meses", "contract_raw": "freelance",
+     "struct_salary_min": None, "struct_salary_max": None, "struct_salary_currency": None},
+]
+
+
+@pytest.fixture(scope="module")
+def frame() -> pd.DataFrame:
+    rows = [{col: p.get(col) for col in _ENRICH_INPUT} for p in POSTINGS] + STRUCTURED
+    df = pd.DataFrame(rows, columns=_ENRICH_INPUT)
+    df[["struct_salary_min", "struct_salary_max"]] = \
+        df[["struct_salary_min", "struct_salary_max"]].astype(float)
+    return df
+
+
+def _same(got, expected) -> None:
+    got, expected = pd.Series(got, dtype=object), pd.Series(expected, dtype=object)
+    mismatch = ~((got == expected) | (got.isna() & expected.isna()))
+    assert not mismatch.any(), pd.DataFrame({"got": got, "expected": expected})[mismatch]
+
+
+def test_seniority_matches_row_wise(frame):
+    _same(_seniority_col(frame["title"]), [_infer_seniority(t) for t in frame["title"]])
+
+
+def test_contract_matches_row_wise(frame):
+    _same(_contract_col(frame), [_resolve_contract(r) for r in frame.to_dict("records")])
+
+
+def test_salary_matches_row_wise(frame):
+    got = _salary_cols(frame)
+    expected = [_resolve_salary(r) for r in frame.to_dict("records")]
+    for k, col in enumerate(["salary_min", "salary_max", "salary_currency", "salary_source"]):
+        _same(got[col], [row[k] for row in expected])
+    assert {"estruturado", "regex"} <= set(got["salary_source"].dropna())
+
+
+def test_pool_output_matches_serial(frame, monkeypatch):
+    monkeypatch.setattr(silver_jobs, "ENRICH_CHUNK_ROWS", 8)
+    table = pa.Table.from_pandas(frame.assign(_need_skills=np.arange(len(frame)) % 3 != 0),
+                                 preserve_index=False)
+    serial = _map_batches(table, 1)
+    assert _map_batches(table, 2).equals(serial)
+    assert serial.num_rows == len(frame)
@@ -0,0 +1,50 @@
+"""Extração de skills: pré-filtro de literais (linha a linha e colunar) ×
+implementação ingênua skill × padrão, sobre vagas gravadas do bronze
+(tests/fixtures/job_postings.json — cobre todas as skills da taxonomia)."""
+
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from skills_extractor import RAW_TAXONOMY, extract_skills_batch, extract_skills_row
+
+POSTINGS = json.loads((Path(__file__).parent / "fixtures" / "job_postings.json")
+                      .read_text(encoding="utf-8"))
+
+_NAIVE = {skill: [re.compile(p, re.IGNORECASE) for p in patterns]
+          for skill, patterns in RAW_TAXONOMY.items()}
+
+EDGE_CASES = [
+    ("", ""),
+    (None, None),
+    ("Engenheiro de Dados", None),
+    ("PYSPARK / Spark SQL", "dbt-core, DBT Core e dbt cloud"),
+    ("Eng. de Dados", "ſnowflake, KAFKA (K Kelvin), aırflow com ı sem ponto"),
+    ("Analista", "power bi, PowerBI, Power-BI; google bigquery; gcp"),
+]
+
+
+def _naive(title, description) -> list[str]:
+    """Referência: todo padrão de toda skill sobre o texto inteiro."""
+    text = f"{title or ''} {description or ''}"
+    return [skill for skill, patterns in _NAIVE.items() if any(p.search(text) for p in patterns)]
+
+
+def test_fixture_covers_every_skill():
+    found = {skill for p in POSTINGS for skill in _naive(p["title"], p["description"])}
+    assert found == set(RAW_TAXONOMY)
+
+
+@pytest.mark.parametrize("title, description",
+                         [(p["title"], p["description"]) for p in POSTINGS] + EDGE_CASES)
+def test_prefilter_matches_naive(title, description):
+    assert extract_skills_row(title, description) == _naive(title, description)
+
+
+def test_batch_matches_naive():
+    titles = [p["title"] for p in POSTINGS] + [t for t, _ in EDGE_CASES]
+    descriptions = [p["description"] for p in POSTINGS] + [d for _, d in EDGE_CASES]
+    expected = [_naive(t, d) for t, d in zip(titles, descriptions)]
+    assert extract_skills_batch(titles, descriptions).to_pylist() == expected
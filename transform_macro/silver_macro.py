@@ -19,7 +19,8 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-import duckdb
+from common.duckdb_profile import connect  # noqa: E402
+from common.quality import enforce, fresh, not_null, row_count_delta, run_suite, unique  # noqa: E402
 
 SILVER_DIR = Path("data/silver")
 BRONZE_GLOBS = [
@@ -44,7 +45,7 @@ def main() -> int:
         for g in existing
     )
 
-    con = duckdb.connect()
+    con = connect(ordered=False)
     out_path = SILVER_DIR / "macro.parquet"
     con.execute(f"""
         COPY (
@@ -61,10 +62,16 @@ def main() -> int:
 
     n = con.execute(f"SELECT COUNT(*) FROM read_parquet('{out_path}')").fetchone()[0]
     kpis = con.execute(f"SELECT COUNT(DISTINCT kpi_id) FROM read_parquet('{out_path}')").fetchone()[0]
-    con.close()
 
     print(f"✓ Silver — Brasil Cockpit")
     print(f"  {out_path} ({n} linhas, {kpis} KPIs)")
+
+    results = run_suite(con, "silver.macro", f"read_parquet('{out_path}')", [
+        unique("kpi_id", "data_referencia"), not_null("valor"),
+        fresh("data_referencia", 45), row_count_delta(20),
+    ])
+    con.close()
+    enforce(results)
     return 0
 
 
@@ -17,7 +17,16 @@ Tudo em DuckDB, tudo a partir de dado real já coletado (sem inferência).
 3. Combinações de skills — quais pares de skill aparecem juntos com
    mais frequência na MESMA vaga (ex.: "Python + SQL", "Databricks +
    dbt") — insight de "o que estudar junto", não é o mesmo dado do
-   radar (que é por ferramenta isolada).
+   radar (que é por ferramenta isolada). Conta por `cluster_id` (a mesma
+   vaga republicada/espelhada conta uma vez) e, além da frequência, traz
+   por par o lift (n_ab·N / n_a·n_b), o PMI (log₂ do lift) e o Jaccard
+   (n_ab / n_a ∪ n_b) — lift alto = par que anda junto mais do que o
+   acaso explicaria, mesmo entre skills pouco frequentes.
+   A contagem sai de uma matriz vaga × skill 0/1 (a taxonomia tem poucas
+   dezenas de skills) e um único produto Xᵀ·X em NumPy, por blocos de
+   vagas — a diagonal é n_a e o triângulo superior é n_ab. Substitui o
+   self-join de `unnest(skills)`, que materializava uma linha por par
+   (conferido contra ele em `tests/test_gold_insights.py`).
 4. Transparência salarial — % de vagas com um valor de remuneração REAL
    e inequívoco extraído da descrição (ver `SALARY_ANCHOR_PATTERN` em
    `silver_jobs.py`). Achado real ao validar manualmente: um regex
@@ -32,7 +41,7 @@ Tudo em DuckDB, tudo a partir de dado real já coletado (sem inferência).
    referência de mercado com N estatisticamente relevante.
 
 Saída:
-    data/gold/insights.parquet        — skill_combos (formato long)
+    data/gold/insights.parquet        — todos os pares de skill (formato long)
     assets/data/radar_insights.json   — payload completo p/ frontend
 """
 
@@ -43,7 +52,14 @@ import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
-import duckdb
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pyarrow as pa  # noqa: E402
+import pyarrow.compute as pc  # noqa: E402
+
+from common.duckdb_profile import connect  # noqa: E402
+from common.quality import enforce, in_range, references, run_suite, unique  # noqa: E402
 
 GOLD_DIR = Path("data/gold")
 FRONTEND_DIR = Path("assets/data")
@@ -51,13 +67,62 @@ FRONTEND_DIR = Path("assets/data")
 RECENT_LIMIT = 25
 COMPANY_LIMIT = 15
 COMBO_LIMIT = 15
+# Suporte mínimo (nº de vagas com o par) para o ranking por lift — com
+# poucas vagas, lift/PMI explodem por acaso.
+COMBO_MIN_SUPPORT = 5
+# Vagas por bloco no produto Xᵀ·X — limita a matriz densa em memória
+COOC_CHUNK = 200_000
 # Amostra mínima por senioridade para reportar mediana/faixa salarial — com
 # N menor, seria estatisticamente enganoso (mostramos amostra anedótica).
 SALARY_MIN_SAMPLE = 5
 
 
+def skill_cooccurrence(skills) -> pd.DataFrame:
+    """Todos os pares de skill que co-ocorrem numa coluna `list<string>`
+    (uma linha por vaga), com n_vagas, pct_of_jobs, lift, PMI e Jaccard.
+    `skill_a < skill_b` em cada par."""
+    if isinstance(skills, pa.ChunkedArray):
+        skills = skills.combine_chunks()
+    n_jobs = len(skills)
+    lengths = pc.fill_null(pc.list_value_length(skills), 0).to_numpy()
+    rows = np.repeat(np.arange(n_jobs), lengths)
+    encoded = pc.dictionary_encode(pc.list_flatten(skills))
+    # códigos na ordem alfabética das skills → triângulo superior = skill_a < skill_b
+    vocab = np.asarray(encoded.dictionary.to_pylist(), dtype=object)
+    order = np.argsort(vocab)
+    rank = np.empty(len(vocab), dtype=np.int64)
+    rank[order] = np.arange(len(vocab))
+    vocab = vocab[order]
+    codes = pc.fill_null(encoded.indices, -1).to_numpy()
+    rows, codes = rows[codes >= 0], rank[codes[codes >= 0]]
+
+    k = len(vocab)
+    counts = np.zeros((k, k), dtype=np.int64)
+    for start in range(0, n_jobs, COOC_CHUNK):
+        lo, hi = np.searchsorted(rows, [start, start + COOC_CHUNK])
+        x = np.zeros((min(COOC_CHUNK, n_jobs - start), k), dtype=np.float32)
+        x[rows[lo:hi] - start, codes[lo:hi]] = 1.0
+        counts += (x.T @ x).astype(np.int64)   # exato: cada bloco < 2²⁴ vagas
+
+    a, b = np.triu_indices(k, 1)
+    n_ab = counts[a, b]
+    a, b, n_ab = a[n_ab > 0], b[n_ab > 0], n_ab[n_ab > 0]
+    n_a, n_b = np.diag(counts)[a], np.diag(counts)[b]
+    lift = n_ab * n_jobs / (n_a * n_b)
+    return pd.DataFrame({
+        "skill_a": vocab[a],
+        "skill_b": vocab[b],
+        "n_vagas": n_ab,
+        "pct_of_jobs": np.round(100.0 * n_ab / n_jobs, 1),
+        "lift": np.round(lift, 2),
+        "pmi": np.round(np.log2(lift), 3),
+        "jaccard": np.round(n_ab / (n_a + n_b - n_ab), 3),
+    })
+
+
 def main() -> int:
-    con = duckdb.connect()
+    # Sem preservar ordem de inserção: toda saída abaixo tem ORDER BY explícito.
+    con = connect(ordered=False)
     GOLD_DIR.mkdir(parents=True, exist_ok=True)
     FRONTEND_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -101,22 +166,20 @@ def main() -> int:
     """).df().to_dict(orient="records")
 
     # ── 3. Combinações de skills (co-ocorrência na mesma vaga) ──────────
-    con.execute("""
-        CREATE TEMP TABLE job_skill_pairs AS
-        SELECT a.id, a.skill AS skill_a, b.skill AS skill_b
-        FROM (SELECT id, unnest(skills) AS skill FROM 'data/silver/jobs_clean.parquet') a
-        JOIN (SELECT id, unnest(skills) AS skill FROM 'data/silver/jobs_clean.parquet') b
-            ON a.id = b.id AND a.skill < b.skill
-    """)
-    total_jobs = con.execute("SELECT COUNT(*) FROM 'data/silver/jobs_clean.parquet'").fetchone()[0]
-    combos = con.execute(f"""
-        SELECT skill_a, skill_b, COUNT(*) AS n_vagas,
-               ROUND(100.0 * COUNT(*) / {total_jobs}, 1) AS pct_of_jobs
-        FROM job_skill_pairs
-        GROUP BY skill_a, skill_b
-        ORDER BY n_vagas DESC, skill_a ASC, skill_b ASC
-        LIMIT {COMBO_LIMIT}
+    # Uma linha por cluster de quase-duplicatas (silver_jobs.py), com a
+    # união das skills das cópias.
+    jobs = con.execute("""
+        SELECT cluster_id, list_distinct(flatten(list(skills))) AS skills
+        FROM 'data/silver/jobs_clean.parquet'
+        GROUP BY cluster_id
     """).df()
+    pairs = skill_cooccurrence(pa.array(jobs["skills"], type=pa.list_(pa.string())))
+    combos = pairs.sort_values(["n_vagas", "skill_a", "skill_b"],
+                               ascending=[False, True, True]).head(COMBO_LIMIT)
+    combos_lift = (pairs[pairs["n_vagas"] >= COMBO_MIN_SUPPORT]
+                   .sort_values(["lift", "n_vagas", "skill_a", "skill_b"],
+                                ascending=[False, False, True, True])
+                   .head(COMBO_LIMIT))
 
     # ── 4. Transparência salarial (valor REAL, não menção de benefício) ──
     total_jobs_all = con.execute("SELECT COUNT(*) FROM 'data/silver/jobs_clean.parquet'").fetchone()[0]
@@ -166,6 +229,7 @@ def main() -> int:
         "por_empresa": por_empresa,
         "cobertura_por_fonte": cobertura_por_fonte,
         "skill_combos": combos.to_dict(orient="records"),
+        "skill_combos_lift": combos_lift.to_dict(orient="records"),
         "salario_transparencia_pct": salario_pct,
         "n_vagas_com_salario_real": int(n_com_salario),
         "n_vagas_total": int(total_jobs_all),
@@ -206,6 +270,11 @@ def main() -> int:
                 "fica vazio e a UI mostra os pontos individuais (amostra anedótica)."
             ),
             "skill_combos": "pares de skill que aparecem juntos na mesma vaga — não é o score do radar, é 'o que estudar junto'.",
+            "skill_combos_lift": (
+                "pares com maior lift (quantas vezes o par aparece junto além do "
+                f"esperado por acaso), entre pares com >= {COMBO_MIN_SUPPORT} vagas. "
+                "PMI = log₂(lift); Jaccard = vagas com as duas ÷ vagas com alguma das duas."
+            ),
             "salario_transparencia_pct": (
                 "% de vagas com um valor de remuneração REAL e inequívoco na "
                 "descrição (não conta menção de benefício — vale-refeição, "
@@ -222,14 +291,24 @@ def main() -> int:
     )
     print(f"  ✓ {FRONTEND_DIR / 'radar_insights.json'}")
 
-    con.register("combos_df", combos)
+    con.register("pairs_df", pairs)
     con.execute(f"""
-        COPY (SELECT skill_a, skill_b, n_vagas, pct_of_jobs FROM combos_df)
+        COPY (
+            SELECT skill_a, skill_b, n_vagas, pct_of_jobs, lift, pmi, jaccard FROM pairs_df
+            ORDER BY n_vagas DESC, skill_a ASC, skill_b ASC
+        )
         TO '{GOLD_DIR / "insights.parquet"}' (FORMAT PARQUET)
     """)
     print(f"  ✓ {GOLD_DIR / 'insights.parquet'}")
 
+    skills_src = "read_parquet('data/silver/skills_by_week.parquet')"
+    results = run_suite(con, "gold.insights", f"read_parquet('{GOLD_DIR / 'insights.parquet'}')", [
+        unique("skill_a", "skill_b"), in_range("pct_of_jobs", 0, 100),
+        in_range("lift", 0), in_range("jaccard", 0, 1),
+        references("skill_a", skills_src, "skill"), references("skill_b", skills_src, "skill"),
+    ])
     con.close()
+    enforce(results)
     return 0
 
 
@@ -6,6 +6,12 @@ os números usados na seção "Análise de vagas" do frontend: % remoto,
 distribuição por cidade/estado, por senioridade e as skills mais
 mencionadas (todas as 24 da taxonomia — não só as 16 do radar de score).
 
+Todas as quebras (total, % remoto, senioridade, contrato, cidade, termo
+de busca, fonte) saem de UMA consulta `GROUP BY GROUPING SETS` sobre uma
+única leitura do parquet, materializada em `breakdowns` (uma linha por
+(dimensão, chave)); as seções do JSON são recortes dessa tabela pequena.
+Quebra nova = uma entrada em BREAKDOWNS, sem nova leitura das vagas.
+
 Saída:
     data/gold/jobs_analysis.parquet (resumo por dimensão, formato long)
     assets/data/radar_jobs_analysis.json
@@ -18,67 +24,100 @@ import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
-import duckdb
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.duckdb_profile import connect  # noqa: E402
 
 GOLD_DIR = Path("data/gold")
 FRONTEND_DIR = Path("assets/data")
 
+# dimensão → colunas agrupadas; cada uma vira um grouping set da consulta
+BREAKDOWNS = {
+    "senioridade": ("seniority",),
+    "contrato": ("contract_type",),
+    "cidade_uf": ("city", "state"),
+    "cidade": ("city",),
+    "termo_busca": ("_matched_term",),
+    "fonte": ("source",),
+}
+
+
+def _breakdowns_sql() -> str:
+    """GROUPING SETS de todas as BREAKDOWNS + total geral, com a coluna `dim`
+    derivada do bitmask de GROUPING() (bit 1 = coluna fora do grupo)."""
+    cols = list(dict.fromkeys(c for dims in BREAKDOWNS.values() for c in dims))
+
+    def grouping_id(dims: tuple[str, ...]) -> int:
+        return sum(1 << (len(cols) - 1 - i) for i, c in enumerate(cols) if c not in dims)
+
+    dim_cases = "\n".join(f"WHEN {grouping_id(dims)} THEN '{name}'"
+                          for name, dims in BREAKDOWNS.items())
+    sets = ", ".join("(" + ", ".join(dims) + ")" for dims in BREAKDOWNS.values())
+    return f"""
+        SELECT
+            CASE GROUPING({", ".join(cols)}) {dim_cases} ELSE 'total' END AS dim,
+            {", ".join(cols)},
+            COUNT(*) AS n,
+            COUNT(DISTINCT cluster_id) AS n_clusters,
+            COUNT_IF(is_remote) AS n_remote
+        FROM 'data/silver/jobs_clean.parquet'
+        GROUP BY GROUPING SETS ((), {sets})
+    """
+
 
 def main() -> int:
-    con = duckdb.connect()
+    con = connect()
     GOLD_DIR.mkdir(parents=True, exist_ok=True)
     FRONTEND_DIR.mkdir(parents=True, exist_ok=True)
 
-    total_jobs = con.execute("SELECT COUNT(*) FROM 'data/silver/jobs_clean.parquet'").fetchone()[0]
+    con.execute(f"CREATE TEMP TABLE breakdowns AS {_breakdowns_sql()}")
 
-    remote_pct = con.execute("""
-        SELECT ROUND(100.0 * SUM(CASE WHEN is_remote THEN 1 ELSE 0 END) / COUNT(*), 1)
-        FROM 'data/silver/jobs_clean.parquet'
-    """).fetchone()[0]
+    total_jobs, total_clusters, remote_pct = con.execute("""
+        SELECT n, n_clusters, ROUND(100.0 * n_remote / n, 1) FROM breakdowns WHERE dim = 'total'
+    """).fetchone()
 
     # Tiebreakers estáveis (chave secundária ASC) em todos os ORDER BY —
     # sem isso o DuckDB reordena empates a cada execução e o CI commita
     # diffs de ruído (ordem) sem mudança real de dado.
     by_seniority = con.execute("""
-        SELECT seniority, COUNT(*) AS n, ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (), 1) AS pct
-        FROM 'data/silver/jobs_clean.parquet'
-        GROUP BY seniority ORDER BY n DESC, seniority ASC
+        SELECT seniority, n, ROUND(100.0 * n / SUM(n) OVER (), 1) AS pct
+        FROM breakdowns WHERE dim = 'senioridade'
+        ORDER BY n DESC, seniority ASC
     """).df().to_dict(orient="records")
 
     # Vínculo (CLT/PJ/Estágio/Temporário/não especificado) — dimensão nova,
     # viável com o campo estruturado das fontes ATS + inferência por texto.
     by_contract = con.execute("""
-        SELECT contract_type AS contrato, COUNT(*) AS n,
-               ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (), 1) AS pct
-        FROM 'data/silver/jobs_clean.parquet'
-        GROUP BY contract_type ORDER BY n DESC, contrato ASC
+        SELECT contract_type AS contrato, n, ROUND(100.0 * n / SUM(n) OVER (), 1) AS pct
+        FROM breakdowns WHERE dim = 'contrato'
+        ORDER BY n DESC, contrato ASC
     """).df().to_dict(orient="records")
 
     by_city = con.execute("""
-        SELECT city, state, COUNT(*) AS n
-        FROM 'data/silver/jobs_clean.parquet'
-        WHERE city IS NOT NULL AND city != ''
-        GROUP BY city, state ORDER BY n DESC, city ASC, state ASC LIMIT 12
+        SELECT city, state, n
+        FROM breakdowns
+        WHERE dim = 'cidade_uf' AND city IS NOT NULL AND city != ''
+        ORDER BY n DESC, city ASC, state ASC LIMIT 12
     """).df().to_dict(orient="records")
 
+    # skills_by_week conta clusters (a mesma vaga em duas fontes conta uma
+    # vez) — o denominador tem de estar na mesma unidade
     top_skills = con.execute("""
-        SELECT skill, n_jobs, ROUND(100.0 * n_jobs / (SELECT COUNT(*) FROM 'data/silver/jobs_clean.parquet'), 1) AS pct_of_jobs
+        SELECT skill, n_jobs, ROUND(100.0 * n_jobs / ?, 1) AS pct_of_jobs
         FROM 'data/silver/skills_by_week.parquet'
         WHERE iso_week = (SELECT MAX(iso_week) FROM 'data/silver/skills_by_week.parquet')
         ORDER BY n_jobs DESC, skill ASC LIMIT 24
-    """).df().to_dict(orient="records")
+    """, [total_clusters]).df().to_dict(orient="records")
 
     by_term = con.execute("""
-        SELECT _matched_term AS termo_busca, COUNT(*) AS n
-        FROM 'data/silver/jobs_clean.parquet'
-        GROUP BY _matched_term ORDER BY n DESC, termo_busca ASC
+        SELECT _matched_term AS termo_busca, n
+        FROM breakdowns WHERE dim = 'termo_busca'
+        ORDER BY n DESC, termo_busca ASC
     """).df().to_dict(orient="records")
 
     by_source = con.execute("""
-        SELECT source AS fonte, COUNT(*) AS n,
-               ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (), 1) AS pct
-        FROM 'data/silver/jobs_clean.parquet'
-        GROUP BY source ORDER BY n DESC, fonte ASC
+        SELECT source AS fonte, n, ROUND(100.0 * n / SUM(n) OVER (), 1) AS pct
+        FROM breakdowns WHERE dim = 'fonte'
+        ORDER BY n DESC, fonte ASC
     """).df().to_dict(orient="records")
 
     payload = {
@@ -100,12 +139,12 @@ def main() -> int:
 
     con.execute(f"""
         COPY (
-            SELECT 'senioridade' AS dim, seniority AS chave, n AS valor FROM (
-                SELECT seniority, COUNT(*) AS n FROM 'data/silver/jobs_clean.parquet' GROUP BY seniority
-            )
+            SELECT 'senioridade' AS dim, seniority AS chave, n AS valor
+            FROM breakdowns WHERE dim = 'senioridade'
             UNION ALL
-            SELECT 'cidade', city, COUNT(*) FROM 'data/silver/jobs_clean.parquet'
-                WHERE city IS NOT NULL AND city != '' GROUP BY city
+            SELECT 'cidade', city, n
+            FROM breakdowns WHERE dim = 'cidade' AND city IS NOT NULL AND city != ''
+            ORDER BY dim DESC, valor DESC, chave ASC
         )
         TO '{GOLD_DIR / "jobs_analysis.parquet"}' (FORMAT PARQUET)
     """)
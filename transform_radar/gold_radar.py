@@ -12,32 +12,77 @@ Universo de ferramentas = união das 14 monitoradas via GitHub topic
 = 16 ferramentas. Ferramentas sem menção nas vagas coletadas recebem
 job_score mínimo (0 menções é um dado real, não um erro).
 
+`skills_by_week` é lido uma única vez para uma tabela temporária, usada
+pelo score e pelo trending. No trending, `DENSE_RANK() OVER (ORDER BY
+iso_week DESC)` numera as semanas e cada janela (recente/anterior) sai de
+uma agregação condicional (`SUM … FILTER`) na mesma passada — conferido
+contra uma implementação de referência em pandas, para cada tamanho de
+histórico, em `tests/test_gold_radar.py`.
+
+O `direction` do trending (up/down) só é marcado quando a variação é
+significativa: IC de 95% do delta de share por bootstrap não paramétrico
+das vagas de cada janela (unidade = (semana, cluster_id), a mesma que
+`skills_by_week` conta), com semente fixa. Para o IC de uma ferramenta só
+importa, por vaga, o par (menções da ferramenta, menções totais) — e há
+poucos pares distintos. Reamostrar n vagas com reposição é, então, uma
+multinomial sobre esses pares: BOOTSTRAP_REPLICATES réplicas saem de um
+único `rng.multinomial` (réplica × ferramenta × par) e de dois `einsum`,
+sem loop por réplica (comparado à reamostragem ingênua em
+`tests/test_gold_radar.py`).
+
+Histórico: o score é calculado também para cada semana ISO já fechada
+(anterior à semana corrente) que ainda não está em `radar_history/` e é
+gravado como uma partição por semana — semanas passadas nunca são
+recalculadas (o job_score é o da própria semana; GitHub/PyPI, o último
+mês disponível no dia em que a semana fechou). Na primeira execução o
+histórico começa pela última semana fechada. `radar_history.json` é a
+série compacta por ferramenta (últimas SPARKLINE_WEEKS semanas) para os
+sparklines do frontend. As partições são write-once, então só UM workflow
+as grava (radar-jobs, que fecha o job_score da semana); o radar-signals
+recalcula os scores com `--no-history`.
+
+Uso:
+    python transform_radar/gold_radar.py                # scores + histórico
+    python transform_radar/gold_radar.py --no-history   # só scores/trending
+
 Saída:
     data/gold/radar_scores.parquet   + assets/data/radar_scores.json
     data/gold/trending.parquet       + assets/data/radar_trending.json
+    data/gold/radar_history/{iso_week}.parquet + assets/data/radar_history.json
 """
 
 from __future__ import annotations
 
+import argparse
 import json
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
-import duckdb
+import numpy as np
+import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent / "ingestion_radar"))
 from catalog import SKILL_TO_TOOL, TOOL_CATEGORY  # noqa: E402
+from common.duckdb_profile import connect  # noqa: E402
+from common.quality import enforce, in_range, not_null, references, run_suite, unique  # noqa: E402
 
 GOLD_DIR = Path("data/gold")
 FRONTEND_DIR = Path("assets/data")
-
-
-def main() -> int:
-    con = duckdb.connect()
-    GOLD_DIR.mkdir(parents=True, exist_ok=True)
-    FRONTEND_DIR.mkdir(parents=True, exist_ok=True)
-
+SKILLS_BY_WEEK = Path("data/silver/skills_by_week.parquet")
+JOBS_CLEAN = Path("data/silver/jobs_clean.parquet")
+HISTORY_DIR = GOLD_DIR / "radar_history"
+# Semanas na série do sparkline (radar_history.json)
+SPARKLINE_WEEKS = 26
+# Bootstrap do delta de share do trending
+BOOTSTRAP_REPLICATES = 2000
+BOOTSTRAP_SEED = 42
+CI_LEVEL = 0.95
+
+
+def _load_dims(con) -> None:
+    """Tabelas temporárias `tools`, `skill_map` e `skills_by_week` (lida uma vez)."""
     tools_sql = ", ".join(f"('{t}', '{cat}')" for t, cat in TOOL_CATEGORY.items())
     skill_map_sql = ", ".join(f"('{s}', '{t}')" for s, t in SKILL_TO_TOOL.items())
 
@@ -47,19 +92,191 @@ def main() -> int:
 
         CREATE TEMP TABLE skill_map AS
             SELECT * FROM (VALUES {skill_map_sql}) AS m(skill, tool);
+
+        CREATE TEMP TABLE skills_by_week AS
+            SELECT iso_week, skill, n_jobs FROM read_parquet('{SKILLS_BY_WEEK}');
     """)
 
-    # ── Sinal 1: jobs (semana mais recente disponível) ──────────────────
+
+def _history_weeks_to_append(con) -> list[str]:
+    """Semanas ISO fechadas (anteriores à corrente) ainda fora do histórico —
+    só as posteriores à última gravada; sem histórico, só a última fechada."""
+    iso_year, iso_week, _ = datetime.now(timezone.utc).isocalendar()
+    current = f"{iso_year}-W{iso_week:02d}"
+    closed = [w for (w,) in con.execute(
+        "SELECT DISTINCT iso_week FROM skills_by_week WHERE iso_week < ? ORDER BY iso_week",
+        [current]).fetchall()]
+    stored = sorted(f.stem for f in HISTORY_DIR.glob("*.parquet"))
+    if stored:
+        return [w for w in closed if w > stored[-1]]
+    return closed[-1:]
+
+
+def _write_sparklines(con) -> int:
+    """radar_history.json — série compacta por ferramenta a partir das partições."""
+    payload = {"gerado_em": datetime.now(timezone.utc).isoformat(), "semanas": [], "tools": []}
+    if any(HISTORY_DIR.glob("*.parquet")):
+        history = con.execute(f"""
+            WITH h AS (
+                SELECT * FROM read_parquet('{HISTORY_DIR}/*.parquet')
+                QUALIFY DENSE_RANK() OVER (ORDER BY iso_week DESC) <= {SPARKLINE_WEEKS}
+            )
+            SELECT iso_week, tool, category, total_score, quadrant FROM h
+            ORDER BY tool, iso_week
+        """).df()
+        weeks = sorted(history["iso_week"].unique())
+        categories = history.drop_duplicates("tool").set_index("tool")["category"]
+        scores = history.pivot(index="tool", columns="iso_week", values="total_score")
+        quadrants = history.pivot(index="tool", columns="iso_week", values="quadrant")
+        payload["semanas"] = weeks
+        payload["tools"] = [
+            {
+                "tool": tool,
+                "category": categories[tool],
+                "total_score": [None if pd.isna(v) else float(v) for v in scores.loc[tool, weeks]],
+                "quadrant": [None if pd.isna(q) else q for q in quadrants.loc[tool, weeks]],
+            }
+            for tool in scores.index
+        ]
+    out = FRONTEND_DIR / "radar_history.json"
+    out.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"  ✓ {out} ({len(payload['semanas'])} semana(s))")
+    return len(payload["semanas"])
+
+
+def _trending_window(weeks_available: int) -> tuple[int, str, str]:
+    """(semanas por janela, mode, rótulo) — janela adaptativa do trending."""
+    if weeks_available >= 8:
+        return 4, "media_4s", "4 semanas recentes vs. 4 anteriores"
+    if weeks_available >= 2:
+        return 1, "semana", "semana mais recente vs. semana anterior"
+    return 0, "insuficiente", "acumulando histórico"
+
+
+def _trending_shares(con, span: int) -> pd.DataFrame:
+    """Menções e share (%) por ferramenta nas `span` semanas mais recentes e
+    nas `span` anteriores — uma passada sobre `skills_by_week`."""
+    return con.execute(f"""
+        WITH ranked AS (
+            SELECT skill, n_jobs, DENSE_RANK() OVER (ORDER BY iso_week DESC) AS week_rank
+            FROM skills_by_week
+        ),
+        per_tool AS (
+            SELECT
+                sm.tool,
+                COALESCE(SUM(sw.n_jobs) FILTER (WHERE sw.week_rank <= {span}), 0) AS m_recent,
+                COALESCE(SUM(sw.n_jobs) FILTER (WHERE sw.week_rank > {span}
+                                                  AND sw.week_rank <= {2 * span}), 0) AS m_prior
+            FROM skill_map sm
+            LEFT JOIN ranked sw ON sw.skill = sm.skill
+            GROUP BY sm.tool
+        ),
+        tot AS (
+            SELECT *, SUM(m_recent) OVER () AS r, SUM(m_prior) OVER () AS p FROM per_tool
+        )
+        SELECT
+            t.tool,
+            COALESCE(tot.m_recent, 0) AS mentions_recent,
+            COALESCE(tot.m_prior, 0) AS mentions_prior,
+            ROUND(100.0 * COALESCE(tot.m_recent, 0) / NULLIF(MAX(tot.r) OVER (), 0), 1) AS share_recent_pct,
+            ROUND(100.0 * COALESCE(tot.m_prior, 0) / NULLIF(MAX(tot.p) OVER (), 0), 1) AS share_prior_pct
+        FROM tools t
+        LEFT JOIN tot ON tot.tool = t.tool
+    """).df()
+
+
+def _window_units(con, span: int) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    """Matrizes vaga × ferramenta (nº de skills da ferramenta na vaga) das
+    janelas recente e anterior. Só entram vagas com alguma menção do radar."""
+    units = con.execute(f"""
+        WITH weeks AS (
+            SELECT iso_week, DENSE_RANK() OVER (ORDER BY iso_week DESC) AS week_rank
+            FROM (SELECT DISTINCT iso_week FROM skills_by_week)
+        ),
+        unit_skills AS (
+            SELECT DISTINCT _iso_week AS iso_week, cluster_id, unnest(skills) AS skill
+            FROM read_parquet('{JOBS_CLEAN}')
+        )
+        SELECT w.week_rank <= {span} AS recent, u.iso_week, u.cluster_id, sm.tool, COUNT(*) AS m
+        FROM unit_skills u
+        JOIN weeks w ON w.iso_week = u.iso_week AND w.week_rank <= {2 * span}
+        JOIN skill_map sm ON sm.skill = u.skill
+        GROUP BY ALL
+    """).df()
+    tools = sorted(set(SKILL_TO_TOOL.values()))
+    if units.empty:
+        empty = np.zeros((0, len(tools)), dtype=np.int64)
+        return empty, empty, tools
+    matrix = units.pivot_table(index=["recent", "iso_week", "cluster_id"], columns="tool",
+                               values="m", aggfunc="sum", fill_value=0)
+    matrix = matrix.reindex(columns=tools, fill_value=0)
+    recent = matrix.index.get_level_values("recent").to_numpy(dtype=bool)
+    values = matrix.to_numpy(dtype=np.int64)
+    return values[recent], values[~recent], tools
+
+
+def _bootstrap_shares(units: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Réplicas bootstrap (réplica × ferramenta) do share (%) de cada ferramenta."""
+    n, n_tools = units.shape
+    if n == 0:
+        return np.full((BOOTSTRAP_REPLICATES, n_tools), np.nan)
+    total = units.sum(axis=1)
+    base = total.max() + 1
+    # pares distintos (menções da ferramenta, menções totais) por ferramenta
+    pairs = [np.unique(units[:, t] * base + total, return_counts=True) for t in range(n_tools)]
+    width = max(len(keys) for keys, _ in pairs)
+    pvals, mentions, totals = (np.zeros((n_tools, width)) for _ in range(3))
+    for t, (keys, counts) in enumerate(pairs):
+        pvals[t, :len(keys)] = counts / n
+        mentions[t, :len(keys)] = keys // base
+        totals[t, :len(keys)] = keys % base
+    draws = rng.multinomial(n, pvals, size=(BOOTSTRAP_REPLICATES, n_tools))
+    # toda vaga da matriz tem ao menos uma menção → denominador > 0
+    return (100.0 * np.einsum("btk,tk->bt", draws, mentions)
+            / np.einsum("btk,tk->bt", draws, totals))
+
+
+def _bootstrap_delta_ci(recent: np.ndarray, prior: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """IC (CI_LEVEL) do delta de share, em pp, por ferramenta."""
+    rng = np.random.default_rng(BOOTSTRAP_SEED)
+    delta = _bootstrap_shares(recent, rng) - _bootstrap_shares(prior, rng)
+    alpha = (1 - CI_LEVEL) / 2
+    low, high = np.quantile(delta, [alpha, 1 - alpha], axis=0)
+    return low, high
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Gold do radar (scores, trending, histórico)")
+    parser.add_argument("--no-history", action="store_true",
+                        help="não grava partições de radar_history/ nem radar_history.json")
+    args = parser.parse_args(argv)
+
+    con = connect()
+    GOLD_DIR.mkdir(parents=True, exist_ok=True)
+    FRONTEND_DIR.mkdir(parents=True, exist_ok=True)
+
+    _load_dims(con)
+
+    # ── Sinal 1: jobs — semana mais recente + semanas fechadas novas ────
+    history_weeks = [] if args.no_history else _history_weeks_to_append(con)
     con.execute("""
         CREATE TEMP TABLE latest_week AS
-            SELECT MAX(iso_week) AS w FROM read_parquet('data/silver/skills_by_week.parquet');
-
+            SELECT MAX(iso_week) AS w FROM skills_by_week;
+    """)
+    con.execute("""
+        CREATE TEMP TABLE score_weeks AS
+            SELECT w AS iso_week FROM latest_week
+            UNION
+            SELECT unnest(?::VARCHAR[]);
+    """, [history_weeks])
+    con.execute("""
         CREATE TEMP TABLE job_signal AS
-            SELECT sm.tool, COALESCE(SUM(sw.n_jobs), 0) AS job_mentions
-            FROM skill_map sm
-            LEFT JOIN read_parquet('data/silver/skills_by_week.parquet') sw
-                ON sw.skill = sm.skill AND sw.iso_week = (SELECT w FROM latest_week)
-            GROUP BY sm.tool;
+            SELECT wk.iso_week, sm.tool, COALESCE(SUM(sw.n_jobs), 0) AS job_mentions
+            FROM score_weeks wk
+            CROSS JOIN skill_map sm
+            LEFT JOIN skills_by_week sw
+                ON sw.skill = sm.skill AND sw.iso_week = wk.iso_week
+            GROUP BY wk.iso_week, sm.tool;
     """)
 
     # ── Sinal 2: GitHub (mês mais recente disponível) ───────────────────
@@ -90,25 +307,28 @@ def main() -> int:
     con.execute("""
         CREATE TEMP TABLE combined AS
             SELECT
+                wk.iso_week,
                 t.tool,
                 t.category,
                 COALESCE(j.job_mentions, 0) AS job_mentions,
                 COALESCE(g.new_repos_ytd, 0) AS new_repos_ytd,
                 COALESCE(p.downloads_last_month, 0) AS downloads_last_month
-            FROM tools t
-            LEFT JOIN job_signal j ON j.tool = t.tool
+            FROM score_weeks wk
+            CROSS JOIN tools t
+            LEFT JOIN job_signal j ON j.tool = t.tool AND j.iso_week IS NOT DISTINCT FROM wk.iso_week
             LEFT JOIN github_signal g ON g.tool = t.tool
             LEFT JOIN pypi_signal p ON p.tool = t.tool;
 
         CREATE TEMP TABLE ranked AS
             SELECT
-                tool, category, job_mentions, new_repos_ytd, downloads_last_month,
-                ROUND(PERCENT_RANK() OVER (ORDER BY job_mentions) * 100, 1) AS job_score,
-                ROUND(PERCENT_RANK() OVER (ORDER BY new_repos_ytd) * 100, 1) AS github_score,
-                ROUND(PERCENT_RANK() OVER (ORDER BY downloads_last_month) * 100, 1) AS pypi_score
-            FROM combined;
-
-        CREATE TEMP TABLE scored AS
+                iso_week, tool, category, job_mentions, new_repos_ytd, downloads_last_month,
+                ROUND(PERCENT_RANK() OVER (w ORDER BY job_mentions) * 100, 1) AS job_score,
+                ROUND(PERCENT_RANK() OVER (w ORDER BY new_repos_ytd) * 100, 1) AS github_score,
+                ROUND(PERCENT_RANK() OVER (w ORDER BY downloads_last_month) * 100, 1) AS pypi_score
+            FROM combined
+            WINDOW w AS (PARTITION BY iso_week);
+
+        CREATE TEMP TABLE scored_weeks AS
             SELECT
                 *,
                 ROUND(job_score * 0.5 + github_score * 0.25 + pypi_score * 0.25, 1) AS total_score,
@@ -119,10 +339,26 @@ def main() -> int:
                     ELSE 'Hold'
                 END AS quadrant
             FROM ranked;
+
+        CREATE TEMP TABLE scored AS
+            SELECT * EXCLUDE (iso_week) FROM scored_weeks
+            WHERE iso_week IS NOT DISTINCT FROM (SELECT w FROM latest_week);
     """)
 
     n_tools = con.execute("SELECT COUNT(*) FROM scored").fetchone()[0]
 
+    # ── Histórico: uma partição por semana fechada, gravada uma única vez ─
+    if args.no_history:
+        print(f"  ↳ --no-history: {HISTORY_DIR}/ não é tocado nesta execução")
+    else:
+        HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+        for week in history_weeks:
+            con.execute(f"""
+                COPY (SELECT * FROM scored_weeks WHERE iso_week = '{week}' ORDER BY tool)
+                TO '{HISTORY_DIR / f"{week}.parquet"}' (FORMAT PARQUET)
+            """)
+        print(f"  ✓ {HISTORY_DIR}/ — {len(history_weeks)} semana(s) nova(s) no histórico")
+
     con.execute(f"""
         COPY (SELECT * FROM scored ORDER BY total_score DESC)
         TO '{GOLD_DIR / "radar_scores.parquet"}' (FORMAT PARQUET)
@@ -164,62 +400,33 @@ def main() -> int:
     #   >= 8 semanas → média das 4 semanas recentes vs. 4 anteriores (suave)
     #   >= 2 semanas → semana mais recente vs. semana anterior (janela curta)
     #    < 2 semanas → insuficiente (sem número)
-    weeks = [r[0] for r in con.execute("""
-        SELECT DISTINCT iso_week FROM read_parquet('data/silver/skills_by_week.parquet')
-        ORDER BY iso_week DESC
-    """).fetchall()]
-    weeks_available = len(weeks)
-
-    def _weeks_sql(ws: list[str]) -> str:
-        return ", ".join("'" + w.replace("'", "''") + "'" for w in ws)
-
-    if weeks_available >= 8:
-        recent_weeks, prior_weeks = weeks[0:4], weeks[4:8]
-        mode, window_label = "media_4s", "4 semanas recentes vs. 4 anteriores"
-    elif weeks_available >= 2:
-        recent_weeks, prior_weeks = weeks[0:1], weeks[1:2]
-        mode, window_label = "semana", "semana mais recente vs. semana anterior"
-    else:
-        recent_weeks, prior_weeks = [], []
-        mode, window_label = "insuficiente", "acumulando histórico"
-
+    weeks_available = con.execute(
+        "SELECT COUNT(DISTINCT iso_week) FROM skills_by_week").fetchone()[0]
+    span, mode, window_label = _trending_window(weeks_available)
     insufficient_history = mode == "insuficiente"
 
     if not insufficient_history:
-        trending_df = con.execute(f"""
-            WITH recent_m AS (
-                SELECT sm.tool, COALESCE(SUM(sw.n_jobs), 0) AS m
-                FROM skill_map sm
-                LEFT JOIN read_parquet('data/silver/skills_by_week.parquet') sw
-                    ON sw.skill = sm.skill AND sw.iso_week IN ({_weeks_sql(recent_weeks)})
-                GROUP BY sm.tool
-            ),
-            prior_m AS (
-                SELECT sm.tool, COALESCE(SUM(sw.n_jobs), 0) AS m
-                FROM skill_map sm
-                LEFT JOIN read_parquet('data/silver/skills_by_week.parquet') sw
-                    ON sw.skill = sm.skill AND sw.iso_week IN ({_weeks_sql(prior_weeks)})
-                GROUP BY sm.tool
-            ),
-            tot AS (
-                SELECT (SELECT SUM(m) FROM recent_m) AS r, (SELECT SUM(m) FROM prior_m) AS p
-            )
-            SELECT
-                t.tool,
-                COALESCE(rm.m, 0) AS mentions_recent,
-                COALESCE(pm.m, 0) AS mentions_prior,
-                ROUND(100.0 * COALESCE(rm.m, 0) / NULLIF((SELECT r FROM tot), 0), 1) AS share_recent_pct,
-                ROUND(100.0 * COALESCE(pm.m, 0) / NULLIF((SELECT p FROM tot), 0), 1) AS share_prior_pct
-            FROM tools t
-            LEFT JOIN recent_m rm ON rm.tool = t.tool
-            LEFT JOIN prior_m pm ON pm.tool = t.tool
-        """).df()
+        trending_df = _trending_shares(con, span)
         trending_df["share_recent_pct"] = trending_df["share_recent_pct"].fillna(0.0)
         trending_df["share_prior_pct"] = trending_df["share_prior_pct"].fillna(0.0)
         trending_df["delta_pp"] = (trending_df["share_recent_pct"] - trending_df["share_prior_pct"]).round(1)
-        trending_df["direction"] = trending_df["delta_pp"].apply(
-            lambda d: "up" if d > 0.1 else ("down" if d < -0.1 else "flat")
-        )
+
+        units_recent, units_prior, unit_tools = _window_units(con, span)
+        low, high = _bootstrap_delta_ci(units_recent, units_prior)
+        ci = pd.DataFrame({
+            "tool": unit_tools,
+            "ci_low_pp": np.round(low, 1),
+            "ci_high_pp": np.round(high, 1),
+            "significant": (low > 0) | (high < 0),
+        })
+        trending_df = trending_df.merge(ci, on="tool", how="left")
+        # ferramenta fora da taxonomia de vagas: share 0 nas duas janelas
+        trending_df[["ci_low_pp", "ci_high_pp"]] = trending_df[["ci_low_pp", "ci_high_pp"]].fillna(0.0)
+        trending_df["significant"] = trending_df["significant"].fillna(False).astype(bool)
+        trending_df["direction"] = [
+            "up" if sig and d > 0.1 else ("down" if sig and d < -0.1 else "flat")
+            for d, sig in zip(trending_df["delta_pp"], trending_df["significant"])
+        ]
         # ordena por maior movimento (risers no topo, fallers no fim), com
         # tiebreaker estável por tool para não gerar diff de ruído no CI
         trending_df = trending_df.sort_values(
@@ -228,8 +435,9 @@ def main() -> int:
     else:
         trending_df = con.execute("SELECT tool FROM tools ORDER BY tool").df()
         for col in ("mentions_recent", "mentions_prior", "share_recent_pct",
-                    "share_prior_pct", "delta_pp"):
+                    "share_prior_pct", "delta_pp", "ci_low_pp", "ci_high_pp"):
             trending_df[col] = None
+        trending_df["significant"] = False
         trending_df["direction"] = "flat"
 
     con.execute(f"""
@@ -251,7 +459,10 @@ def main() -> int:
             f"Variação da fatia (share, em pontos percentuais) de cada ferramenta "
             f"nas menções de vaga do universo do radar: {window_label}. Share "
             f"(não contagem) para ser robusto à entrada de novas fontes. A partir "
-            f"de 8 semanas, a janela passa a usar a média de 4 semanas (mais suave)."
+            f"de 8 semanas, a janela passa a usar a média de 4 semanas (mais suave). "
+            f"ci_low_pp/ci_high_pp: IC de {CI_LEVEL:.0%} do delta por bootstrap das "
+            f"vagas ({BOOTSTRAP_REPLICATES} réplicas); direction só é up/down quando "
+            f"o IC não contém zero (significant)."
         ),
         "weeks_available": int(weeks_available),
         "tools": trending_df.to_dict(orient="records"),
@@ -261,7 +472,20 @@ def main() -> int:
     )
     print(f"  ✓ {FRONTEND_DIR / 'radar_trending.json'}")
 
+    results = run_suite(con, "gold.radar_scores", f"read_parquet('{GOLD_DIR / 'radar_scores.parquet'}')", [
+        unique("tool"), not_null("quadrant"), references("tool", "tools"),
+        in_range("total_score", 0, 100), in_range("job_score", 0, 100),
+    ])
+    results += run_suite(con, "gold.trending", f"read_parquet('{GOLD_DIR / 'trending.parquet'}')", [
+        unique("tool"), references("tool", "tools"), not_null("direction"), not_null("significant"),
+    ])
+    if not args.no_history and _write_sparklines(con):
+        results += run_suite(con, "gold.radar_history", f"read_parquet('{HISTORY_DIR}/*.parquet')", [
+            unique("iso_week", "tool"), not_null("quadrant"), references("tool", "tools"),
+            in_range("total_score", 0, 100),
+        ])
     con.close()
+    enforce(results)
     return 0
 
 
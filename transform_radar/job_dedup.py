@@ -0,0 +1,233 @@
+"""
+Data Stack Radar BR — Detecção de vagas quase-duplicadas (MinHash + LSH)
+=========================================================================
+A mesma vaga costuma aparecer em mais de uma fonte (Gupy + ATS da própria
+empresa + issues dos repositórios da API BR) com ids diferentes — o dedup
+por id do silver não a pega, e ela conta em dobro em `skills_by_week` e
+nas co-ocorrências. Este módulo agrupa essas cópias num `cluster_id`:
+
+  1. Assinatura: texto normalizado (título + empresa + descrição, sem
+     acento/caixa/pontuação, até MAX_TOKENS palavras) → shingles de
+     SHINGLE_SIZE palavras → MinHash com NUM_PERM permutações (hash
+     universal multiply-shift em uint64, vetorizado em NumPy sobre todos
+     os shingles de um bloco de vagas de uma vez).
+  2. Candidatos: LSH por bandas (BANDS × ROWS linhas da assinatura). Vagas
+     com uma banda idêntica caem no mesmo balde — só pares dentro do balde
+     (todos eles, já restritos a fontes diferentes) são comparados, sem o
+     produto cartesiano O(n²).
+  3. Confirmação: o par vira aresta se a fração de posições iguais das
+     assinaturas (estimativa da similaridade de Jaccard) ≥ SIM_THRESHOLD
+     E os títulos são parecidos (Jaccard das palavras ≥ TITLE_THRESHOLD, com
+     os mesmos números) — empresas usam o mesmo texto-modelo para vagas
+     diferentes ("Analista de Dados" e "MLOps" com a mesma descrição não são
+     a mesma vaga; "Temporária 6 meses" e "8 meses" também não).
+  4. Bloqueio: só se ligam vagas com a mesma chave de bloco (`block_keys`:
+     senioridade + local — "remoto" ou a cidade normalizada) e de FONTES
+     diferentes. O texto-modelo se repete entre níveis (Pleno × Sênior,
+     PL × JR) e entre as aberturas de cidades diferentes (RJ/SP/NE) — são
+     vagas distintas; e dentro de uma fonte o id já identifica a vaga
+     (duas publicações com ids diferentes são duas aberturas). Com chave
+     igual exigida em toda aresta, os componentes conexos (propagação de
+     rótulo em NumPy) nunca misturam blocos.
+
+`cluster_id` = menor id de vaga do cluster (estável, independe da ordem de
+entrada); vaga sem par fica com o próprio id.
+
+Uso (como módulo):
+    from job_dedup import cluster_ids, minhash_signatures
+    sigs = minhash_signatures(titles, companies, descriptions)
+    blocks = block_keys(seniorities, cities, is_remote)
+    clusters = cluster_ids(ids, sigs, titles, blocks, sources)
+
+Pares conhecidos do bronze e duplicatas plantadas: `tests/test_job_dedup.py`.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+import zlib
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+NUM_PERM = 64          # tamanho da assinatura MinHash
+BANDS = 16             # LSH: BANDS × ROWS = NUM_PERM
+ROWS = 4
+SIM_THRESHOLD = 0.7    # Jaccard estimado mínimo para considerar duplicata
+TITLE_THRESHOLD = 0.75 # Jaccard mínimo entre as palavras dos títulos
+SHINGLE_SIZE = 3       # shingles de 3 palavras
+MAX_TOKENS = 400       # palavras por vaga consideradas (descrições longas)
+SIG_CHUNK = 10_000     # vagas por bloco vetorizado (limita memória)
+SEED = 20260701        # permutações fixas → assinaturas estáveis entre execuções
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_EMPTY = np.iinfo(np.uint32).max
+
+_rng = np.random.default_rng(SEED)
+_PERM_A = _rng.integers(1, 2**63, size=NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_PERM_B = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64)
+_SHINGLE_MULT = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 1], dtype=np.uint64)
+_BAND_MULT = _rng.integers(1, 2**63, size=ROWS, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_BLOCK_MULT = np.uint64(0xD6E8FEB86659FD93)
+
+
+def _normalize(text: str) -> str:
+    # NFKD separa o acento da letra; o encode ASCII descarta o acento
+    return unicodedata.normalize("NFKD", text.lower()).encode("ascii", "ignore").decode("ascii")
+
+
+def _chunk_signatures(texts: list[str]) -> np.ndarray:
+    """MinHash de um bloco de vagas — um passe NumPy por permutação sobre
+    os shingles do bloco inteiro."""
+    sigs = np.full((len(texts), NUM_PERM), _EMPTY, dtype=np.uint32)
+    docs = [_TOKEN.findall(_normalize(text))[:MAX_TOKENS] for text in texts]
+    # vaga curta é completada com "" até formar 1 shingle; vaga vazia fica de fora
+    docs = [d + [""] * (SHINGLE_SIZE - len(d)) if 0 < len(d) < SHINGLE_SIZE else d for d in docs]
+    lengths = np.array([len(d) for d in docs], dtype=np.int64)
+    has_text = lengths > 0
+    if not has_text.any():
+        return sigs
+
+    # token → hash: crc32 só uma vez por palavra distinta do bloco
+    codes, uniques = pd.factorize(np.array(list(chain.from_iterable(docs)), dtype=object))
+    vocab = np.fromiter((zlib.crc32(u.encode("utf-8")) for u in uniques),
+                        dtype=np.uint64, count=len(uniques))
+    flat = vocab[codes] + np.uint64(1)
+
+    lengths = lengths[has_text]
+    n_shingles = lengths - SHINGLE_SIZE + 1
+    starts = np.cumsum(lengths) - lengths
+
+    # shingle k do texto = combinação das palavras k..k+2 (aritmética uint64 com overflow)
+    k = np.arange(len(flat) - SHINGLE_SIZE + 1)
+    shingles = np.zeros(len(k), dtype=np.uint64)
+    for j in range(SHINGLE_SIZE):
+        shingles += flat[k + j] * _SHINGLE_MULT[j]
+    # só shingles que não atravessam a fronteira entre duas vagas
+    seg_starts = np.cumsum(n_shingles) - n_shingles
+    valid = np.arange(int(n_shingles.sum())) + np.repeat(starts - seg_starts, n_shingles)
+    shingles = shingles[valid]
+
+    rows = np.flatnonzero(has_text)
+    for p in range(NUM_PERM):
+        hashed = ((shingles * _PERM_A[p] + _PERM_B[p]) >> np.uint64(32)).astype(np.uint32)
+        sigs[rows, p] = np.minimum.reduceat(hashed, seg_starts)
+    return sigs
+
+
+def minhash_signatures(titles, companies, descriptions) -> np.ndarray:
+    """Assinaturas MinHash (n × NUM_PERM, uint32) de título + empresa +
+    descrição. Vaga sem texto nenhum recebe a assinatura vazia (nunca casa)."""
+    texts = [f"{t or ''} {c or ''} {d or ''}" for t, c, d in zip(titles, companies, descriptions)]
+    blocks = [_chunk_signatures(texts[i:i + SIG_CHUNK]) for i in range(0, len(texts), SIG_CHUNK)]
+    return np.concatenate(blocks) if blocks else np.empty((0, NUM_PERM), dtype=np.uint32)
+
+
+def _candidate_pairs(sigs: np.ndarray, block_codes: np.ndarray,
+                     source_codes: np.ndarray) -> np.ndarray:
+    """Pares (i, j) do mesmo bloco e de fontes diferentes que compartilham ao
+    menos uma banda LSH — TODOS os pares de cada balde, não uma estrela em
+    volta do primeiro membro: com texto-modelo, o primeiro pode ser outra
+    vaga da mesma empresa (mesma fonte, outro título) e a estrela perderia o
+    par real entre os demais. O bloco entra na chave do balde; os pares saem
+    por deslocamento d dentro do balde ordenado (um passe por d, até o
+    tamanho do maior balde)."""
+    usable = np.flatnonzero((sigs != _EMPTY).any(axis=1))
+    bands = sigs[usable].reshape(len(usable), BANDS, ROWS).astype(np.uint64)
+    salt = block_codes[usable].astype(np.uint64) * _BLOCK_MULT
+    sources = source_codes[usable]
+    pairs = []
+    for b in range(BANDS):
+        keys = (bands[:, b, :] * _BAND_MULT).sum(axis=1) + salt
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        d = 1
+        while d < len(order):
+            same = sorted_keys[d:] == sorted_keys[:-d]
+            if not same.any():
+                break                       # nenhum balde com mais de d membros
+            left, right = order[:-d][same], order[d:][same]
+            keep = sources[left] != sources[right]
+            pairs.append(np.stack([usable[left[keep]], usable[right[keep]]], axis=1))
+            d += 1
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(pairs), axis=1)
+    return np.unique(pairs, axis=0)
+
+
+def _components(n: int, edges: np.ndarray) -> np.ndarray:
+    """Rótulo de componente conexo por vaga (menor índice do componente)."""
+    labels = np.arange(n)
+    if len(edges) == 0:
+        return labels
+    i, j = edges[:, 0], edges[:, 1]
+    while True:
+        low = np.minimum(labels[i], labels[j])
+        updated = labels.copy()
+        np.minimum.at(updated, i, low)
+        np.minimum.at(updated, j, low)
+        updated = updated[updated]          # pointer jumping
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def _title_similar(titles, pairs: np.ndarray) -> np.ndarray:
+    words = {}
+    for i in np.unique(pairs):
+        title = titles[i] if isinstance(titles[i], str) else ""
+        words[i] = set(_TOKEN.findall(_normalize(title)))
+
+    def similar(a: set, b: set) -> bool:
+        if {w for w in a if w.isdigit()} != {w for w in b if w.isdigit()}:
+            return False
+        return (len(a & b) / len(a | b) if a or b else 1.0) >= TITLE_THRESHOLD
+
+    return np.fromiter((similar(words[i], words[j]) for i, j in pairs),
+                       dtype=bool, count=len(pairs))
+
+
+def block_keys(seniorities, cities, is_remote) -> np.ndarray:
+    """Chave de bloco por vaga: senioridade + local ("remoto" ou a cidade
+    sem acento/UF — "São Paulo" e "São Paulo, SP" caem juntas)."""
+    keys = []
+    for seniority, city, remote in zip(seniorities, cities, is_remote):
+        if pd.notna(remote) and bool(remote):
+            place = "remoto"
+        else:
+            place = " ".join(_TOKEN.findall(_normalize(re.split(r"[,/(-]", city or "")[0])))
+        keys.append(f"{seniority or ''}|{place}")
+    return np.array(keys, dtype=object)
+
+
+def cluster_ids(ids, sigs: np.ndarray, titles, blocks=None, sources=None) -> np.ndarray:
+    """`cluster_id` por vaga: menor id entre as quase-duplicatas dela. Com
+    `blocks` (ver `block_keys`), só vagas da mesma chave se agrupam; com
+    `sources`, só vagas de fontes diferentes."""
+    ids = np.asarray(ids, dtype=object)
+    titles = list(titles)
+    codes = (pd.factorize(np.asarray(blocks, dtype=object))[0] if blocks is not None
+             else np.zeros(len(ids), dtype=np.int64))
+    # sem `sources`, cada vaga é sua própria "fonte" (qualquer par vale)
+    source_codes = (pd.factorize(np.asarray(sources, dtype=object))[0] if sources is not None
+                    else np.arange(len(ids)))
+    pairs = _candidate_pairs(sigs, codes, source_codes)
+    if len(pairs):
+        # colisão de hash entre blocos é improvável, mas a aresta exige o mesmo bloco
+        pairs = pairs[codes[pairs[:, 0]] == codes[pairs[:, 1]]]
+    if len(pairs):
+        similarity = (sigs[pairs[:, 0]] == sigs[pairs[:, 1]]).mean(axis=1)
+        pairs = pairs[similarity >= SIM_THRESHOLD]
+    if len(pairs):
+        pairs = pairs[_title_similar(titles, pairs)]
+    labels = _components(len(ids), pairs)
+
+    # menor id (ordem de string) de cada componente
+    order = np.lexsort((ids.astype(str), labels))
+    first = np.concatenate([[True], labels[order][1:] != labels[order][:-1]])
+    canonical = dict(zip(labels[order][first], ids[order][first]))
+    return np.array([canonical[label] for label in labels], dtype=object)
+
@@ -13,33 +13,84 @@ linha por vaga × skill mencionada), agregada por semana ISO.
 é a mesma métrica (menções de skill em vaga aberta), só que agora vinda
 de mais de um lugar. Não altera pesos nem metodologia do score.
 
-A extração de skills é feita em Python (regex — não é uma agregação),
-mas todo o GROUP BY/aggregation final roda em DuckDB, conforme constraint
-do projeto.
+A extração de skills é colunar (`extract_skills_batch`: pré-filtro de
+literais em kernels Arrow, regex só nas vagas candidatas — não é uma
+agregação), e todo o GROUP BY/aggregation final roda em DuckDB, conforme
+constraint do projeto.
+
+Build incremental: `data/silver/jobs_manifest.json` guarda o hash de cada
+arquivo bronze já incorporado. Cada execução processa só os arquivos novos
+e faz upsert nas partições semanais `data/silver/jobs_by_week/{semana}.parquet`
+(só as semanas afetadas são regravadas); os consolidados abaixo saem das
+partições via DuckDB. Snapshot reescrito (coleta refeita na mesma semana)
+→ as linhas daquela fonte×semana saem das partições e são refeitas a partir
+do bronze da fonte (vaga que sumiu do snapshot volta à última semana em que
+foi vista). Snapshot removido, mudança de taxonomia/catálogo/código ou
+`--full` → rebuild completo.
+
+Dedup entre fontes: cada vaga leva uma assinatura MinHash na partição, e a
+consolidação agrupa quase-duplicatas (mesma vaga no Gupy, no ATS da
+empresa, nas issues da API BR) via LSH em `cluster_id` (`job_dedup.py`;
+só liga fontes diferentes com mesma senioridade e local) — `skills_by_week`
+conta clusters distintos, não linhas.
+
+Snapshots Gupy recentes trazem vagas já conhecidas em forma enxuta (sem
+descrição, com `_snapshot` apontando o arquivo do registro completo — ver
+o ledger em `collect_jobs.py`); `_resolve_gupy_snapshots` remonta a linha.
+Nos ATS, board inalterado vem como uma linha marcadora `_unchanged_from`
+que `_read_ats_snapshot` expande a partir do snapshot anterior.
+
+O enriquecimento de texto (skills, senioridade, contrato, salário) roda em
+lotes Arrow num pool de processos (RADAR_ENRICH_WORKERS, default = nº de
+CPUs), com a saída na ordem da entrada.
+
+Uso:
+    python transform_radar/silver_jobs.py          # incremental
+    python transform_radar/silver_jobs.py --full   # reconstrói tudo
 
 Saída:
+    data/silver/jobs_by_week/*.parquet   — partições semanais (com _ingest_ts)
+    data/silver/jobs_manifest.json       — arquivos bronze já incorporados
     data/silver/skills_by_week.parquet   — (iso_week, skill, n_jobs)
+    data/silver/skills_cache.parquet     — hash do texto → skills (memo da
+                                            extração, por versão da taxonomia)
     data/silver/jobs_clean.parquet       — vagas deduplicadas e tipadas,
                                             com seniority/city/remote/source
-                                            (usado na análise de vagas)
+                                            e cluster_id (usado na análise de vagas)
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-import duckdb
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent / "ingestion_radar"))
-from skills_extractor import extract_skills_row  # noqa: E402
+from skills_extractor import TAXONOMY_VERSION, extract_skills_batch, job_texts  # noqa: E402
+from job_dedup import NUM_PERM, block_keys, cluster_ids, minhash_signatures  # noqa: E402
 from catalog import (  # noqa: E402
+    CONTRACT_PATTERNS,
+    CONTRACT_RAW_MAP,
     SALARY_ANCHOR_PATTERN,
     SENIORITY_PATTERNS,
     infer_contract_from_text,
     normalize_contract,
 )
+from common.duckdb_profile import connect  # noqa: E402
+from common.quality import (  # noqa: E402
+    enforce, in_range, not_null, references, row_count_delta, run_suite, unique,
+)
 
 GUPY_GLOB = "data/bronze/radar_jobs/*.parquet"
 GREENHOUSE_GLOB = "data/bronze/radar_jobs_greenhouse/*.parquet"
@@ -52,6 +103,37 @@ ATS_GLOBS = {
     "apibr": "data/bronze/radar_jobs_apibr/*.parquet",
 }
 SILVER_DIR = Path("data/silver")
+# Silver incremental: uma partição por semana ISO (vagas cuja última
+# aparição no bronze foi naquela semana) + manifesto dos arquivos bronze
+# já incorporados (caminho → hash do conteúdo).
+JOBS_BY_WEEK_DIR = SILVER_DIR / "jobs_by_week"
+MANIFEST_PATH = SILVER_DIR / "jobs_manifest.json"
+CATALOG_PATH = Path(__file__).resolve().parent.parent / "ingestion_radar" / "catalog.py"
+DEDUP_PATH = Path(__file__).resolve().parent / "job_dedup.py"
+
+# Schema fixo das partições — evita que uma semana sem salário (coluna toda
+# nula) grave um tipo diferente das outras.
+_TYPED_COLUMNS = """
+    CAST(id AS VARCHAR) AS id, CAST(title AS VARCHAR) AS title,
+    CAST(company AS VARCHAR) AS company, CAST(url AS VARCHAR) AS url,
+    CAST(city AS VARCHAR) AS city, CAST(state AS VARCHAR) AS state,
+    CAST(country AS VARCHAR) AS country, CAST(is_remote AS BOOLEAN) AS is_remote,
+    CAST(seniority AS VARCHAR) AS seniority, CAST(contract_type AS VARCHAR) AS contract_type,
+    CAST(publishedDate AS VARCHAR) AS publishedDate, CAST(_matched_term AS VARCHAR) AS _matched_term,
+    CAST(_iso_week AS VARCHAR) AS _iso_week, CAST(skills AS VARCHAR[]) AS skills,
+    CAST(source AS VARCHAR) AS source, CAST(has_salary_info AS BOOLEAN) AS has_salary_info,
+    CAST(salary_min AS DOUBLE) AS salary_min, CAST(salary_max AS DOUBLE) AS salary_max,
+    CAST(salary_currency AS VARCHAR) AS salary_currency, CAST(salary_source AS VARCHAR) AS salary_source,
+    CAST(minhash AS BLOB) AS minhash, CAST(_ingest_ts AS VARCHAR) AS _ingest_ts
+"""
+# Cache de extração: hash do texto da vaga → skills, válido só para a
+# TAXONOMY_VERSION gravada junto (taxonomia mudou → tudo é reextraído).
+SKILLS_CACHE = SILVER_DIR / "skills_cache.parquet"
+
+# Enriquecimento de texto em pool de processos: lotes Arrow de até
+# ENRICH_CHUNK_ROWS vagas; nº de processos = RADAR_ENRICH_WORKERS ou nº de CPUs.
+ENV_ENRICH_WORKERS = "RADAR_ENRICH_WORKERS"
+ENRICH_CHUNK_ROWS = 2_000
 
 
 def _infer_seniority(title: str) -> str:
@@ -97,8 +179,34 @@ def _week_label_from_filename(path: Path) -> str:
     return f"{year}-{week}"
 
 
-def _load_gupy() -> pd.DataFrame:
-    files = sorted(Path(".").glob(GUPY_GLOB))
+def _resolve_gupy_snapshots(raw: pd.DataFrame, bronze_dir: Path) -> pd.DataFrame:
+    """Linhas enxutas do coletor Gupy (vaga já conhecida: só id, termo,
+    publicação e `_snapshot`) recebem os demais campos do registro completo
+    no snapshot bronze apontado — lido direto do disco, então funciona
+    também no build incremental, que só carrega os arquivos novos."""
+    if "_snapshot" not in raw.columns or raw["_snapshot"].isna().all():
+        return raw
+    slim_mask = raw["_snapshot"].notna()
+    slim = raw.loc[slim_mask, ["id", "_matched_term", "publishedDate", "_iso_week", "_ingest_ts"]]
+
+    refs = []
+    for name, ids in slim.groupby(raw.loc[slim_mask, "_snapshot"])["id"]:
+        path = bronze_dir / name
+        if not path.exists():
+            raise RuntimeError(f"Snapshot Gupy referenciado não existe: {path}")
+        ref = pd.read_parquet(path)
+        refs.append(ref[ref["id"].isin(ids)])
+    ref = pd.concat(refs, ignore_index=True).drop(
+        columns=["_matched_term", "publishedDate", "_ingest_ts", "_snapshot"], errors="ignore")
+
+    resolved = slim.merge(ref.drop_duplicates("id"), on="id", how="left")
+    missing = resolved["description"].isna() & resolved["name"].isna()
+    if missing.any():
+        raise RuntimeError(f"{int(missing.sum())} vagas Gupy sem registro completo no snapshot")
+    return pd.concat([raw.loc[~slim_mask], resolved], ignore_index=True)
+
+
+def _load_gupy(files: list[Path]) -> pd.DataFrame:
     if not files:
         return pd.DataFrame()
 
@@ -109,13 +217,14 @@ def _load_gupy() -> pd.DataFrame:
         frames.append(df)
     raw = pd.concat(frames, ignore_index=True)
     raw = raw.sort_values("_ingest_ts").drop_duplicates(subset=["id"], keep="last")
+    raw = _resolve_gupy_snapshots(raw, files[0].parent)
 
     raw["is_remote"] = raw["isRemoteWork"].fillna(False) | (raw["workplaceType"] == "remote")
 
     out = raw[[
         "id", "name", "city", "state", "country", "is_remote",
         "publishedDate", "_matched_term", "_iso_week", "description",
-        "careerPageName", "jobUrl",
+        "careerPageName", "jobUrl", "_ingest_ts",
     ]].rename(columns={
         "name": "title", "careerPageName": "company", "jobUrl": "url",
     })
@@ -124,17 +233,33 @@ def _load_gupy() -> pd.DataFrame:
     return out
 
 
-def _load_greenhouse() -> pd.DataFrame:
-    files = sorted(Path(".").glob(GREENHOUSE_GLOB))
+def _read_ats_snapshot(path: Path) -> pd.DataFrame:
+    """Lê um snapshot ATS expandindo as linhas marcadoras de board
+    inalterado (`_unchanged_from`, ver `ats_http`): cada uma vira as linhas
+    daquela empresa no snapshot apontado, com a semana/ingestão deste."""
+    df = pd.read_parquet(path)
+    if "_unchanged_from" in df.columns and df["_unchanged_from"].notna().any():
+        markers = df[df["_unchanged_from"].notna()]
+        parts = [df[df["_unchanged_from"].isna()]]
+        for ref_name, group in markers.groupby("_unchanged_from"):
+            ref_path = path.parent / ref_name
+            if not ref_path.exists():
+                raise RuntimeError(f"Snapshot ATS referenciado não existe: {ref_path}")
+            ref = _read_ats_snapshot(ref_path)
+            ref = ref[ref["company_slug"].isin(group["company_slug"])]
+            parts.append(ref.assign(_ingest_ts=group["_ingest_ts"].iloc[0]))
+        # parte vazia (snapshot só de marcadores) estragaria o dtype do concat
+        df = pd.concat([part for part in parts if not part.empty] or parts, ignore_index=True)
+    df = df.drop(columns="_unchanged_from", errors="ignore")
+    df["_iso_week"] = _week_label_from_filename(path)
+    return df
+
+
+def _load_greenhouse(files: list[Path]) -> pd.DataFrame:
     if not files:
         return pd.DataFrame()
 
-    frames = []
-    for f in files:
-        df = pd.read_parquet(f)
-        df["_iso_week"] = _week_label_from_filename(f)
-        frames.append(df)
-    raw = pd.concat(frames, ignore_index=True)
+    raw = pd.concat([_read_ats_snapshot(f) for f in files], ignore_index=True)
     raw = raw.sort_values("_ingest_ts").drop_duplicates(subset=["id", "company_slug"], keep="last")
 
     # Location vem como string livre ("Curitiba", "Belo Horizonte, MG"...) —
@@ -154,25 +279,20 @@ def _load_greenhouse() -> pd.DataFrame:
         "company": raw["company"],
         "url": raw["absolute_url"],
         "source": "greenhouse",
+        "_ingest_ts": raw["_ingest_ts"],
     })
     return out
 
 
-def _load_ats(source: str, glob: str) -> pd.DataFrame:
+def _load_ats(source: str, files: list[Path]) -> pd.DataFrame:
     """Loader genérico para as fontes ATS (Lever/Ashby/InHire/API BR) que
     compartilham o mesmo schema de bronze — inclui os campos ESTRUTURADOS
     de contrato e salário quando a fonte os fornece (Ashby traz faixa
     salarial; Lever/Ashby/InHire trazem tipo de contrato)."""
-    files = sorted(Path(".").glob(glob))
     if not files:
         return pd.DataFrame()
 
-    frames = []
-    for f in files:
-        df = pd.read_parquet(f)
-        df["_iso_week"] = _week_label_from_filename(f)
-        frames.append(df)
-    raw = pd.concat(frames, ignore_index=True)
+    raw = pd.concat([_read_ats_snapshot(f) for f in files], ignore_index=True)
     raw = raw.sort_values("_ingest_ts").drop_duplicates(subset=["id", "company_slug"], keep="last")
 
     out = pd.DataFrame({
@@ -189,6 +309,7 @@ def _load_ats(source: str, glob: str) -> pd.DataFrame:
         "company": raw["company"],
         "url": raw["absolute_url"],
         "source": source,
+        "_ingest_ts": raw["_ingest_ts"],
         # campos estruturados (podem vir vazios conforme a fonte)
         "contract_raw": raw.get("contract_type_raw"),
         "struct_salary_min": raw.get("salary_min"),
@@ -198,7 +319,7 @@ def _load_ats(source: str, glob: str) -> pd.DataFrame:
     return out
 
 
-def _resolve_contract(row: pd.Series) -> str:
+def _resolve_contract(row: dict) -> str:
     """Contrato ESTRUTURADO (campo do ATS, já normalizado no coletor) tem
     prioridade; senão infere do texto (título+descrição); senão 'não
     especificado'."""
@@ -210,7 +331,7 @@ def _resolve_contract(row: pd.Series) -> str:
     return infer_contract_from_text(f"{row.get('title', '')} {row.get('description', '')}")
 
 
-def _resolve_salary(row: pd.Series) -> tuple[float | None, float | None, str | None, str | None]:
+def _resolve_salary(row: dict) -> tuple[float | None, float | None, str | None, str | None]:
     """Salário ESTRUTURADO (Ashby/InHire) tem prioridade sobre o regex.
     Retorna (min, max, moeda, fonte) — fonte ∈ {estruturado, regex, None}."""
     smin = row.get("struct_salary_min")
@@ -227,9 +348,205 @@ def _resolve_salary(row: pd.Series) -> tuple[float | None, float | None, str | N
     return None, None, None, None
 
 
-def build_jobs_clean() -> pd.DataFrame:
-    frames = [_load_gupy(), _load_greenhouse()]
-    frames += [_load_ats(source, glob) for source, glob in ATS_GLOBS.items()]
+# ─── Versões colunares (usadas no pipeline) ───────────────────────────────────
+# As funções por linha acima ficam como referência: `tests/test_silver_enrich.py`
+# confere que as colunares dão exatamente o mesmo resultado.
+
+def _seniority_col(titles: pd.Series) -> np.ndarray:
+    """Máscaras `str.contains` na ordem de SENIORITY_PATTERNS + np.select:
+    a primeira que bate vence, como no loop de `_infer_seniority`."""
+    titles = titles.fillna("")
+    masks = [titles.str.contains(pattern, regex=True) for _, pattern in SENIORITY_PATTERNS]
+    labels = [label for label, _ in SENIORITY_PATTERNS]
+    return np.select(masks, labels, default="não especificado")
+
+
+def _contract_col(df: pd.DataFrame) -> np.ndarray:
+    """Campo estruturado via `map` no CONTRACT_RAW_MAP (match exato, depois
+    token contido, na ordem do dict — igual a `normalize_contract`); regex
+    sobre título+descrição só nas linhas que ficaram sem rótulo."""
+    raw = df["contract_raw"]
+    key = raw.where(raw.map(lambda v: isinstance(v, str))).str.strip().str.lower()
+    label = key.map(CONTRACT_RAW_MAP)
+    unmapped = label.isna() & key.fillna("").ne("")
+    if unmapped.any():
+        keys = key[unmapped]
+        masks = [keys.str.contains(token, regex=False) for token in CONTRACT_RAW_MAP]
+        by_token = np.select(masks, list(CONTRACT_RAW_MAP.values()), default=None)
+        label[unmapped] = by_token
+
+    out = label.to_numpy(dtype=object)
+    fallback = label.isna().to_numpy()
+    if fallback.any():
+        # mesmo texto que o f-string de `_resolve_contract` (None → "None")
+        sub = df.loc[fallback]
+        text = sub["title"].astype(str) + " " + sub["description"].astype(str)
+        masks = [text.str.contains(pattern, regex=True) for _, pattern in CONTRACT_PATTERNS]
+        out[fallback] = np.select(masks, [label for label, _ in CONTRACT_PATTERNS],
+                                  default="não especificado")
+    return out
+
+
+def _parse_brl_col(raw: pd.Series) -> pd.Series:
+    cleaned = raw.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    value = pd.to_numeric(cleaned, errors="coerce")
+    return value.where(value > 0)
+
+
+def _salary_cols(df: pd.DataFrame) -> dict[str, pd.Series]:
+    """Salário estruturado (Ashby/InHire) com prioridade; senão faixa via
+    `str.extract` do SALARY_ANCHOR_PATTERN na descrição."""
+    smin = pd.to_numeric(df["struct_salary_min"], errors="coerce")
+    smax = pd.to_numeric(df["struct_salary_max"], errors="coerce")
+    structured = smin.notna() | smax.notna()
+    lo, hi = smin.fillna(smax), smax.fillna(smin)
+    cur = df["struct_salary_currency"]
+    cur = cur.where(cur.map(lambda v: isinstance(v, str) and v != ""), "BRL")
+
+    groups = df["description"].fillna("").str.extract(SALARY_ANCHOR_PATTERN)
+    v1, v2 = _parse_brl_col(groups[0]), _parse_brl_col(groups[1])
+    v2 = v2.fillna(v1).where(v1.notna())
+    regex = ~structured & v1.notna()
+
+    none = pd.Series(None, index=df.index, dtype=object)
+    return {
+        "salary_min": np.fmin(lo, hi).where(structured, np.fmin(v1, v2).where(regex)),
+        "salary_max": np.fmax(lo, hi).where(structured, np.fmax(v1, v2).where(regex)),
+        "salary_currency": none.mask(structured, cur).mask(regex, "BRL"),
+        "salary_source": none.mask(structured, "estruturado").mask(regex, "regex"),
+    }
+
+
+def _load_skills_cache() -> dict[str, list[str]]:
+    if not SKILLS_CACHE.exists():
+        return {}
+    table = pq.read_table(SKILLS_CACHE)
+    versions = set(table.column("taxonomy_version").to_pylist())
+    if versions != {TAXONOMY_VERSION}:
+        print("  ⚠ Taxonomia de skills mudou — cache de extração descartado.")
+        return {}
+    return dict(zip(table.column("text_hash").to_pylist(), table.column("skills").to_pylist()))
+
+
+# ─── Enriquecimento de texto (pool de processos sobre lotes Arrow) ───────────
+
+# Colunas de entrada do enriquecimento e schema do que ele devolve.
+_ENRICH_INPUT = ["title", "description", "contract_raw",
+                 "struct_salary_min", "struct_salary_max", "struct_salary_currency"]
+_ENRICHED_SCHEMA = pa.schema([
+    ("skills", pa.list_(pa.string())),
+    ("seniority", pa.string()),
+    ("contract_type", pa.string()),
+    ("salary_min", pa.float64()),
+    ("salary_max", pa.float64()),
+    ("salary_currency", pa.string()),
+    ("salary_source", pa.string()),
+])
+
+
+def _enrich_batch(batch: pa.RecordBatch) -> pa.RecordBatch:
+    """Skills (só nas linhas com `_need_skills`), senioridade, contrato e
+    salário de um lote. Roda nos workers do pool — função de módulo, pura."""
+    df = batch.to_pandas()
+    need = df["_need_skills"].to_numpy(dtype=bool)
+    skills: list[list[str] | None] = [None] * len(df)
+    if need.any():
+        extracted = extract_skills_batch(df["title"][need], df["description"][need]).to_pylist()
+        for i, value in zip(need.nonzero()[0], extracted):
+            skills[i] = value
+
+    salary = _salary_cols(df)
+    return pa.RecordBatch.from_arrays([
+        pa.array(skills, type=pa.list_(pa.string())),
+        pa.array(_seniority_col(df["title"]), type=pa.string()),
+        pa.array(_contract_col(df), type=pa.string()),
+        pa.array(salary["salary_min"], type=pa.float64(), from_pandas=True),
+        pa.array(salary["salary_max"], type=pa.float64(), from_pandas=True),
+        pa.array(salary["salary_currency"], type=pa.string(), from_pandas=True),
+        pa.array(salary["salary_source"], type=pa.string(), from_pandas=True),
+    ], schema=_ENRICHED_SCHEMA)
+
+
+def _enrich_workers() -> int:
+    raw = os.environ.get(ENV_ENRICH_WORKERS, "").strip()
+    return max(1, int(raw)) if raw.isdigit() else (os.cpu_count() or 1)
+
+
+def _map_batches(table: pa.Table, workers: int) -> pa.Table:
+    """Aplica `_enrich_batch` em lotes de ENRICH_CHUNK_ROWS. Com mais de um
+    worker, fan-out num ProcessPoolExecutor — `map` devolve os lotes na
+    ordem de entrada, então o resultado é determinístico e alinhado.
+
+    Workers por `spawn`, não `fork`: o `main()` já abriu o DuckDB (e o
+    Arrow tem pool de threads) — fork de processo com threads vivas pode
+    herdar um lock preso e travar o worker."""
+    batches = table.to_batches(max_chunksize=ENRICH_CHUNK_ROWS)
+    if workers <= 1 or len(batches) <= 1:
+        results = [_enrich_batch(b) for b in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches)),
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(_enrich_batch, batches))
+    return pa.Table.from_batches(results, schema=_ENRICHED_SCHEMA)
+
+
+def _enrich_texts(raw: pd.DataFrame, prune: bool = True) -> pd.DataFrame:
+    """Enriquecimento de texto das vagas: skills + senioridade + contrato +
+    salário, num pool de processos.
+
+    Skills têm memoização por conteúdo: só textos nunca vistos (nesta versão
+    da taxonomia) passam pelo extrator. Com `prune` (rebuild completo) o
+    cache regravado guarda só os textos do bronze atual — não cresce sem
+    limite; no incremental, os textos novos são acrescentados.
+    """
+    keys = [
+        hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        for text in job_texts(raw["title"], raw["description"]).to_pylist()
+    ]
+    cache = _load_skills_cache()
+
+    missing: dict[str, int] = {}   # hash → 1ª linha com aquele texto
+    for i, key in enumerate(keys):
+        if key not in cache and key not in missing:
+            missing[key] = i
+    need = pd.Series(False, index=range(len(raw)))
+    need.iloc[list(missing.values())] = True
+
+    table = pa.Table.from_pandas(
+        raw[_ENRICH_INPUT].reset_index(drop=True).assign(_need_skills=need),
+        preserve_index=False,
+    )
+    workers = _enrich_workers()
+    enriched = _map_batches(table, workers)
+
+    extracted = enriched.column("skills").to_pylist()
+    cache.update((key, extracted[i]) for key, i in missing.items())
+    print(f"  ✓ texto enriquecido em {workers} processo(s) — skills: {len(missing)} "
+          f"textos extraídos, {len(keys) - len(missing)} reaproveitados "
+          f"(cache ou texto repetido)")
+
+    current = list(dict.fromkeys(keys)) if prune else list(cache)
+    SILVER_DIR.mkdir(parents=True, exist_ok=True)
+    pq.write_table(pa.table({
+        "text_hash": pa.array(current, type=pa.string()),
+        "taxonomy_version": pa.array([TAXONOMY_VERSION] * len(current), type=pa.string()),
+        "skills": pa.array([cache[k] for k in current], type=pa.list_(pa.string())),
+    }), SKILLS_CACHE)
+
+    out = enriched.drop_columns(["skills"]).to_pandas()
+    out.index = raw.index
+    out["skills"] = pd.arrays.ArrowExtensionArray(
+        pa.array([cache[k] for k in keys], type=pa.list_(pa.string()))
+    )
+    return out
+
+
+def _load_raw(files_by_source: dict[str, list[Path]]) -> pd.DataFrame:
+    frames = [
+        _load_gupy(files_by_source.get("gupy", [])),
+        _load_greenhouse(files_by_source.get("greenhouse", [])),
+    ]
+    frames += [_load_ats(source, files_by_source.get(source, [])) for source in ATS_GLOBS]
     frames = [f for f in frames if not f.empty]
 
     if not frames:
@@ -247,54 +564,246 @@ def build_jobs_clean() -> pd.DataFrame:
     # original — cosmético, mas afeta a exibição.
     raw["title"] = raw["title"].str.strip()
     raw["company"] = raw["company"].fillna("").str.strip()
-
-    raw["skills"] = raw.apply(
-        lambda r: extract_skills_row(r.get("title", ""), r.get("description", "")), axis=1
-    )
-    raw["seniority"] = raw["title"].apply(_infer_seniority)
-    raw["contract_type"] = raw.apply(_resolve_contract, axis=1)
-
-    salary = raw.apply(_resolve_salary, axis=1)
-    raw["salary_min"] = salary.apply(lambda t: t[0])
-    raw["salary_max"] = salary.apply(lambda t: t[1])
-    raw["salary_currency"] = salary.apply(lambda t: t[2])
-    raw["salary_source"] = salary.apply(lambda t: t[3])
+    return raw
+
+
+def build_jobs_clean(
+    files_by_source: dict[str, list[Path]],
+    *,
+    full: bool = True,
+    weeks: set[tuple[str, str]] | None = None,
+    reload_ids: set[str] = frozenset(),
+) -> pd.DataFrame:
+    """Normaliza + enriquece as vagas dos arquivos bronze dados (source →
+    arquivos). Mantém `_ingest_ts` para o upsert decidir a versão mais nova.
+    Com `weeks`, só seguem as linhas dessas (fonte, semana) e as vagas de
+    `reload_ids` — o resto dos arquivos serve só para o dedup por id."""
+    raw = _load_raw(files_by_source)
+    if weeks is not None:
+        in_weeks = pd.Series(list(zip(raw["source"], raw["_iso_week"])), index=raw.index).isin(weeks)
+        raw = raw[in_weeks | raw["id"].isin(reload_ids)].reset_index(drop=True)
+
+    enriched = _enrich_texts(raw, prune=full)
+    for col in enriched.columns:
+        raw[col] = enriched[col]
     raw["has_salary_info"] = raw["salary_min"].notna()
+    # assinatura MinHash guardada na partição — o cluster de quase-duplicatas
+    # é recalculado sobre TODAS as vagas na consolidação, sem reler descrição
+    signatures = minhash_signatures(raw["title"], raw["company"], raw["description"])
+    raw["minhash"] = [row.tobytes() for row in signatures]
 
     clean = raw[[
         "id", "title", "company", "url", "city", "state", "country", "is_remote",
         "seniority", "contract_type", "publishedDate", "_matched_term", "_iso_week",
         "skills", "source", "has_salary_info", "salary_min", "salary_max",
-        "salary_currency", "salary_source",
+        "salary_currency", "salary_source", "minhash", "_ingest_ts",
     ]]
 
     return clean
 
 
-def main() -> int:
+# ─── Build incremental (manifesto + partições por semana) ────────────────────
+
+def _bronze_files() -> dict[str, list[Path]]:
+    globs = {"gupy": GUPY_GLOB, "greenhouse": GREENHOUSE_GLOB, **ATS_GLOBS}
+    return {source: sorted(Path(".").glob(glob)) for source, glob in globs.items()}
+
+
+def _fingerprint(path: Path) -> str:
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+
+def _code_version() -> str:
+    """Hash do código que define o conteúdo do silver (taxonomia, padrões do
+    catálogo, extrator, assinaturas MinHash e este módulo) — mudou, o
+    silver é reconstruído."""
+    h = hashlib.blake2b(TAXONOMY_VERSION.encode(), digest_size=16)
+    for path in (CATALOG_PATH, DEDUP_PATH, Path(__file__).resolve()):
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def _load_manifest() -> dict:
+    if not MANIFEST_PATH.exists():
+        return {}
+    try:
+        return json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+
+
+def _plan(fingerprints: dict[str, str], manifest: dict, force_full: bool) -> tuple[bool, str]:
+    """Decide entre rebuild completo e incremental. Retorna (full, motivo)."""
+    if force_full:
+        return True, "--full"
+    if not manifest or not any(JOBS_BY_WEEK_DIR.glob("*.parquet")):
+        return True, "sem manifesto/partições"
+    if manifest.get("code_version") != _code_version():
+        return True, "taxonomia/catálogo/código mudou"
+    seen = manifest.get("files", {})
+    if any(path not in fingerprints for path in seen):
+        return True, "arquivo bronze removido"
+    return False, "incremental"
+
+
+def _drop_rewritten(con, rewritten: set[tuple[str, str]]) -> set[str]:
+    """Tira das partições as linhas de cada (fonte, semana) cujo snapshot foi
+    reescrito e devolve os ids removidos — o chamador as refaz do bronze
+    (as que sumiram do snapshot voltam à última semana em que apareceram)."""
+    dropped: set[str] = set()
+    for source, week in sorted(rewritten):
+        path = JOBS_BY_WEEK_DIR / f"{week}.parquet"
+        if not path.exists():
+            continue
+        part = f"read_parquet('{path}')"
+        dropped |= {i for (i,) in con.execute(
+            f"SELECT id FROM {part} WHERE source = ?", [source]).fetchall()}
+        n = con.execute(f"SELECT COUNT(*) FROM {part} WHERE source <> ?", [source]).fetchone()[0]
+        if n == 0:
+            path.unlink()
+            continue
+        tmp = path.with_suffix(".tmp")
+        con.execute(f"""
+            COPY (SELECT * FROM {part} WHERE source <> '{source}' ORDER BY id)
+            TO '{tmp}' (FORMAT PARQUET)
+        """)
+        tmp.replace(path)
+    return dropped
+
+
+def _upsert_weeks(con, clean: pd.DataFrame) -> list[str]:
+    """Funde as vagas novas nas partições semanais afetadas: a versão com
+    `_ingest_ts` mais recente de cada id vence (mesma regra do dedup do
+    bronze) e a vaga "muda" para a semana em que foi vista por último.
+    Só reescreve as semanas novas + as que continham algum id reprocessado.
+    """
+    con.register("new_df", clean)
+    con.execute(f"CREATE OR REPLACE TEMP TABLE new_rows AS SELECT {_TYPED_COLUMNS}, true AS _is_new FROM new_df")
+
+    weeks = {w for (w,) in con.execute("SELECT DISTINCT _iso_week FROM new_rows").fetchall()}
+    existing = sorted(JOBS_BY_WEEK_DIR.glob("*.parquet"))
+    if existing:
+        paths = [str(p) for p in existing]
+        weeks |= {w for (w,) in con.execute("""
+            SELECT DISTINCT _iso_week FROM read_parquet($paths)
+            WHERE id IN (SELECT id FROM new_rows)
+        """, {"paths": paths}).fetchall()}
+    affected = [str(JOBS_BY_WEEK_DIR / f"{w}.parquet") for w in sorted(weeks)
+                if (JOBS_BY_WEEK_DIR / f"{w}.parquet").exists()]
+
+    old_rows = (f"SELECT {_TYPED_COLUMNS}, false AS _is_new FROM read_parquet($affected)"
+                if affected else "SELECT * FROM new_rows WHERE false")
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE merged AS
+        SELECT * EXCLUDE (_is_new)
+        FROM ({old_rows} UNION ALL SELECT * FROM new_rows)
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY id ORDER BY _ingest_ts DESC, _is_new DESC) = 1
+    """, {"affected": affected} if affected else None)
+
+    JOBS_BY_WEEK_DIR.mkdir(parents=True, exist_ok=True)
+    for week in sorted(weeks):
+        out = JOBS_BY_WEEK_DIR / f"{week}.parquet"
+        n = con.execute("SELECT COUNT(*) FROM merged WHERE _iso_week = ?", [week]).fetchone()[0]
+        if n == 0:
+            out.unlink(missing_ok=True)
+            continue
+        con.execute(f"""
+            COPY (SELECT * FROM merged WHERE _iso_week = '{week}' ORDER BY id)
+            TO '{out}' (FORMAT PARQUET)
+        """)
+    return sorted(weeks)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Silver de vagas do radar")
+    parser.add_argument("--full", action="store_true",
+                        help="ignora o manifesto e reconstrói todas as semanas")
+    args = parser.parse_args(argv)
+
     print("🔍 Silver — extraindo skills das vagas coletadas (Gupy + Greenhouse)")
-    clean = build_jobs_clean()
+    bronze = _bronze_files()
+    fingerprints = {str(f): _fingerprint(f) for files in bronze.values() for f in files}
+    manifest = _load_manifest()
+    full, reason = _plan(fingerprints, manifest, args.full)
+
+    if full:
+        pending = bronze
+        for old in JOBS_BY_WEEK_DIR.glob("*.parquet"):
+            old.unlink()
+    else:
+        seen = manifest.get("files", {})
+        pending = {source: [f for f in files if seen.get(str(f)) != fingerprints[str(f)]]
+                   for source, files in bronze.items()}
+        if not any(pending.values()):
+            print("  ✓ Nenhum arquivo bronze novo — silver já está em dia.")
+            return 0
+    n_files = sum(len(files) for files in pending.values())
+    SILVER_DIR.mkdir(parents=True, exist_ok=True)
+    con = connect()
+
+    if full:
+        print(f"  → rebuild completo ({reason}): {n_files} arquivo(s) bronze")
+        clean = build_jobs_clean(pending, full=True)
+    else:
+        rewritten = {(source, _week_label_from_filename(f))
+                     for source, files in pending.items() for f in files if str(f) in seen}
+        print(f"  → incremental: {n_files} arquivo(s) bronze novo(s)/reescrito(s)"
+              + (f" — refazendo {len(rewritten)} fonte×semana" if rewritten else ""))
+        # snapshot reescrito: a fonte inteira é relida só para o dedup por id
+        # (vaga que sumiu do snapshot volta à versão anterior mais recente);
+        # só as linhas das semanas pendentes e os ids removidos são enriquecidas
+        reload_ids = _drop_rewritten(con, rewritten)
+        touched = {source for source, _ in rewritten}
+        files = {source: bronze[source] if source in touched else pending[source]
+                 for source in bronze}
+        weeks = {(source, _week_label_from_filename(f))
+                 for source, fs in pending.items() for f in fs}
+        clean = build_jobs_clean(files, full=False, weeks=weeks, reload_ids=reload_ids)
+
     by_source = clean["source"].value_counts().to_dict()
     print(f"  ✓ {len(clean)} vagas únicas processadas ({by_source})")
 
-    SILVER_DIR.mkdir(parents=True, exist_ok=True)
-
-    # jobs_clean.parquet — grava via DuckDB (lista de skills como VARCHAR[] nativo)
-    con = duckdb.connect()
-    con.register("clean_df", clean)
+    weeks = _upsert_weeks(con, clean)
+    print(f"  ✓ {JOBS_BY_WEEK_DIR}/ — {len(weeks)} semana(s) regravada(s)")
+
+    # cluster_id — mesma vaga em fontes diferentes (MinHash/LSH, job_dedup.py)
+    # — só entre fontes diferentes, com mesma senioridade e local (block_keys)
+    signed = con.execute(f"""
+        SELECT id, title, source, seniority, city, is_remote, minhash
+        FROM read_parquet('{JOBS_BY_WEEK_DIR}/*.parquet')
+    """).df()
+    signatures = np.frombuffer(b"".join(signed["minhash"]), dtype=np.uint32).reshape(-1, NUM_PERM)
+    blocks = block_keys(signed["seniority"], signed["city"], signed["is_remote"])
+    clusters = pd.DataFrame({"id": signed["id"],
+                             "cluster_id": cluster_ids(signed["id"], signatures, signed["title"],
+                                                       blocks, signed["source"])})
+    con.register("clusters_df", clusters)
+    n_dups = int((clusters["cluster_id"] != clusters["id"]).sum())
+    print(f"  ✓ {n_dups} vagas quase-duplicadas agrupadas em "
+          f"{clusters.loc[clusters['cluster_id'] != clusters['id'], 'cluster_id'].nunique()} clusters")
+
+    # jobs_clean.parquet — consolidado das partições (mesmo schema de antes +
+    # cluster_id, lido pelos estágios gold); lista de skills como VARCHAR[] nativo
     con.execute(f"""
-        COPY (SELECT * FROM clean_df)
+        CREATE OR REPLACE TEMP VIEW clean_df AS
+        SELECT j.* EXCLUDE (_ingest_ts, minhash), c.cluster_id
+        FROM read_parquet('{JOBS_BY_WEEK_DIR}/*.parquet') j
+        JOIN clusters_df c USING (id)
+    """)
+    con.execute(f"""
+        COPY (SELECT * FROM clean_df ORDER BY _iso_week, id)
         TO '{SILVER_DIR / "jobs_clean.parquet"}' (FORMAT PARQUET)
     """)
     print(f"  ✓ {SILVER_DIR / 'jobs_clean.parquet'}")
 
     # skills_by_week.parquet — explode a lista de skills e agrega por semana
-    # (soma as duas fontes — é a mesma métrica vinda de mais de um lugar)
+    # (soma as fontes — é a mesma métrica vinda de mais de um lugar — mas a
+    # mesma vaga publicada em duas fontes conta uma vez: distinct cluster_id)
     con.execute(f"""
         COPY (
-            SELECT iso_week, skill, COUNT(*) AS n_jobs
+            SELECT iso_week, skill, COUNT(DISTINCT cluster_id) AS n_jobs
             FROM (
-                SELECT _iso_week AS iso_week, unnest(skills) AS skill
+                SELECT _iso_week AS iso_week, cluster_id, unnest(skills) AS skill
                 FROM clean_df
             )
             GROUP BY iso_week, skill
@@ -304,7 +813,24 @@ def main() -> int:
     """)
     print(f"  ✓ {SILVER_DIR / 'skills_by_week.parquet'}")
 
+    jobs_src = f"read_parquet('{SILVER_DIR / 'jobs_clean.parquet'}')"
+    results = run_suite(con, "silver.jobs_clean", jobs_src, [
+        not_null("id"), unique("id"), not_null("_iso_week"), not_null("source"),
+        not_null("cluster_id"), references("cluster_id", jobs_src, "id"),
+        in_range("salary_min", 0), row_count_delta(50),
+    ])
+    results += run_suite(con, "silver.skills_by_week",
+                         f"read_parquet('{SILVER_DIR / 'skills_by_week.parquet'}')", [
+        unique("iso_week", "skill"), in_range("n_jobs", 1),
+        references("iso_week", jobs_src, "_iso_week"),
+    ])
     con.close()
+    enforce(results)
+
+    MANIFEST_PATH.write_text(json.dumps({
+        "code_version": _code_version(),
+        "files": dict(sorted(fingerprints.items())),
+    }, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
     return 0
 
 
@@ -17,13 +17,14 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
-import duckdb
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.duckdb_profile import connect  # noqa: E402
 
 SILVER_DIR = Path("data/silver")
 
 
 def main() -> int:
-    con = duckdb.connect()
+    con = connect()
     SILVER_DIR.mkdir(parents=True, exist_ok=True)
 
     github_files = sorted(Path(".").glob("data/bronze/radar_github/*.parquet"))